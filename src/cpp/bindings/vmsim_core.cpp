@@ -0,0 +1,389 @@
+// In-process Python binding for the simulator core (imported as bridge.vmsim_core).
+//
+// Exposes VirtualMemorySimulator without the socket: settings go in as a dict,
+// accesses as a uint64 buffer, and bulk outputs (translations, frame map, page
+// tables) come back as typed memoryviews that NumPy wraps without copying.
+// Long calls release the GIL, so separate Simulator objects can run in threads.
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <algorithm>
+#include <cstring>
+#include <new>
+#include <string>
+#include <vector>
+#include "virtual_memory_simulator.h"
+
+static PyObject* json_dumps = nullptr;
+static PyObject* json_loads = nullptr;
+
+typedef struct {
+    PyObject_HEAD
+    VirtualMemorySimulator* sim;
+    bool busy; // set while a call runs without the GIL
+} SimulatorObject;
+
+// Runs body and turns C++ exceptions into Python ones.
+template <typename F>
+static PyObject* guarded(F&& body) {
+    try {
+        return body();
+    } catch (const json::exception& e) {
+        PyErr_SetString(PyExc_ValueError, e.what());
+    } catch (const std::bad_alloc&) {
+        PyErr_NoMemory();
+    } catch (const std::exception& e) {
+        PyErr_SetString(PyExc_RuntimeError, e.what());
+    }
+    return nullptr;
+}
+
+// Runs body with the GIL released; the busy flag rejects re-entrant calls from other threads.
+template <typename F>
+static void without_gil(SimulatorObject* self, F&& body) {
+    self->busy = true;
+    PyThreadState* state = PyEval_SaveThread();
+    try {
+        body();
+    } catch (...) {
+        PyEval_RestoreThread(state);
+        self->busy = false;
+        throw;
+    }
+    PyEval_RestoreThread(state);
+    self->busy = false;
+}
+
+static bool check_ready(SimulatorObject* self) {
+    if (self->busy) {
+        PyErr_SetString(PyExc_RuntimeError, "Simulator is busy in another thread");
+        return false;
+    }
+    return true;
+}
+
+static bool to_json(PyObject* value, json& out) {
+    PyObject* text = PyObject_CallFunctionObjArgs(json_dumps, value, NULL);
+    if (!text) return false;
+    Py_ssize_t size = 0;
+    const char* data = PyUnicode_AsUTF8AndSize(text, &size);
+    if (!data) {
+        Py_DECREF(text);
+        return false;
+    }
+    out = json::parse(std::string(data, size));
+    Py_DECREF(text);
+    return true;
+}
+
+static PyObject* from_text(const std::string& text) {
+    PyObject* str = PyUnicode_FromStringAndSize(text.data(), static_cast<Py_ssize_t>(text.size()));
+    if (!str) return nullptr;
+    PyObject* result = PyObject_CallFunctionObjArgs(json_loads, str, NULL);
+    Py_DECREF(str);
+    return result;
+}
+
+static PyObject* from_json(const json& value) {
+    return from_text(value.dump());
+}
+
+// A read-only memoryview of `count` items in struct format `format`, backed by a
+// bytes object that `fill` writes in place.
+template <typename T, typename F>
+static PyObject* typed_view(uint64_t count, const char* format, F&& fill) {
+    PyObject* bytes = PyBytes_FromStringAndSize(NULL, static_cast<Py_ssize_t>(count * sizeof(T)));
+    if (!bytes) return nullptr;
+    fill(reinterpret_cast<T*>(PyBytes_AS_STRING(bytes)));
+    PyObject* view = PyMemoryView_FromObject(bytes);
+    Py_DECREF(bytes);
+    if (!view) return nullptr;
+    PyObject* typed = PyObject_CallMethod(view, "cast", "s", format);
+    Py_DECREF(view);
+    return typed;
+}
+
+// Accepts any C-contiguous buffer of 64-bit integers (NumPy uint64/int64, array('Q'), ...).
+static bool get_address_buffer(PyObject* object, Py_buffer* view) {
+    if (PyObject_GetBuffer(object, view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+        return false;
+    }
+    const char* format = view->format ? view->format : "B";
+    if (*format == '<' || *format == '=' || *format == '@') format++;
+    if (view->itemsize != 8 || std::strlen(format) != 1 || !std::strchr("QqLlNn", *format)) {
+        PyBuffer_Release(view);
+        PyErr_SetString(PyExc_TypeError, "addresses must be a contiguous buffer of 64-bit integers");
+        return false;
+    }
+    return true;
+}
+
+static PyObject* Simulator_new(PyTypeObject* type, PyObject* args, PyObject* kwargs) {
+    SimulatorObject* self = reinterpret_cast<SimulatorObject*>(type->tp_alloc(type, 0));
+    if (!self) return nullptr;
+    self->busy = false;
+    self->sim = nullptr;
+    PyObject* created = guarded([&]() -> PyObject* {
+        self->sim = new VirtualMemorySimulator(nullptr);
+        Py_RETURN_NONE;
+    });
+    if (!created) {
+        Py_DECREF(self);
+        return nullptr;
+    }
+    Py_DECREF(created);
+    return reinterpret_cast<PyObject*>(self);
+}
+
+static void Simulator_dealloc(SimulatorObject* self) {
+    delete self->sim;
+    Py_TYPE(self)->tp_free(reinterpret_cast<PyObject*>(self));
+}
+
+static PyObject* Simulator_load_settings(SimulatorObject* self, PyObject* settings) {
+    if (!check_ready(self)) return nullptr;
+    return guarded([&]() -> PyObject* {
+        json parsed;
+        if (!to_json(settings, parsed)) return nullptr;
+        // Accesses come from step()/access(), so allocation stops short of the built-in loop.
+        parsed["trace_driven"] = true;
+        without_gil(self, [&]() {
+            // Start from a clean session: simulate() keeps page tables already held by a process ID,
+            // so reloading the same processes would leak the frames the new tables claim.
+            self->sim->reset();
+            self->sim->load_settings(parsed);
+            self->sim->simulate();
+        });
+        Py_RETURN_NONE;
+    });
+}
+
+static PyObject* Simulator_step(SimulatorObject* self, PyObject* args) {
+    int ticks = 1;
+    if (!PyArg_ParseTuple(args, "|i", &ticks) || !check_ready(self)) return nullptr;
+    return guarded([&]() -> PyObject* {
+        uint64_t accesses = 0;
+        without_gil(self, [&]() { accesses = self->sim->step(ticks); });
+        return PyLong_FromUnsignedLongLong(accesses);
+    });
+}
+
+static PyObject* Simulator_access(SimulatorObject* self, PyObject* args, PyObject* kwargs) {
+    static const char* keywords[] = {"process_ids", "addresses", "tick", NULL};
+    PyObject* ids = nullptr;
+    PyObject* addresses = nullptr;
+    int tick = -1;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OO|i", const_cast<char**>(keywords), &ids, &addresses, &tick) ||
+        !check_ready(self)) {
+        return nullptr;
+    }
+    std::vector<std::string> process_ids;
+    PyObject* sequence = PySequence_Fast(ids, "process_ids must be a sequence of process IDs");
+    if (!sequence) return nullptr;
+    for (Py_ssize_t i = 0; i < PySequence_Fast_GET_SIZE(sequence); ++i) {
+        const char* id = PyUnicode_AsUTF8(PySequence_Fast_GET_ITEM(sequence, i));
+        if (!id) {
+            Py_DECREF(sequence);
+            return nullptr;
+        }
+        process_ids.push_back(id);
+    }
+    Py_DECREF(sequence);
+    if (process_ids.empty()) {
+        PyErr_SetString(PyExc_ValueError, "process_ids must not be empty");
+        return nullptr;
+    }
+    std::vector<std::string> scheduled = self->sim->scheduled_ids();
+    for (const std::string& id : process_ids) {
+        if (std::find(scheduled.begin(), scheduled.end(), id) == scheduled.end()) {
+            PyErr_Format(PyExc_KeyError, "Process %s is not scheduled", id.c_str());
+            return nullptr;
+        }
+    }
+
+    Py_buffer view;
+    if (!get_address_buffer(addresses, &view)) return nullptr;
+    size_t count = static_cast<size_t>(view.len / 8);
+    if (count % process_ids.size() != 0) {
+        PyBuffer_Release(&view);
+        PyErr_SetString(PyExc_ValueError, "addresses must hold one column per process ID");
+        return nullptr;
+    }
+    PyObject* result = guarded([&]() -> PyObject* {
+        uint64_t applied = 0;
+        int first_tick = tick >= 0 ? tick : self->sim->counters()["tick"].get<int>();
+        without_gil(self, [&]() {
+            applied = self->sim->apply_trace(process_ids, static_cast<const uint64_t*>(view.buf),
+                                             count / process_ids.size(), first_tick);
+        });
+        return PyLong_FromUnsignedLongLong(applied);
+    });
+    PyBuffer_Release(&view);
+    return result;
+}
+
+static PyObject* Simulator_translate(SimulatorObject* self, PyObject* args) {
+    const char* pid = nullptr;
+    PyObject* addresses = nullptr;
+    if (!PyArg_ParseTuple(args, "sO", &pid, &addresses) || !check_ready(self)) return nullptr;
+    Py_buffer view;
+    if (!get_address_buffer(addresses, &view)) return nullptr;
+    uint64_t count = static_cast<uint64_t>(view.len / 8);
+    const uint64_t* input = static_cast<const uint64_t*>(view.buf);
+    std::string process_id(pid);
+    PyObject* result = guarded([&]() -> PyObject* {
+        return typed_view<uint64_t>(count, "Q", [&](uint64_t* out) {
+            without_gil(self, [&]() {
+                for (uint64_t i = 0; i < count; ++i) {
+                    if (!self->sim->translate(process_id, input[i], out[i])) {
+                        out[i] = UINT64_MAX;
+                    }
+                }
+            });
+        });
+    });
+    PyBuffer_Release(&view);
+    return result;
+}
+
+static PyObject* Simulator_scheduled(SimulatorObject* self, PyObject*) {
+    if (!check_ready(self)) return nullptr;
+    return guarded([&]() { return from_json(json(self->sim->scheduled_ids())); });
+}
+
+static PyObject* Simulator_counters(SimulatorObject* self, PyObject*) {
+    if (!check_ready(self)) return nullptr;
+    return guarded([&]() { return from_json(self->sim->counters()); });
+}
+
+// progress() and cancel() are the two calls allowed while another thread is inside the simulator.
+static PyObject* Simulator_progress(SimulatorObject* self, PyObject*) {
+    return guarded([&]() {
+        return from_json(self->busy ? self->sim->published_progress() : self->sim->progress_snapshot());
+    });
+}
+
+static PyObject* Simulator_cancel(SimulatorObject* self, PyObject*) {
+    self->sim->request_cancel();
+    Py_RETURN_NONE;
+}
+
+static PyObject* Simulator_metrics(SimulatorObject* self, PyObject*) {
+    if (!check_ready(self)) return nullptr;
+    return guarded([&]() { return from_json(self->sim->metrics_snapshot()); });
+}
+
+static PyObject* Simulator_frame_map(SimulatorObject* self, PyObject*) {
+    if (!check_ready(self)) return nullptr;
+    return guarded([&]() -> PyObject* {
+        const FrameTable& frame_table = self->sim->get_frame_table();
+        return typed_view<uint16_t>(frame_table.size(), "H", [&](uint16_t* out) { frame_table.pack_map(out); });
+    });
+}
+
+static PyObject* Simulator_page_table(SimulatorObject* self, PyObject* args) {
+    const char* pid = nullptr;
+    if (!PyArg_ParseTuple(args, "s", &pid) || !check_ready(self)) return nullptr;
+    return guarded([&]() -> PyObject* {
+        const PageTable* table = self->sim->get_page_table(pid);
+        if (!table) {
+            PyErr_Format(PyExc_KeyError, "No active page table for process %s", pid);
+            return nullptr;
+        }
+        return typed_view<uint64_t>(table->get_num_pages(), "Q", [&](uint64_t* out) { table->export_packed(out); });
+    });
+}
+
+static PyObject* Simulator_export_results(SimulatorObject* self, PyObject*) {
+    if (!check_ready(self)) return nullptr;
+    return guarded([&]() -> PyObject* {
+        std::string text;
+        without_gil(self, [&]() { text = self->sim->serialize_results(self->sim->export_results()); });
+        return from_text(text);
+    });
+}
+
+static PyObject* Simulator_reset(SimulatorObject* self, PyObject*) {
+    if (!check_ready(self)) return nullptr;
+    return guarded([&]() -> PyObject* {
+        self->sim->reset();
+        Py_RETURN_NONE;
+    });
+}
+
+static PyMethodDef Simulator_methods[] = {
+    {"load_settings", reinterpret_cast<PyCFunction>(Simulator_load_settings), METH_O,
+     "load_settings(settings)\n\nDiscard any previous session, apply a settings dict (same keys as the socket\n"
+     "protocol) and allocate the processes."},
+    {"step", reinterpret_cast<PyCFunction>(Simulator_step), METH_VARARGS,
+     "step(ticks=1) -> int\n\nRun the built-in random workload for `ticks` ticks; returns the accesses made."},
+    {"access", reinterpret_cast<PyCFunction>(Simulator_access), METH_VARARGS | METH_KEYWORDS,
+     "access(process_ids, addresses, tick=None) -> int\n\n"
+     "Simulate a (ticks x processes) uint64 address matrix, row-major, starting at `tick`\n"
+     "(default: after the last simulated tick); returns the accesses applied. Each column is\n"
+     "one process's stream, consumed only on the ticks that process is scheduled.\n"
+     "Raises KeyError for a process ID that load_settings did not schedule."},
+    {"translate", reinterpret_cast<PyCFunction>(Simulator_translate), METH_VARARGS,
+     "translate(process_id, addresses) -> memoryview\n\n"
+     "Physical address of each virtual address ('Q' items); 2**64 - 1 where the page is not in RAM.\n"
+     "Walks the page table only, without touching the TLB or counters."},
+    {"scheduled", reinterpret_cast<PyCFunction>(Simulator_scheduled), METH_NOARGS,
+     "scheduled() -> list\n\nIDs of the processes that got a page table and compete for the CPU."},
+    {"counters", reinterpret_cast<PyCFunction>(Simulator_counters), METH_NOARGS,
+     "counters() -> dict\n\nTick, access, TLB hit/miss, fault and average access time totals."},
+    {"progress", reinterpret_cast<PyCFunction>(Simulator_progress), METH_NOARGS,
+     "progress() -> dict\n\nThe progress event the socket server would send. Safe to call while another\n"
+     "thread is inside load_settings/access/export_results; it then returns the last checkpoint."},
+    {"cancel", reinterpret_cast<PyCFunction>(Simulator_cancel), METH_NOARGS,
+     "cancel()\n\nAsk the call running in another thread to stop at its next checkpoint."},
+    {"metrics", reinterpret_cast<PyCFunction>(Simulator_metrics), METH_NOARGS,
+     "metrics() -> dict\n\nPer-phase timers, counters and peak RSS for the current run."},
+    {"frame_map", reinterpret_cast<PyCFunction>(Simulator_frame_map), METH_NOARGS,
+     "frame_map() -> memoryview\n\nPacked (asid << 3) | kind per RAM frame then swap slot ('H' items)."},
+    {"page_table", reinterpret_cast<PyCFunction>(Simulator_page_table), METH_VARARGS,
+     "page_table(process_id) -> memoryview\n\nOne word per page: frame | in_ram << 63 ('Q' items)."},
+    {"export_results", reinterpret_cast<PyCFunction>(Simulator_export_results), METH_NOARGS,
+     "export_results() -> dict\n\nThe results document the socket server sends after a run."},
+    {"reset", reinterpret_cast<PyCFunction>(Simulator_reset), METH_NOARGS,
+     "reset()\n\nFree every process, frame and statistic."},
+    {NULL, NULL, 0, NULL}
+};
+
+static PyTypeObject SimulatorType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "vmsim_core.Simulator",
+};
+
+static PyModuleDef vmsim_core_module = {
+    PyModuleDef_HEAD_INIT,
+    "vmsim_core",
+    "In-process binding for the virtual memory simulator core.",
+    -1,
+    NULL,
+};
+
+PyMODINIT_FUNC PyInit_vmsim_core(void) {
+    SimulatorType.tp_basicsize = sizeof(SimulatorObject);
+    SimulatorType.tp_flags = Py_TPFLAGS_DEFAULT;
+    SimulatorType.tp_doc = "Simulator()\n\nOne simulator session: load_settings(), then step() or access(), then read results.";
+    SimulatorType.tp_new = Simulator_new;
+    SimulatorType.tp_dealloc = reinterpret_cast<destructor>(Simulator_dealloc);
+    SimulatorType.tp_methods = Simulator_methods;
+    if (PyType_Ready(&SimulatorType) < 0) return nullptr;
+
+    PyObject* json_module = PyImport_ImportModule("json");
+    if (!json_module) return nullptr;
+    json_dumps = PyObject_GetAttrString(json_module, "dumps");
+    json_loads = PyObject_GetAttrString(json_module, "loads");
+    Py_DECREF(json_module);
+    if (!json_dumps || !json_loads) return nullptr;
+
+    PyObject* module = PyModule_Create(&vmsim_core_module);
+    if (!module) return nullptr;
+    Py_INCREF(&SimulatorType);
+    if (PyModule_AddObject(module, "Simulator", reinterpret_cast<PyObject*>(&SimulatorType)) < 0) {
+        Py_DECREF(&SimulatorType);
+        Py_DECREF(module);
+        return nullptr;
+    }
+    return module;
+}
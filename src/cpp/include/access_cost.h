@@ -0,0 +1,67 @@
+#ifndef ACCESS_COST_H
+#define ACCESS_COST_H
+
+#include <cstdint>
+#include <vector>
+#include "json.hpp"
+
+using json = nlohmann::json;
+
+// Latency charged per simulated access, in nanoseconds. Swap I/O time comes
+// from the swap device model and is added on top of page_fault_ns.
+struct CostModel
+{
+    double tlb_hit_ns;
+    double memory_ref_ns;
+    double page_fault_ns;
+
+    CostModel();
+    static CostModel from_json(const json &settings);
+    json to_json() const;
+};
+
+struct AccessCost
+{
+    double tlb_ns;
+    double walk_ns;
+    double memory_ns;
+    double fault_ns;
+    double swap_ns;
+    double switch_ns; // Context switch charged to the first access after it
+
+    AccessCost();
+    double total() const;
+    void add(const AccessCost &other);
+    json to_json() const;
+};
+
+// Log-linear (HDR-style) latency histogram: each power-of-two range
+// [2^e, 2^(e+1)) ns is split into SUB_BUCKETS equal sub-buckets, so a bucket
+// is at most 1/SUB_BUCKETS of its value wide. Percentiles interpolate within
+// the bucket and stay cheap for millions of samples.
+class LatencyHistogram {
+public:
+    LatencyHistogram();
+    void add(double latency_ns);
+    void clear();
+    uint64_t count() const;
+    double mean() const;
+    double percentile(double p) const;
+    json export_json() const;
+
+    static const int SUB_BUCKETS = 16;
+    static const int OCTAVES = 48;
+
+private:
+    std::vector<uint64_t> buckets_; // Bucket 0 holds latencies below 1 ns
+    uint64_t count_;
+    double sum_ns_;
+    double min_ns_;
+    double max_ns_;
+
+    static size_t bucket_index(double latency_ns);
+    static double bucket_lower(size_t index);
+    static double bucket_width(size_t index);
+};
+
+#endif
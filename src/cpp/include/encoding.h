@@ -0,0 +1,10 @@
+#ifndef ENCODING_H
+#define ENCODING_H
+
+#include <string>
+
+// Base64 is used to carry packed binary arrays (address traces, frame maps) inside JSON messages.
+std::string base64_encode(const std::string& input);
+std::string base64_decode(const std::string& input);
+
+#endif
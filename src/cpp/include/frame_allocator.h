@@ -0,0 +1,67 @@
+#ifndef FRAME_ALLOCATOR_H
+#define FRAME_ALLOCATOR_H
+
+#include <cstdint>
+#include <map>
+#include <set>
+#include <string>
+#include <utility>
+#include <vector>
+#include "json.hpp"
+
+using json = nlohmann::json;
+
+enum class FitStrategy {
+    FirstFit,
+    NextFit,
+    BestFit,
+    WorstFit,
+    Buddy
+};
+
+// Extent-based allocator for contiguous runs of physical frames. The fit
+// strategies keep free space in an ordered interval map (start -> length)
+// plus a size index; the buddy strategy keeps per-order free lists.
+class FrameAllocator {
+public:
+    FrameAllocator();
+
+    void init(uint64_t base_frame, uint64_t frame_count, FitStrategy strategy);
+    void clear();
+    uint64_t allocate(uint64_t count);
+    void release(uint64_t start_frame, uint64_t count);
+
+    uint64_t total_frames() const;
+    uint64_t free_frames() const;
+    uint64_t largest_free_extent() const;
+    uint64_t largest_allocatable() const;
+    double external_fragmentation() const;
+    FitStrategy get_strategy() const;
+    json export_json() const;
+
+    static FitStrategy parse_strategy(const std::string& name);
+    static std::string strategy_name(FitStrategy strategy);
+
+private:
+    FitStrategy strategy_;
+    uint64_t base_frame_;
+    uint64_t frame_count_;
+    uint64_t free_count_;
+    uint64_t requested_frames_;
+    uint64_t granted_frames_;
+    uint64_t failed_allocations_;
+    uint64_t next_fit_cursor_;
+    std::map<uint64_t, uint64_t> extents_;              // {start, length}
+    std::set<std::pair<uint64_t, uint64_t>> by_size_;   // {length, start}
+    std::vector<std::set<uint64_t>> buddy_free_;        // per order, offsets from base_frame_
+
+    void insert_extent(uint64_t start, uint64_t length);
+    void erase_extent(std::map<uint64_t, uint64_t>::iterator it);
+    uint64_t carve_extent(std::map<uint64_t, uint64_t>::iterator it, uint64_t count);
+    uint64_t allocate_buddy(uint64_t count);
+    void release_buddy(uint64_t start_frame, uint64_t count);
+    std::vector<std::pair<uint64_t, uint64_t>> holes() const;
+    static int order_for(uint64_t count);
+};
+
+#endif
@@ -0,0 +1,65 @@
+#ifndef FRAME_TABLE_H
+#define FRAME_TABLE_H
+
+#include <cstdint>
+#include <map>
+#include <string>
+#include <vector>
+#include "json.hpp"
+
+using json = nlohmann::json;
+
+enum FrameKind : uint8_t {
+    FRAME_FREE = 0,
+    FRAME_DATA = 1,
+    FRAME_TABLE_L1 = 2,
+    FRAME_TABLE_L2 = 3,
+    FRAME_TABLE_L3 = 4,
+    FRAME_TABLE_L4 = 5,
+    FRAME_SWAP = 6
+};
+
+enum FrameFlag : uint8_t {
+    FRAME_FLAG_AVAILABLE = 1 << 0
+};
+
+// Global physical frame table kept as parallel arrays, one slot per RAM
+// frame followed by one slot per swap slot. Owner 0 means "no process".
+class FrameTable {
+public:
+    FrameTable();
+
+    void reset(uint64_t ram_frames, uint64_t swap_slots);
+    void clear();
+    void assign(uint64_t index, uint32_t asid, uint32_t virtual_page, FrameKind kind);
+    void release(uint64_t index);
+    void set_flag(uint64_t index, FrameFlag flag, bool value);
+
+    uint64_t size() const;
+    uint64_t ram_frames() const;
+    uint64_t swap_slots() const;
+    uint64_t swap_index(uint64_t slot) const;
+    uint64_t memory_bytes() const;
+    uint64_t assignments() const;
+    const std::vector<uint32_t>& owners() const;
+    const std::vector<uint32_t>& virtual_pages() const;
+    const std::vector<uint8_t>& kinds() const;
+    const std::vector<uint8_t>& flags() const;
+    json export_json(const std::map<uint32_t, std::string>& asid_names) const;
+    json export_map() const;
+    void pack_map(uint16_t* out) const;
+
+    static FrameKind table_kind(int level);
+    static const char* kind_name(uint8_t kind);
+
+private:
+    uint64_t ram_frames_;
+    uint64_t swap_slots_;
+    std::vector<uint32_t> owner_;
+    std::vector<uint32_t> virtual_page_;
+    std::vector<uint8_t> kind_;
+    std::vector<uint8_t> flags_;
+    uint64_t assignments_; // RAM frames handed out since construction; never reset
+};
+
+#endif
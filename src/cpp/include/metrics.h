@@ -0,0 +1,60 @@
+#ifndef METRICS_H
+#define METRICS_H
+
+#include <chrono>
+#include <cstdint>
+#include <map>
+#include <string>
+#include "json.hpp"
+
+using json = nlohmann::json;
+
+enum MetricCounter {
+    METRIC_ACCESSES = 0,
+    METRIC_TLB_PROBES,
+    METRIC_PAGE_WALKS,
+    METRIC_TABLE_READS,
+    METRIC_TRACE_CHUNKS,
+    METRIC_COUNTER_COUNT
+};
+
+// Per-run instrumentation: wall time per phase from a monotonic clock, event
+// counters cheap enough for the per-access path, and the process's peak RSS.
+// The simulator clears it when a run starts and attaches export_json() to the
+// results as "metrics".
+class Metrics {
+public:
+    Metrics();
+
+    void clear();
+    void add_time(const std::string& phase, double seconds);
+    void count(MetricCounter counter, uint64_t n = 1) { counters_[counter] += n; }
+    json export_json() const;
+
+    static uint64_t peak_rss_bytes();
+    static const char* counter_name(MetricCounter counter);
+
+private:
+    struct Phase {
+        double seconds;
+        uint64_t calls;
+    };
+
+    std::map<std::string, Phase> phases_;
+    uint64_t counters_[METRIC_COUNTER_COUNT];
+    std::chrono::steady_clock::time_point start_;
+};
+
+// Adds the time until it goes out of scope to a phase.
+class ScopedTimer {
+public:
+    ScopedTimer(Metrics& metrics, const char* phase);
+    ~ScopedTimer();
+
+private:
+    Metrics& metrics_;
+    const char* phase_;
+    std::chrono::steady_clock::time_point start_;
+};
+
+#endif
@@ -1,11 +1,15 @@
 #ifndef PAGE_TABLE_H
 #define PAGE_TABLE_H
 
+#include <deque>
+#include <functional>
 #include <vector>
 #include <random>
-#include <unordered_map>
 #include <string>
 #include "json.hpp"
+#include "frame_allocator.h"
+#include "frame_table.h"
+#include "swap_device.h"
 
 using json = nlohmann::json;
 
@@ -13,23 +17,42 @@ class PageTable {
 public:
     PageTable(uint64_t num_pages, uint64_t page_size_bytes, int entry_size, const std::string& allocation_type,
               uint64_t ram_frames, uint64_t total_frames, uint64_t ram_size_bytes, double frame_percent,
-              const std::string& process_id, const std::string& virtual_address_size);
+              const std::string& process_id, const std::string& virtual_address_size,
+              uint32_t asid, FrameTable& frame_table);
+    PageTable(PageTable&& other) = default;
+    PageTable(const PageTable&) = delete;
+    PageTable& operator=(const PageTable&) = delete;
     ~PageTable();
 
+    // progress(pages_placed) is called every PROGRESS_PAGES pages, including while the tables
+    // get their frames; returning true abandons the allocation.
+    typedef std::function<bool(uint64_t)> ProgressCallback;
+    static const uint64_t PROGRESS_PAGES = 4096;
+
     bool allocate(uint64_t block_size_bytes, std::vector<uint64_t>& available_frames,
-                 std::vector<uint64_t>& available_table_frames, std::mt19937& gen,
-                 std::vector<uint64_t>& available_swap_frames);
+                 FrameAllocator& frame_allocator, std::vector<uint64_t>& available_table_frames,
+                 std::mt19937& gen, SwapDevice& swap_device, const ProgressCallback& progress = ProgressCallback());
     bool access(uint64_t virtual_address);
-    json export_json() const;
+    uint64_t swap_in(uint64_t page_number, std::vector<uint64_t>& available_frames, FrameAllocator& frame_allocator,
+                     SwapDevice& swap_device, uint64_t& victim_page, double& write_us);
+    json export_json(uint64_t first_page = 1, uint64_t count = UINT64_MAX) const;
+    void export_packed(uint64_t* out) const;
     uint64_t size_bytes() const;
     uint64_t lookup(uint64_t page_number) const;
+    bool get_entry(uint64_t page_number, uint64_t& frame_number, bool& in_ram) const;
     int get_levels() const;
+    uint64_t get_num_pages() const;
+    int get_bits_per_level() const;
     const std::string& get_process_id() const;
+    uint32_t get_asid() const;
     static uint64_t get_last_used_frame();
     uint64_t get_top_level_frame() const;
-    void free_frames(std::vector<uint64_t>& available_frames, std::vector<uint64_t>& available_table_frames);
+    void free_frames(std::vector<uint64_t>& available_frames, FrameAllocator& frame_allocator,
+                     std::vector<uint64_t>& available_table_frames);
     void set_frame_availability(bool available);
-    void free_swap_frames(std::vector<uint64_t>& available_swap_frames);
+    // Contiguous mode: put what does not fit the largest free RAM extent in swap instead of failing.
+    void set_contiguous_spill(bool spill);
+    void free_swap_frames(SwapDevice& swap_device);
 
 private:
     uint64_t num_pages_;
@@ -41,6 +64,8 @@ private:
     uint64_t ram_size_bytes_;
     std::string process_id_;
     std::string virtual_address_size_;
+    uint32_t asid_;
+    FrameTable* frame_table_;
     uint64_t max_frames_;
     uint64_t pages_per_frame_;
     uint64_t entries_per_table_;
@@ -48,20 +73,27 @@ private:
     int levels_;
     static uint64_t last_used_frame_;
     uint64_t top_level_frame_;
+    uint64_t data_extent_start_;
+    uint64_t data_extent_frames_;
     std::vector<std::pair<uint64_t, bool>> single_level_table_;
     std::vector<std::pair<uint64_t, bool>> top_level_table_;
     std::vector<std::vector<std::pair<uint64_t, bool>>*> second_level_tables_;
     std::vector<std::vector<std::pair<uint64_t, bool>>*> third_level_tables_;
     std::vector<std::vector<std::pair<uint64_t, bool>>*> fourth_level_tables_;
-    std::unordered_map<uint64_t, std::pair<std::string, bool>> ram_; // {content, available}
-    std::unordered_map<std::string, std::string> swap_map_;
-    std::unordered_map<uint64_t, uint64_t> entries_;
+    std::vector<uint64_t> table_frames_;
+    std::deque<uint64_t> resident_fifo_; // Replacement order of resident pages, built at the first eviction
+    bool resident_fifo_built_;
+    bool contiguous_spill_;
 
     int calculate_levels();
     void initialize_page_tables();
     uint64_t get_unique_frame(std::vector<uint64_t>& available_frames, std::mt19937& gen);
-    uint64_t get_unique_swap_frame(std::vector<uint64_t>& available_swap_frames, std::mt19937& gen);
+    uint64_t take_free_frame(std::vector<uint64_t>& available_frames, FrameAllocator& frame_allocator);
+    uint64_t pick_victim(uint64_t& victim_frame);
+    bool place_in_swap(uint64_t first_page, uint64_t count, SwapDevice& swap_device);
     void set_page_entry(uint64_t page_number, uint64_t frame_number, bool in_ram);
+    const std::pair<uint64_t, bool>* leaf_entry(uint64_t page_number) const;
+    void claim_table_frame(uint64_t frame, int level, uint64_t table_idx);
     void log_page_table_creation();
     void log_swap_map() const;
 };
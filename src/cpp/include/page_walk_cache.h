@@ -0,0 +1,50 @@
+#ifndef PAGE_WALK_CACHE_H
+#define PAGE_WALK_CACHE_H
+
+#include <cstdint>
+#include <list>
+#include <string>
+#include <unordered_map>
+#include <vector>
+#include "json.hpp"
+
+using json = nlohmann::json;
+
+// Paging-structure caches in the style of x86 MMUs. The cache for level k
+// (2 = PDE, 3 = PDPT, 4 = PML4) holds level-k entries tagged by ASID and the
+// virtual page number bits above that level, so a hit lets a TLB miss skip
+// every table read from the top level down to level k.
+class PageWalkCache {
+public:
+    PageWalkCache();
+
+    void configure(const json& settings);
+    void clear();
+    void flush_asid(uint32_t asid);
+    int walk(uint32_t asid, uint64_t virtual_page, int levels, int bits_per_level);
+    bool is_enabled() const;
+    json export_json() const;
+
+private:
+    struct LevelCache {
+        std::string name;
+        int level;
+        uint64_t capacity;
+        std::list<uint64_t> lru; // Most recently used at the front
+        std::unordered_map<uint64_t, std::list<uint64_t>::iterator> index;
+        uint64_t lookups;
+        uint64_t hits;
+    };
+
+    bool enabled_;
+    std::vector<LevelCache> caches_; // caches_[k - 2] caches level-k entries
+    uint64_t walks_;
+    uint64_t levels_walked_;
+    uint64_t levels_skipped_;
+
+    static uint64_t make_key(uint32_t asid, uint64_t prefix);
+    bool probe(LevelCache& cache, uint64_t key);
+    void fill(LevelCache& cache, uint64_t key);
+};
+
+#endif
@@ -11,6 +11,7 @@ struct Process
     uint64_t size_bytes;
     std::string type;
     bool has_priority;
+    int priority; // Scheduler priority, higher runs first; defaults to has_priority
     bool is_process_stop;
 };
 
@@ -0,0 +1,98 @@
+#ifndef SCHEDULER_H
+#define SCHEDULER_H
+
+#include <cstdint>
+#include <functional>
+#include <queue>
+#include <string>
+#include <vector>
+#include "json.hpp"
+
+using json = nlohmann::json;
+
+enum class SchedulingPolicy {
+    RoundRobin,
+    Priority,
+    MultilevelFeedback
+};
+
+// Single-CPU scheduler deciding which process issues the access at each tick.
+// The ready queue is a binary heap ordered by (rank, arrival): rank is 0 for
+// round robin, the negated priority for the priority policy and the feedback
+// level for MLFQ, so equal ranks rotate FIFO. A process keeps the CPU for its
+// quantum (doubled per MLFQ level) or until it blocks on swap I/O. Per-process
+// statistics track CPU share and the TLB misses that follow each switch-in.
+class Scheduler {
+public:
+    Scheduler();
+
+    void configure(const json& settings);
+    void clear();
+    void add_process(const std::string& pid, int priority);
+    // Task holding the CPU at `tick`, or -1 with no processes. switched_from is
+    // the task it replaced when this tick is a context switch, otherwise -1.
+    int next(int tick, int& switched_from);
+    // Outcome of the running task's access; blocked (a swap-in) yields the CPU.
+    void record_access(bool tlb_miss, bool blocked);
+    const std::string& process_id(int task) const;
+    uint64_t context_switches() const;
+    double context_switch_ns() const;
+    json export_json() const;
+
+    static SchedulingPolicy parse_policy(const std::string& name);
+    static std::string policy_name(SchedulingPolicy policy);
+
+private:
+    struct Task {
+        std::string pid;
+        int priority;
+        int level;               // MLFQ queue, 0 = top
+        uint64_t ticks;
+        uint64_t switch_ins;
+        uint64_t accesses;
+        uint64_t misses;
+        uint64_t window_left;    // Accesses left in the post-switch window
+        uint64_t window_accesses;
+        uint64_t window_misses;
+        bool in_burst;           // Every access since the switch-in missed so far
+        uint64_t current_burst;
+        uint64_t burst_misses;
+        uint64_t longest_burst;
+    };
+
+    struct ReadyEntry {
+        int rank;
+        uint64_t arrival;
+        int task;
+        bool operator>(const ReadyEntry& other) const;
+    };
+
+    SchedulingPolicy policy_;
+    int quantum_ticks_;
+    int levels_;
+    int boost_ticks_;
+    double context_switch_ns_;
+    uint64_t burst_window_;
+    bool yield_on_fault_;
+
+    std::vector<Task> tasks_;
+    std::priority_queue<ReadyEntry, std::vector<ReadyEntry>, std::greater<ReadyEntry>> ready_;
+    uint64_t arrivals_;
+    int running_;
+    int last_ran_;
+    int slice_left_;
+    int last_boost_;
+    uint64_t total_ticks_;
+    uint64_t switches_;
+    uint64_t fault_yields_;
+    uint64_t boosts_;
+
+    int rank(const Task& task) const;
+    int quantum(const Task& task) const;
+    void enqueue(int task);
+    void dispatch(int& switched_from);
+    void boost();
+    static void end_burst(Task& task);
+};
+
+#endif
@@ -0,0 +1,56 @@
+#ifndef SHARED_MEMORY_H
+#define SHARED_MEMORY_H
+
+#include <cstdint>
+#include <string>
+#include "json.hpp"
+
+#ifdef _WIN32
+#ifndef WIN32_LEAN_AND_MEAN
+#define WIN32_LEAN_AND_MEAN // keep windows.h from pulling in winsock.h ahead of winsock2.h
+#endif
+#include <windows.h>
+#endif
+
+using json = nlohmann::json;
+
+// Named shared-memory region for bulk result arrays. export_results() writes
+// page tables, time series and the frame map here and puts small block
+// descriptors ({"shm": {"offset", "length", "dtype", "count"}}) in the JSON, so
+// the client maps the data instead of receiving it over the socket. Both ends
+// run on the same host, so dtypes use native byte order ("=").
+// POSIX uses shm_open/mmap; Windows uses a pagefile-backed file mapping.
+// Every export starts a new generation of the region (<name>-<n>) with clear()
+// and unlinks the previous one, so arrays a client still maps over an earlier
+// export are never overwritten; the client releases them by unmapping.
+class SharedMemoryRegion {
+public:
+    explicit SharedMemoryRegion(const std::string& base_name);
+    ~SharedMemoryRegion();
+
+    void clear();
+    // Reserve an 8-byte aligned block of `bytes` and describe it in `block`.
+    // The pointer is valid until the next call to allocate().
+    uint8_t* allocate(uint64_t bytes, const json& dtype, uint64_t count, json& block);
+    bool is_open() const;
+    json describe() const;
+
+private:
+    bool ensure_capacity(uint64_t bytes);
+    bool map(uint64_t capacity);
+    void unmap();
+
+    std::string base_name_;
+    std::string name_;
+    int generation_;
+    uint8_t* data_;
+    uint64_t capacity_;
+    uint64_t used_;
+#ifdef _WIN32
+    HANDLE mapping_;
+#else
+    int fd_;
+#endif
+};
+
+#endif
@@ -1,21 +1,51 @@
 #ifndef SOCKET_HANDLER_H
 #define SOCKET_HANDLER_H
 
+#include <cstdint>
+#include <string>
+
+#ifdef _WIN32
 #include <winsock2.h>
 #include <ws2tcpip.h>
-#include <string>
+#else
+#include <sys/socket.h>
+#include <sys/select.h>
+#include <sys/un.h>
+#include <unistd.h>
+
+typedef int SOCKET;
+#define INVALID_SOCKET (-1)
+#define SOCKET_ERROR (-1)
+#endif
 
+// Totals since the handler was created; callers take differences per run.
+struct SocketStats {
+    uint64_t bytes_sent;
+    uint64_t bytes_received;
+    uint64_t messages_sent;
+    double send_seconds;
+};
+
+// Control channel to the Python client: loopback TCP on Windows, a Unix-domain
+// socket elsewhere (path from VMSIM_SOCKET, default /tmp/virtual_memory_simulator.sock).
 class SocketHandler {
 public:
     SocketHandler();
     ~SocketHandler();
     bool accept_connection();
     std::string read();
+    bool poll_message(std::string& message);
     bool write(const std::string& data);
+    const SocketStats& get_stats() const;
 
 private:
+    void close_client();
+
     SOCKET server_socket;
     SOCKET client_socket;
+    std::string pending;
+    std::string endpoint;
+    SocketStats stats;
 };
 
-#endif
\ No newline at end of file
+#endif
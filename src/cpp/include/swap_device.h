@@ -0,0 +1,66 @@
+#ifndef SWAP_DEVICE_H
+#define SWAP_DEVICE_H
+
+#include <cstdint>
+#include <deque>
+#include <string>
+#include <unordered_set>
+#include <vector>
+#include "json.hpp"
+
+using json = nlohmann::json;
+
+struct SwapDeviceModel
+{
+    std::string name;
+    double latency_us;     // Fixed cost per I/O operation (seek, rotation, command overhead)
+    double bandwidth_mb_s; // Sequential transfer rate
+
+    static SwapDeviceModel preset(const std::string &name);
+};
+
+// Swap space as a slot bitmap plus a simple device timing model. Swap-out is
+// issued in clusters of contiguous slots, swap-in reads ahead the following
+// slots into a small swap cache.
+class SwapDevice {
+public:
+    SwapDevice();
+
+    void init(uint64_t slot_count, uint64_t page_size_bytes, const SwapDeviceModel& model,
+              uint64_t cluster_pages, uint64_t readahead_pages);
+    void clear();
+    uint64_t allocate_slot();
+    uint64_t allocate_cluster(uint64_t count);
+    void free_slot(uint64_t slot);
+    bool is_used(uint64_t slot) const;
+    uint64_t total_slots() const;
+    uint64_t free_slots() const;
+    uint64_t get_cluster_pages() const;
+    double swap_out(uint64_t count);
+    double swap_in(uint64_t slot);
+    json export_json() const;
+
+private:
+    std::vector<uint64_t> bitmap_;
+    uint64_t slot_count_;
+    uint64_t used_slots_;
+    uint64_t search_hint_;
+    uint64_t page_size_bytes_;
+    uint64_t cluster_pages_;
+    uint64_t readahead_pages_;
+    SwapDeviceModel model_;
+    uint64_t read_ops_;
+    uint64_t write_ops_;
+    uint64_t pages_read_;
+    uint64_t pages_written_;
+    uint64_t readahead_hits_;
+    double read_time_us_;
+    double write_time_us_;
+    std::deque<uint64_t> readahead_fifo_;
+    std::unordered_set<uint64_t> readahead_cache_;
+
+    void set_used(uint64_t slot, bool used);
+    double io_cost_us(uint64_t pages) const;
+};
+
+#endif
@@ -3,13 +3,26 @@
 
 #include "json.hpp"
 #include "page_table.h"
+#include "frame_allocator.h"
+#include "frame_table.h"
+#include "swap_device.h"
+#include "access_cost.h"
+#include "page_walk_cache.h"
+#include "scheduler.h"
+#include "metrics.h"
 #include "socket_handler.h"
+#include "shared_memory.h"
 #include "process.h"
 #include <string>
 #include <vector>
 #include <map>
 #include <unordered_map>
 #include <queue>
+#include <deque>
+#include <random>
+#include <chrono>
+#include <atomic>
+#include <mutex>
 
 using json = nlohmann::json;
 
@@ -35,11 +48,26 @@ struct PageTableEntry
 class VirtualMemorySimulator
 {
 public:
-    VirtualMemorySimulator(SocketHandler *handler);
+    VirtualMemorySimulator(SocketHandler *handler); // handler may be null for in-process use
     ~VirtualMemorySimulator();
     void load_settings(const json &settings);
     void simulate();
+    uint64_t step(int ticks);
+    uint64_t apply_trace_chunk(const json &chunk);
+    uint64_t apply_trace(const std::vector<std::string> &process_ids, const uint64_t *addresses, size_t rows, int first_tick);
+    bool translate(const std::string &pid, uint64_t virtual_address, uint64_t &physical_address) const;
+    json counters() const;
+    bool is_trace_driven() const;
+    json progress_snapshot() const;
+    json published_progress() const;
+    bool checkpoint(const std::string &phase, uint64_t done, uint64_t total, bool force = false);
+    bool is_cancelled() const;
+    void request_cancel();
+    std::vector<std::string> scheduled_ids() const;
     json export_results();
+    std::string serialize_results(const json &result);
+    json metrics_snapshot() const;
+    Metrics &get_metrics();
     void reset();
     std::string read_socket();
     bool write_socket(const std::string &data);
@@ -48,9 +76,20 @@ public:
     uint64_t get_frame_number(const std::string &pid, uint64_t page_number);
     void tlb_insert(const std::string &pid, uint64_t page_no, uint64_t virtual_address, uint64_t frame_no, int process_status);
     void tlb_remove_process(const std::string &pid);
+    void tlb_invalidate(const std::string &pid, uint64_t page_no);
+    void tlb_flush();
     uint64_t tlb_get_frame(const std::string &pid, uint64_t page_no);
+    uint32_t get_asid(const std::string &pid);
+    const FrameTable &get_frame_table() const;
+    const PageTable *get_page_table(const std::string &pid) const;
+    uint64_t get_page_size_bytes() const;
 
 private:
+    void simulate_access(const std::string &pid, uint64_t virtual_address, int t);
+    int schedule(int tick);
+    void context_switch(const std::string &from);
+    void begin_run();
+
     SocketHandler *socket_handler;
     std::vector<Process> processes;
     uint64_t ram_size_bytes;
@@ -58,10 +97,36 @@ private:
     int tlb_size;     // In KB
     int tlb_capacity; // Number of TLB entries
     bool tlb_enabled;
+    bool tlb_asids;   // TLB and walk-cache entries are ASID-tagged, so context switches need no flush
     std::string virtual_address_size;
     std::string rom_size;
     int swap_percent;
+    SwapDeviceModel swap_model;
+    uint64_t swap_cluster_pages;
+    uint64_t swap_readahead_pages;
     std::string allocation_type;
+    FitStrategy allocation_strategy;
+    bool contiguous_spill; // Contiguous processes without a large enough RAM extent spill to swap instead of failing
+    bool trace_driven; // Accesses arrive as trace_chunk messages instead of the built-in random loop
+    bool summary_only; // Export totals and statistics only, without per-page or per-access data
+    bool use_shared_memory; // Client maps bulk arrays from shared_memory instead of reading them as JSON
+    SharedMemoryRegion shared_memory;
+    uint64_t trace_ticks; // Ticks the client will stream in a trace-driven run, for progress totals
+    std::atomic<bool> cancelled; // Set by a cancel message or request_cancel(); work stops at the next checkpoint
+    std::string progress_phase;
+    uint64_t progress_done;
+    uint64_t progress_total;
+    uint64_t accesses_done;
+    std::chrono::steady_clock::time_point run_start;
+    std::chrono::steady_clock::time_point last_progress;
+    mutable std::mutex progress_mutex; // Guards last_published for readers on other threads
+    json last_published;
+    Metrics metrics;
+    uint64_t frames_baseline;     // frame_table.assignments() when the run started
+    SocketStats socket_baseline;  // Socket totals when the run started
+    std::mt19937 rng; // Built-in workload generator, reseeded by simulate()
+    int next_tick;
+    uint64_t va_max;
     std::vector<std::pair<int, int>> tlb_hits;
     std::vector<std::pair<int, int>> tlb_misses;
     std::vector<std::pair<int, double>> tlb_hit_rate;
@@ -70,9 +135,23 @@ private:
     int total_hits;
     int total_misses;
     int total_faults;
+    CostModel cost_model;
+    AccessCost access_cost_total;
+    PageWalkCache page_walk_cache;
+    Scheduler scheduler;
+    std::vector<size_t> scheduled; // Index into processes for each scheduler task
+    std::vector<std::deque<uint64_t>> trace_queues; // Per task: streamed addresses it has not issued yet
+    uint64_t trace_dropped; // Streamed addresses discarded because their task's queue was full
+    uint64_t tlb_flushes;
+    double pending_switch_ns; // Context-switch time not yet charged to an access
+    std::map<std::string, LatencyHistogram> access_latency;
     std::vector<uint64_t> available_frames;
+    FrameAllocator frame_allocator;
+    FrameTable frame_table;
+    std::map<uint32_t, std::string> asid_names;
+    std::unordered_map<std::string, uint32_t> asids;
     std::vector<uint64_t> available_table_frames;
-    std::vector<uint64_t> available_swap_frames;
+    SwapDevice swap_device;
     std::unordered_map<std::string, TLBEntry> tlb;
     std::queue<std::string> tlb_fifo;
 };
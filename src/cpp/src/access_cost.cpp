@@ -0,0 +1,140 @@
+#include "access_cost.h"
+#include <algorithm>
+#include <cmath>
+
+CostModel::CostModel() : tlb_hit_ns(1.0), memory_ref_ns(100.0), page_fault_ns(5000.0) {}
+
+CostModel CostModel::from_json(const json& settings) {
+    CostModel model;
+    auto it = settings.find("cost_model");
+    if (it != settings.end() && it->is_object()) {
+        const json& cost = *it;
+        model.tlb_hit_ns = cost.value("tlb_hit_ns", model.tlb_hit_ns);
+        model.memory_ref_ns = cost.value("memory_ref_ns", model.memory_ref_ns);
+        model.page_fault_ns = cost.value("page_fault_ns", model.page_fault_ns);
+    }
+    return model;
+}
+
+json CostModel::to_json() const {
+    return {
+        {"tlb_hit_ns", tlb_hit_ns},
+        {"memory_ref_ns", memory_ref_ns},
+        {"page_fault_ns", page_fault_ns}
+    };
+}
+
+AccessCost::AccessCost() : tlb_ns(0.0), walk_ns(0.0), memory_ns(0.0), fault_ns(0.0), swap_ns(0.0), switch_ns(0.0) {}
+
+double AccessCost::total() const {
+    return tlb_ns + walk_ns + memory_ns + fault_ns + swap_ns + switch_ns;
+}
+
+void AccessCost::add(const AccessCost& other) {
+    tlb_ns += other.tlb_ns;
+    walk_ns += other.walk_ns;
+    memory_ns += other.memory_ns;
+    fault_ns += other.fault_ns;
+    swap_ns += other.swap_ns;
+    switch_ns += other.switch_ns;
+}
+
+json AccessCost::to_json() const {
+    return {
+        {"tlb_ns", tlb_ns},
+        {"walk_ns", walk_ns},
+        {"memory_ns", memory_ns},
+        {"fault_ns", fault_ns},
+        {"swap_ns", swap_ns},
+        {"switch_ns", switch_ns}
+    };
+}
+
+LatencyHistogram::LatencyHistogram()
+    : buckets_(1 + OCTAVES * SUB_BUCKETS, 0), count_(0), sum_ns_(0.0), min_ns_(0.0), max_ns_(0.0) {}
+
+size_t LatencyHistogram::bucket_index(double latency_ns) {
+    if (latency_ns < 1.0) return 0;
+    int exponent = 0;
+    double mantissa = std::frexp(latency_ns, &exponent); // latency = mantissa * 2^exponent, mantissa in [0.5, 1)
+    int octave = exponent - 1;
+    if (octave >= OCTAVES) return static_cast<size_t>(OCTAVES) * SUB_BUCKETS;
+    int sub = std::min(SUB_BUCKETS - 1, static_cast<int>((mantissa * 2.0 - 1.0) * SUB_BUCKETS));
+    return 1 + static_cast<size_t>(octave) * SUB_BUCKETS + sub;
+}
+
+double LatencyHistogram::bucket_lower(size_t index) {
+    if (index == 0) return 0.0;
+    size_t octave = (index - 1) / SUB_BUCKETS;
+    size_t sub = (index - 1) % SUB_BUCKETS;
+    return std::ldexp(1.0 + static_cast<double>(sub) / SUB_BUCKETS, static_cast<int>(octave));
+}
+
+double LatencyHistogram::bucket_width(size_t index) {
+    if (index == 0) return 1.0;
+    return std::ldexp(1.0 / SUB_BUCKETS, static_cast<int>((index - 1) / SUB_BUCKETS));
+}
+
+void LatencyHistogram::add(double latency_ns) {
+    buckets_[bucket_index(latency_ns)]++;
+    min_ns_ = count_ == 0 ? latency_ns : std::min(min_ns_, latency_ns);
+    max_ns_ = std::max(max_ns_, latency_ns);
+    count_++;
+    sum_ns_ += latency_ns;
+}
+
+void LatencyHistogram::clear() {
+    std::fill(buckets_.begin(), buckets_.end(), 0);
+    count_ = 0;
+    sum_ns_ = 0.0;
+    min_ns_ = 0.0;
+    max_ns_ = 0.0;
+}
+
+uint64_t LatencyHistogram::count() const {
+    return count_;
+}
+
+double LatencyHistogram::mean() const {
+    return count_ > 0 ? sum_ns_ / count_ : 0.0;
+}
+
+double LatencyHistogram::percentile(double p) const {
+    if (count_ == 0) return 0.0;
+    uint64_t rank = std::max<uint64_t>(1, static_cast<uint64_t>(std::ceil(p / 100.0 * count_)));
+    uint64_t seen = 0;
+    for (size_t i = 0; i < buckets_.size(); ++i) {
+        if (buckets_[i] == 0) continue;
+        if (seen + buckets_[i] >= rank) {
+            // Spread the bucket's samples evenly across it, then clamp to what was observed.
+            double fraction = static_cast<double>(rank - seen) / buckets_[i];
+            double value = bucket_lower(i) + fraction * bucket_width(i);
+            return std::max(min_ns_, std::min(value, max_ns_));
+        }
+        seen += buckets_[i];
+    }
+    return max_ns_;
+}
+
+json LatencyHistogram::export_json() const {
+    // Exported per power of two, as (lower bound ns, count), to keep the payload small.
+    std::vector<std::pair<double, uint64_t>> histogram;
+    for (size_t i = 0; i < buckets_.size(); ++i) {
+        if (buckets_[i] == 0) continue;
+        double lower = i == 0 ? 0.0 : std::ldexp(1.0, static_cast<int>((i - 1) / SUB_BUCKETS));
+        if (!histogram.empty() && histogram.back().first == lower) {
+            histogram.back().second += buckets_[i];
+        } else {
+            histogram.push_back({lower, buckets_[i]});
+        }
+    }
+    json result;
+    result["accesses"] = count_;
+    result["average_ns"] = mean();
+    result["p50_ns"] = percentile(50.0);
+    result["p90_ns"] = percentile(90.0);
+    result["p99_ns"] = percentile(99.0);
+    result["max_ns"] = max_ns_;
+    result["histogram"] = histogram;
+    return result;
+}
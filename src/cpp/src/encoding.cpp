@@ -0,0 +1,58 @@
+#include "encoding.h"
+#include <cstdint>
+#include <stdexcept>
+
+static const char base64_alphabet[] = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/";
+
+static int base64_value(char c) {
+    if (c >= 'A' && c <= 'Z') return c - 'A';
+    if (c >= 'a' && c <= 'z') return c - 'a' + 26;
+    if (c >= '0' && c <= '9') return c - '0' + 52;
+    if (c == '+') return 62;
+    if (c == '/') return 63;
+    return -1;
+}
+
+std::string base64_encode(const std::string& input) {
+    std::string output;
+    output.reserve((input.size() + 2) / 3 * 4);
+    size_t i = 0;
+    for (; i + 2 < input.size(); i += 3) {
+        uint32_t triple = (static_cast<uint8_t>(input[i]) << 16) | (static_cast<uint8_t>(input[i + 1]) << 8) |
+                          static_cast<uint8_t>(input[i + 2]);
+        output.push_back(base64_alphabet[(triple >> 18) & 0x3F]);
+        output.push_back(base64_alphabet[(triple >> 12) & 0x3F]);
+        output.push_back(base64_alphabet[(triple >> 6) & 0x3F]);
+        output.push_back(base64_alphabet[triple & 0x3F]);
+    }
+    if (i < input.size()) {
+        uint32_t triple = static_cast<uint8_t>(input[i]) << 16;
+        if (i + 1 < input.size()) triple |= static_cast<uint8_t>(input[i + 1]) << 8;
+        output.push_back(base64_alphabet[(triple >> 18) & 0x3F]);
+        output.push_back(base64_alphabet[(triple >> 12) & 0x3F]);
+        output.push_back(i + 1 < input.size() ? base64_alphabet[(triple >> 6) & 0x3F] : '=');
+        output.push_back('=');
+    }
+    return output;
+}
+
+std::string base64_decode(const std::string& input) {
+    std::string output;
+    output.reserve(input.size() / 4 * 3);
+    uint32_t accumulator = 0;
+    int bits = 0;
+    for (char c : input) {
+        if (c == '=') break;
+        int value = base64_value(c);
+        if (value < 0) {
+            throw std::runtime_error("Invalid base64 input");
+        }
+        accumulator = (accumulator << 6) | static_cast<uint32_t>(value);
+        bits += 6;
+        if (bits >= 8) {
+            bits -= 8;
+            output.push_back(static_cast<char>((accumulator >> bits) & 0xFF));
+        }
+    }
+    return output;
+}
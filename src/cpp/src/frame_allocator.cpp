@@ -0,0 +1,307 @@
+#include "frame_allocator.h"
+#include <algorithm>
+#include <fstream>
+
+FrameAllocator::FrameAllocator()
+    : strategy_(FitStrategy::FirstFit), base_frame_(0), frame_count_(0), free_count_(0),
+      requested_frames_(0), granted_frames_(0), failed_allocations_(0), next_fit_cursor_(0) {}
+
+FitStrategy FrameAllocator::parse_strategy(const std::string& name) {
+    if (name == "Best Fit") return FitStrategy::BestFit;
+    if (name == "Next Fit") return FitStrategy::NextFit;
+    if (name == "Worst Fit") return FitStrategy::WorstFit;
+    if (name == "Buddy") return FitStrategy::Buddy;
+    return FitStrategy::FirstFit;
+}
+
+std::string FrameAllocator::strategy_name(FitStrategy strategy) {
+    switch (strategy) {
+        case FitStrategy::BestFit: return "Best Fit";
+        case FitStrategy::NextFit: return "Next Fit";
+        case FitStrategy::WorstFit: return "Worst Fit";
+        case FitStrategy::Buddy: return "Buddy";
+        default: return "First Fit";
+    }
+}
+
+int FrameAllocator::order_for(uint64_t count) {
+    int order = 0;
+    while ((1ULL << order) < count) {
+        order++;
+    }
+    return order;
+}
+
+void FrameAllocator::init(uint64_t base_frame, uint64_t frame_count, FitStrategy strategy) {
+    clear();
+    strategy_ = strategy;
+    base_frame_ = base_frame;
+    frame_count_ = frame_count;
+    free_count_ = frame_count;
+    next_fit_cursor_ = base_frame;
+
+    if (strategy_ == FitStrategy::Buddy) {
+        // Carve the range into the largest naturally aligned blocks that fit.
+        buddy_free_.resize(order_for(std::max<uint64_t>(frame_count, 1)) + 1);
+        uint64_t offset = 0;
+        while (offset < frame_count) {
+            int order = static_cast<int>(buddy_free_.size()) - 1;
+            while (order > 0 && ((offset & ((1ULL << order) - 1)) != 0 || offset + (1ULL << order) > frame_count)) {
+                order--;
+            }
+            buddy_free_[order].insert(offset);
+            offset += 1ULL << order;
+        }
+    } else if (frame_count > 0) {
+        insert_extent(base_frame, frame_count);
+    }
+
+    std::ofstream debug("debug.txt", std::ios::app);
+    debug << "Frame allocator initialized: " << strategy_name(strategy_) << ", base frame " << base_frame
+          << ", " << frame_count << " frames\n";
+    debug.close();
+}
+
+void FrameAllocator::clear() {
+    extents_.clear();
+    by_size_.clear();
+    buddy_free_.clear();
+    base_frame_ = 0;
+    frame_count_ = 0;
+    free_count_ = 0;
+    requested_frames_ = 0;
+    granted_frames_ = 0;
+    failed_allocations_ = 0;
+    next_fit_cursor_ = 0;
+}
+
+void FrameAllocator::insert_extent(uint64_t start, uint64_t length) {
+    auto next = extents_.lower_bound(start);
+    if (next != extents_.begin()) {
+        auto prev = std::prev(next);
+        if (prev->first + prev->second == start) {
+            start = prev->first;
+            length += prev->second;
+            erase_extent(prev);
+        }
+    }
+    if (next != extents_.end() && start + length == next->first) {
+        length += next->second;
+        erase_extent(next);
+    }
+    extents_[start] = length;
+    by_size_.insert({length, start});
+}
+
+void FrameAllocator::erase_extent(std::map<uint64_t, uint64_t>::iterator it) {
+    by_size_.erase({it->second, it->first});
+    extents_.erase(it);
+}
+
+uint64_t FrameAllocator::carve_extent(std::map<uint64_t, uint64_t>::iterator it, uint64_t count) {
+    uint64_t start = it->first;
+    uint64_t length = it->second;
+    erase_extent(it);
+    if (length > count) {
+        extents_[start + count] = length - count;
+        by_size_.insert({length - count, start + count});
+    }
+    next_fit_cursor_ = start + count;
+    return start;
+}
+
+uint64_t FrameAllocator::allocate(uint64_t count) {
+    if (count == 0 || count > free_count_) {
+        failed_allocations_++;
+        return UINT64_MAX;
+    }
+    if (strategy_ == FitStrategy::Buddy) {
+        return allocate_buddy(count);
+    }
+
+    auto chosen = extents_.end();
+    switch (strategy_) {
+        case FitStrategy::FirstFit:
+            for (auto it = extents_.begin(); it != extents_.end(); ++it) {
+                if (it->second >= count) {
+                    chosen = it;
+                    break;
+                }
+            }
+            break;
+        case FitStrategy::NextFit: {
+            auto start = extents_.lower_bound(next_fit_cursor_);
+            for (auto it = start; it != extents_.end(); ++it) {
+                if (it->second >= count) {
+                    chosen = it;
+                    break;
+                }
+            }
+            if (chosen == extents_.end()) {
+                for (auto it = extents_.begin(); it != start; ++it) {
+                    if (it->second >= count) {
+                        chosen = it;
+                        break;
+                    }
+                }
+            }
+            break;
+        }
+        case FitStrategy::BestFit: {
+            auto fit = by_size_.lower_bound({count, 0});
+            if (fit != by_size_.end()) chosen = extents_.find(fit->second);
+            break;
+        }
+        case FitStrategy::WorstFit:
+            if (!by_size_.empty() && by_size_.rbegin()->first >= count) {
+                chosen = extents_.find(by_size_.rbegin()->second);
+            }
+            break;
+        default:
+            break;
+    }
+
+    if (chosen == extents_.end()) {
+        failed_allocations_++;
+        return UINT64_MAX;
+    }
+    free_count_ -= count;
+    requested_frames_ += count;
+    granted_frames_ += count;
+    return carve_extent(chosen, count);
+}
+
+uint64_t FrameAllocator::allocate_buddy(uint64_t count) {
+    int order = order_for(count);
+    int found = -1;
+    for (int k = order; k < static_cast<int>(buddy_free_.size()); ++k) {
+        if (!buddy_free_[k].empty()) {
+            found = k;
+            break;
+        }
+    }
+    if (found < 0) {
+        failed_allocations_++;
+        return UINT64_MAX;
+    }
+    uint64_t offset = *buddy_free_[found].begin();
+    buddy_free_[found].erase(buddy_free_[found].begin());
+    while (found > order) {
+        found--;
+        buddy_free_[found].insert(offset + (1ULL << found));
+    }
+    free_count_ -= 1ULL << order;
+    requested_frames_ += count;
+    granted_frames_ += 1ULL << order;
+    return base_frame_ + offset;
+}
+
+void FrameAllocator::release(uint64_t start_frame, uint64_t count) {
+    if (count == 0) return;
+    if (strategy_ == FitStrategy::Buddy) {
+        release_buddy(start_frame, count);
+        return;
+    }
+    free_count_ += count;
+    insert_extent(start_frame, count);
+}
+
+void FrameAllocator::release_buddy(uint64_t start_frame, uint64_t count) {
+    int order = order_for(count);
+    uint64_t offset = start_frame - base_frame_;
+    free_count_ += 1ULL << order;
+    while (order + 1 < static_cast<int>(buddy_free_.size())) {
+        uint64_t buddy = offset ^ (1ULL << order);
+        auto it = buddy_free_[order].find(buddy);
+        if (it == buddy_free_[order].end()) break;
+        buddy_free_[order].erase(it);
+        offset = std::min(offset, buddy);
+        order++;
+    }
+    buddy_free_[order].insert(offset);
+}
+
+std::vector<std::pair<uint64_t, uint64_t>> FrameAllocator::holes() const {
+    std::vector<std::pair<uint64_t, uint64_t>> result;
+    if (strategy_ != FitStrategy::Buddy) {
+        result.assign(extents_.begin(), extents_.end());
+        return result;
+    }
+    std::vector<std::pair<uint64_t, uint64_t>> blocks;
+    for (size_t order = 0; order < buddy_free_.size(); ++order) {
+        for (uint64_t offset : buddy_free_[order]) {
+            blocks.push_back({base_frame_ + offset, 1ULL << order});
+        }
+    }
+    std::sort(blocks.begin(), blocks.end());
+    for (const auto& block : blocks) {
+        if (!result.empty() && result.back().first + result.back().second == block.first) {
+            result.back().second += block.second;
+        } else {
+            result.push_back(block);
+        }
+    }
+    return result;
+}
+
+uint64_t FrameAllocator::total_frames() const {
+    return frame_count_;
+}
+
+uint64_t FrameAllocator::free_frames() const {
+    return free_count_;
+}
+
+uint64_t FrameAllocator::largest_free_extent() const {
+    if (strategy_ != FitStrategy::Buddy) {
+        return by_size_.empty() ? 0 : by_size_.rbegin()->first;
+    }
+    uint64_t largest = 0;
+    for (const auto& hole : holes()) {
+        largest = std::max(largest, hole.second);
+    }
+    return largest;
+}
+
+uint64_t FrameAllocator::largest_allocatable() const {
+    if (strategy_ != FitStrategy::Buddy) {
+        return largest_free_extent();
+    }
+    for (int order = static_cast<int>(buddy_free_.size()) - 1; order >= 0; --order) {
+        if (!buddy_free_[order].empty()) return 1ULL << order;
+    }
+    return 0;
+}
+
+double FrameAllocator::external_fragmentation() const {
+    if (free_count_ == 0) return 0.0;
+    return 1.0 - static_cast<double>(largest_free_extent()) / free_count_;
+}
+
+FitStrategy FrameAllocator::get_strategy() const {
+    return strategy_;
+}
+
+json FrameAllocator::export_json() const {
+    std::vector<std::pair<uint64_t, uint64_t>> free_holes = holes();
+    std::map<uint64_t, uint64_t> histogram; // {bucket lower bound, hole count}
+    uint64_t largest = 0;
+    for (const auto& hole : free_holes) {
+        uint64_t bucket = 1ULL << (order_for(hole.second + 1) - 1);
+        histogram[bucket]++;
+        largest = std::max(largest, hole.second);
+    }
+
+    json result;
+    result["strategy"] = strategy_name(strategy_);
+    result["total_frames"] = frame_count_;
+    result["free_frames"] = free_count_;
+    result["hole_count"] = free_holes.size();
+    result["largest_free_extent"] = largest;
+    result["external_fragmentation"] = free_count_ > 0 ? 1.0 - static_cast<double>(largest) / free_count_ : 0.0;
+    result["internal_fragmentation"] = granted_frames_ > 0
+        ? static_cast<double>(granted_frames_ - requested_frames_) / granted_frames_ : 0.0;
+    result["failed_allocations"] = failed_allocations_;
+    result["hole_histogram"] = std::vector<std::pair<uint64_t, uint64_t>>(histogram.begin(), histogram.end());
+    return result;
+}
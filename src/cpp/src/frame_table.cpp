@@ -0,0 +1,200 @@
+#include "frame_table.h"
+#include "encoding.h"
+#include <algorithm>
+#include <fstream>
+
+FrameTable::FrameTable() : ram_frames_(0), swap_slots_(0), assignments_(0) {}
+
+void FrameTable::reset(uint64_t ram_frames, uint64_t swap_slots) {
+    ram_frames_ = ram_frames;
+    swap_slots_ = swap_slots;
+    uint64_t total = ram_frames + swap_slots;
+    owner_.assign(total, 0);
+    virtual_page_.assign(total, 0);
+    kind_.assign(total, FRAME_FREE);
+    flags_.assign(total, 0);
+
+    std::ofstream debug("debug.txt", std::ios::app);
+    debug << "Frame table initialized: " << ram_frames << " RAM frames, " << swap_slots
+          << " swap slots, " << memory_bytes() << " bytes\n";
+    debug.close();
+}
+
+void FrameTable::clear() {
+    ram_frames_ = 0;
+    swap_slots_ = 0;
+    std::vector<uint32_t>().swap(owner_);
+    std::vector<uint32_t>().swap(virtual_page_);
+    std::vector<uint8_t>().swap(kind_);
+    std::vector<uint8_t>().swap(flags_);
+}
+
+void FrameTable::assign(uint64_t index, uint32_t asid, uint32_t virtual_page, FrameKind kind) {
+    if (index >= owner_.size()) return;
+    if (index < ram_frames_) assignments_++;
+    owner_[index] = asid;
+    virtual_page_[index] = virtual_page;
+    kind_[index] = kind;
+    flags_[index] = FRAME_FLAG_AVAILABLE;
+}
+
+void FrameTable::release(uint64_t index) {
+    if (index >= owner_.size()) return;
+    owner_[index] = 0;
+    virtual_page_[index] = 0;
+    kind_[index] = FRAME_FREE;
+    flags_[index] = 0;
+}
+
+void FrameTable::set_flag(uint64_t index, FrameFlag flag, bool value) {
+    if (index >= flags_.size()) return;
+    if (value) {
+        flags_[index] |= flag;
+    } else {
+        flags_[index] &= static_cast<uint8_t>(~flag);
+    }
+}
+
+uint64_t FrameTable::size() const {
+    return owner_.size();
+}
+
+uint64_t FrameTable::ram_frames() const {
+    return ram_frames_;
+}
+
+uint64_t FrameTable::swap_slots() const {
+    return swap_slots_;
+}
+
+uint64_t FrameTable::swap_index(uint64_t slot) const {
+    return ram_frames_ + slot;
+}
+
+uint64_t FrameTable::assignments() const {
+    return assignments_;
+}
+
+uint64_t FrameTable::memory_bytes() const {
+    return owner_.capacity() * sizeof(uint32_t) + virtual_page_.capacity() * sizeof(uint32_t) +
+           kind_.capacity() * sizeof(uint8_t) + flags_.capacity() * sizeof(uint8_t);
+}
+
+const std::vector<uint32_t>& FrameTable::owners() const {
+    return owner_;
+}
+
+const std::vector<uint32_t>& FrameTable::virtual_pages() const {
+    return virtual_page_;
+}
+
+const std::vector<uint8_t>& FrameTable::kinds() const {
+    return kind_;
+}
+
+const std::vector<uint8_t>& FrameTable::flags() const {
+    return flags_;
+}
+
+FrameKind FrameTable::table_kind(int level) {
+    switch (level) {
+        case 1: return FRAME_TABLE_L1;
+        case 2: return FRAME_TABLE_L2;
+        case 3: return FRAME_TABLE_L3;
+        default: return FRAME_TABLE_L4;
+    }
+}
+
+const char* FrameTable::kind_name(uint8_t kind) {
+    switch (kind) {
+        case FRAME_DATA: return "data";
+        case FRAME_TABLE_L1: return "table_l1";
+        case FRAME_TABLE_L2: return "table_l2";
+        case FRAME_TABLE_L3: return "table_l3";
+        case FRAME_TABLE_L4: return "table_l4";
+        case FRAME_SWAP: return "swap";
+        default: return "free";
+    }
+}
+
+json FrameTable::export_json(const std::map<uint32_t, std::string>& asid_names) const {
+    std::vector<uint64_t> kind_counts(FRAME_SWAP + 1, 0);
+    std::map<uint32_t, uint64_t> owner_counts;
+    for (uint64_t i = 0; i < owner_.size(); ++i) {
+        kind_counts[kind_[i]]++;
+        if (owner_[i] != 0) owner_counts[owner_[i]]++;
+    }
+
+    json result;
+    result["ram_frames"] = ram_frames_;
+    result["swap_slots"] = swap_slots_;
+    result["bytes_per_frame"] = sizeof(uint32_t) * 2 + sizeof(uint8_t) * 2;
+    result["memory_bytes"] = memory_bytes();
+    json kinds = json::object();
+    for (uint8_t k = 0; k <= FRAME_SWAP; ++k) {
+        kinds[kind_name(k)] = kind_counts[k];
+    }
+    result["kind_counts"] = kinds;
+    json owners = json::array();
+    for (const auto& entry : asid_names) {
+        auto count = owner_counts.find(entry.first);
+        owners.push_back({
+            {"asid", entry.first},
+            {"process_id", entry.second},
+            {"frames", count != owner_counts.end() ? count->second : 0}
+        });
+    }
+    result["owners"] = owners;
+    return result;
+}
+
+static void append_le(std::string& out, uint64_t value, int bytes) {
+    for (int b = 0; b < bytes; ++b) {
+        out.push_back(static_cast<char>((value >> (8 * b)) & 0xFF));
+    }
+}
+
+json FrameTable::export_map() const {
+    // Each frame packs into a uint16 as (asid << 3) | kind. Contiguous placement leaves long
+    // runs of equal values, so runs are encoded as (uint16 value, uint32 length) when smaller.
+    uint64_t frames = kind_.size();
+    std::vector<uint16_t> packed(frames);
+    pack_map(packed.data());
+    uint64_t runs = 0;
+    for (uint64_t i = 0; i < frames; ++i) {
+        if (i == 0 || packed[i] != packed[i - 1]) runs++;
+    }
+
+    std::string raw;
+    bool run_length = runs * 6 < frames * 2;
+    if (run_length) {
+        raw.reserve(runs * 6);
+        uint64_t start = 0;
+        for (uint64_t i = 1; i <= frames; ++i) {
+            if (i == frames || packed[i] != packed[start] || i - start == UINT32_MAX) {
+                append_le(raw, packed[start], 2);
+                append_le(raw, i - start, 4);
+                start = i;
+            }
+        }
+    } else {
+        raw.reserve(frames * 2);
+        for (uint16_t value : packed) {
+            append_le(raw, value, 2);
+        }
+    }
+
+    json result;
+    result["encoding"] = run_length ? "rle" : "raw";
+    result["frames"] = frames;
+    result["ram_frames"] = ram_frames_;
+    result["swap_slots"] = swap_slots_;
+    result["data"] = base64_encode(raw);
+    return result;
+}
+
+void FrameTable::pack_map(uint16_t* out) const {
+    for (uint64_t i = 0; i < kind_.size(); ++i) {
+        out[i] = static_cast<uint16_t>((std::min<uint32_t>(owner_[i], 0x1FFF) << 3) | kind_[i]);
+    }
+}
@@ -0,0 +1,158 @@
+#include <chrono>
+#include <fstream>
+#include <iostream>
+#include <string>
+#include <thread>
+#include "../include/virtual_memory_simulator.h"
+
+int main() {
+    std::ofstream debug("debug.txt", std::ios::out);
+    debug << "Starting Virtual Memory Simulator\n";
+    debug.close();
+
+    SocketHandler* socket_handler = nullptr;
+    try {
+        socket_handler = new SocketHandler();
+        VirtualMemorySimulator sim(socket_handler);
+
+        while (true) {
+            if (!sim.accept_connection()) {
+                std::cerr << "Connection failed, retrying..." << std::endl;
+                std::this_thread::sleep_for(std::chrono::seconds(1));
+                continue;
+            }
+            // A client that gave up mid-run reconnects; start it from a clean session.
+            sim.reset();
+
+            while (true) {
+                std::string config_str = sim.read_socket();
+                if (config_str.empty()) {
+                    break;
+                }
+
+                json settings;
+                double parse_seconds = 0.0;
+                try {
+                    auto parse_start = std::chrono::steady_clock::now();
+                    settings = json::parse(config_str);
+                    parse_seconds = std::chrono::duration<double>(std::chrono::steady_clock::now() - parse_start).count();
+                    std::ofstream debug("debug.txt", std::ios::app);
+                    debug << "Parsed JSON settings: " << settings.dump().substr(0, 50) << "...\n";
+                    debug.close();
+                    std::cout << "Parsed JSON settings: " << settings.dump().substr(0, 50) << "..." << std::endl;
+                } catch (const json::parse_error& e) {
+                    std::ofstream debug("debug.txt", std::ios::app);
+                    debug << "JSON parse error: " << e.what() << "\n";
+                    debug.close();
+                    std::cerr << "JSON parse error: " << e.what() << "\n";
+                    json reply = {{"status", "error"}, {"error", e.what()}};
+                    if (!sim.write_socket(reply.dump())) {
+                        break;
+                    }
+                    continue;
+                }
+
+                std::string command = settings.value("command", std::string("simulate"));
+                if (command == "cancel") {
+                    // Nothing is running between requests; drop the session state and its frames.
+                    std::string reply = sim.serialize_results({{"status", "cancelled"}});
+                    sim.reset();
+                    if (!sim.write_socket(reply)) {
+                        break;
+                    }
+                    continue;
+                }
+                if (command == "trace_chunk") {
+                    json reply;
+                    try {
+                        sim.get_metrics().add_time("parse", parse_seconds);
+                        uint64_t applied = sim.apply_trace_chunk(settings);
+                        reply = sim.progress_snapshot();
+                        reply["status"] = sim.is_cancelled() ? "cancelled" : "ok";
+                        reply["applied"] = applied;
+                    } catch (const std::exception& e) {
+                        std::ofstream debug("debug.txt", std::ios::app);
+                        debug << "Trace chunk error: " << e.what() << "\n";
+                        debug.close();
+                        std::cerr << "Trace chunk error: " << e.what() << "\n";
+                        reply["status"] = "error";
+                        reply["error"] = e.what();
+                    }
+                    std::string reply_str = reply["status"] == "ok" ? reply.dump() : sim.serialize_results(reply);
+                    if (sim.is_cancelled()) {
+                        sim.reset();
+                    }
+                    if (!sim.write_socket(reply_str)) {
+                        break;
+                    }
+                    continue;
+                }
+
+                try {
+                    if (command != "trace_end") {
+                        // New settings replace a session still waiting for its trace_end.
+                        sim.reset();
+                        sim.load_settings(settings);
+                    }
+                    // load_settings starts a fresh set of metrics, so the parse time is added after it.
+                    sim.get_metrics().add_time("parse", parse_seconds);
+                    if (command != "trace_end") {
+                        sim.simulate();
+                        if (sim.is_trace_driven() && !sim.is_cancelled()) {
+                            // Keep the allocated state; results follow the trace_end message.
+                            json ready = {{"status", "ready"}};
+                            if (!sim.write_socket(ready.dump())) {
+                                break;
+                            }
+                            continue;
+                        }
+                    }
+                    if (sim.is_cancelled() || sim.checkpoint("export", 0, 1, true)) {
+                        // Cancelled mid-run: free the session's frames instead of exporting.
+                        std::string cancelled = sim.serialize_results({{"status", "cancelled"}});
+                        sim.reset();
+                        if (!sim.write_socket(cancelled)) {
+                            break;
+                        }
+                        continue;
+                    }
+                    json result = sim.export_results();
+                    std::string result_str = sim.serialize_results(result);
+                    if (!sim.write_socket(result_str)) {
+                        std::ofstream debug("debug.txt", std::ios::app);
+                        debug << "Failed to send results, client may have disconnected\n";
+                        debug.close();
+                        std::cerr << "Failed to send results, client may have disconnected..." << std::endl;
+                        break;
+                    } else {
+                        std::ofstream debug("debug.txt", std::ios::app);
+                        debug << "Simulation completed and results sent\n";
+                        debug.close();
+                        std::cout << "Simulation completed and results sent" << std::endl;
+                    }
+                } catch (const std::exception& e) {
+                    std::ofstream debug("debug.txt", std::ios::app);
+                    debug << "Simulation error: " << e.what() << "\n";
+                    debug.close();
+                    std::cerr << "Simulation error: " << e.what() << "\n";
+                    // Like cancelled replies, errors carry the run's metrics so the client can record it.
+                    if (!sim.write_socket(sim.serialize_results({{"status", "error"}, {"error", e.what()}}))) {
+                        break;
+                    }
+                }
+
+                sim.reset();
+            }
+        }
+    } catch (const std::exception& e) {
+        std::ofstream debug("debug.txt", std::ios::app);
+        debug << "Fatal error: " << e.what() << "\n";
+        debug.close();
+        std::cerr << "Fatal error: " << e.what() << "\n";
+        if (socket_handler) {
+            delete socket_handler;
+        }
+        return 1;
+    }
+    return 0;
+}
\ No newline at end of file
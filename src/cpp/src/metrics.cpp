@@ -0,0 +1,86 @@
+#include "metrics.h"
+
+#ifdef _WIN32
+#ifndef WIN32_LEAN_AND_MEAN
+#define WIN32_LEAN_AND_MEAN
+#endif
+#include <windows.h>
+#include <psapi.h>
+#pragma comment(lib, "psapi.lib")
+#else
+#include <sys/resource.h>
+#endif
+
+Metrics::Metrics() {
+    clear();
+}
+
+void Metrics::clear() {
+    phases_.clear();
+    for (int i = 0; i < METRIC_COUNTER_COUNT; ++i) {
+        counters_[i] = 0;
+    }
+    start_ = std::chrono::steady_clock::now();
+}
+
+void Metrics::add_time(const std::string& phase, double seconds) {
+    Phase& entry = phases_[phase];
+    entry.seconds += seconds;
+    entry.calls++;
+}
+
+const char* Metrics::counter_name(MetricCounter counter) {
+    switch (counter) {
+        case METRIC_ACCESSES: return "accesses";
+        case METRIC_TLB_PROBES: return "tlb_probes";
+        case METRIC_PAGE_WALKS: return "page_walks";
+        case METRIC_TABLE_READS: return "table_reads";
+        case METRIC_TRACE_CHUNKS: return "trace_chunks";
+        default: return "unknown";
+    }
+}
+
+uint64_t Metrics::peak_rss_bytes() {
+    // High-water mark of the whole process, not just the current run.
+#ifdef _WIN32
+    PROCESS_MEMORY_COUNTERS counters;
+    if (GetProcessMemoryInfo(GetCurrentProcess(), &counters, sizeof(counters))) {
+        return counters.PeakWorkingSetSize;
+    }
+    return 0;
+#else
+    struct rusage usage;
+    if (getrusage(RUSAGE_SELF, &usage) != 0) {
+        return 0;
+    }
+#ifdef __APPLE__
+    return static_cast<uint64_t>(usage.ru_maxrss);
+#else
+    return static_cast<uint64_t>(usage.ru_maxrss) * 1024; // Linux reports kilobytes
+#endif
+#endif
+}
+
+json Metrics::export_json() const {
+    json phases = json::object();
+    for (const auto& entry : phases_) {
+        phases[entry.first] = {{"seconds", entry.second.seconds}, {"calls", entry.second.calls}};
+    }
+    json counters = json::object();
+    for (int i = 0; i < METRIC_COUNTER_COUNT; ++i) {
+        counters[counter_name(static_cast<MetricCounter>(i))] = counters_[i];
+    }
+    json result;
+    result["wall_seconds"] = std::chrono::duration<double>(std::chrono::steady_clock::now() - start_).count();
+    result["phases"] = phases;
+    result["counters"] = counters;
+    result["peak_rss_bytes"] = peak_rss_bytes();
+    return result;
+}
+
+ScopedTimer::ScopedTimer(Metrics& metrics, const char* phase)
+    : metrics_(metrics), phase_(phase), start_(std::chrono::steady_clock::now()) {}
+
+ScopedTimer::~ScopedTimer() {
+    metrics_.add_time(phase_, std::chrono::duration<double>(std::chrono::steady_clock::now() - start_).count());
+}
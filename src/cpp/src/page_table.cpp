@@ -13,11 +13,13 @@ uint64_t PageTable::get_last_used_frame() {
 
 PageTable::PageTable(uint64_t num_pages, uint64_t page_size_bytes, int entry_size, const std::string& allocation_type,
                      uint64_t ram_frames, uint64_t total_frames, uint64_t ram_size_bytes, double frame_percent,
-                     const std::string& process_id, const std::string& virtual_address_size)
+                     const std::string& process_id, const std::string& virtual_address_size,
+                     uint32_t asid, FrameTable& frame_table)
     : num_pages_(num_pages), page_size_bytes_(page_size_bytes), entry_size_(entry_size),
       allocation_type_(allocation_type), ram_frames_(ram_frames), total_frames_(total_frames),
       ram_size_bytes_(ram_size_bytes), process_id_(process_id), virtual_address_size_(virtual_address_size),
-      top_level_frame_(0) {
+      asid_(asid), frame_table_(&frame_table), top_level_frame_(0), data_extent_start_(UINT64_MAX), data_extent_frames_(0),
+      resident_fifo_built_(false), contiguous_spill_(false) {
     max_frames_ = static_cast<uint64_t>(ram_frames * frame_percent / 100.0);
     pages_per_frame_ = page_size_bytes / entry_size;
     entries_per_table_ = page_size_bytes / entry_size;
@@ -81,63 +83,187 @@ uint64_t PageTable::get_unique_frame(std::vector<uint64_t>& available_frames, st
         debug.close();
         return UINT64_MAX;
     }
-    available_frames.erase(available_frames.begin() + idx);
+    // Frames are drawn at random, so order does not matter: swap with the last and pop in O(1).
+    available_frames[idx] = available_frames.back();
+    available_frames.pop_back();
     return frame;
 }
 
-uint64_t PageTable::get_unique_swap_frame(std::vector<uint64_t>& available_swap_frames, std::mt19937& gen) {
-    if (available_swap_frames.empty()) {
+bool PageTable::place_in_swap(uint64_t first_page, uint64_t count, SwapDevice& swap_device) {
+    if (count > swap_device.free_slots()) {
+        return false;
+    }
+    uint64_t page = first_page;
+    uint64_t remaining = count;
+    while (remaining > 0) {
+        uint64_t cluster = std::min(remaining, swap_device.get_cluster_pages());
+        uint64_t slot = swap_device.allocate_cluster(cluster);
+        if (slot == UINT64_MAX) {
+            // Swap is too fragmented for a full cluster; fall back to a single slot.
+            cluster = 1;
+            slot = swap_device.allocate_slot();
+            if (slot == UINT64_MAX) {
+                return false;
+            }
+        }
+        for (uint64_t i = 0; i < cluster; ++i) {
+            frame_table_->assign(frame_table_->swap_index(slot + i), asid_, static_cast<uint32_t>(page + i), FRAME_SWAP);
+            set_page_entry(page + i, slot + i, false);
+        }
+        swap_device.swap_out(cluster);
+        page += cluster;
+        remaining -= cluster;
+    }
+    return true;
+}
+
+uint64_t PageTable::take_free_frame(std::vector<uint64_t>& available_frames, FrameAllocator& frame_allocator) {
+    if (allocation_type_ == "Contiguous") {
+        return frame_allocator.free_frames() > 0 ? frame_allocator.allocate(1) : UINT64_MAX;
+    }
+    if (available_frames.empty()) {
         return UINT64_MAX;
     }
-    std::uniform_int_distribution<size_t> frame_dist(0, available_swap_frames.size() - 1);
-    size_t idx = frame_dist(gen);
-    uint64_t frame = available_swap_frames[idx];
-    available_swap_frames.erase(available_swap_frames.begin() + idx);
+    uint64_t frame = available_frames.back();
+    available_frames.pop_back();
     return frame;
 }
 
-void PageTable::free_frames(std::vector<uint64_t>& available_frames, std::vector<uint64_t>& available_table_frames) {
+uint64_t PageTable::pick_victim(uint64_t& victim_frame) {
+    // FIFO replacement over this process's own pages, so the set of RAM frames it
+    // owns only grows through free frames and free_frames() still returns them all.
+    if (!resident_fifo_built_) {
+        for (uint64_t page = 1; page <= num_pages_; ++page) {
+            const std::pair<uint64_t, bool>* entry = leaf_entry(page);
+            if (entry && entry->second) resident_fifo_.push_back(page);
+        }
+        resident_fifo_built_ = true;
+    }
+    while (!resident_fifo_.empty()) {
+        uint64_t page = resident_fifo_.front();
+        resident_fifo_.pop_front();
+        const std::pair<uint64_t, bool>* entry = leaf_entry(page);
+        if (entry && entry->second) {
+            victim_frame = entry->first;
+            return page;
+        }
+    }
+    return 0;
+}
+
+uint64_t PageTable::swap_in(uint64_t page_number, std::vector<uint64_t>& available_frames, FrameAllocator& frame_allocator,
+                            SwapDevice& swap_device, uint64_t& victim_page, double& write_us) {
+    victim_page = 0;
+    write_us = 0.0;
+    const std::pair<uint64_t, bool>* entry = leaf_entry(page_number);
+    if (!entry || entry->second) {
+        return UINT64_MAX;
+    }
+    uint64_t slot = entry->first;
+    uint64_t frame = take_free_frame(available_frames, frame_allocator);
+    if (frame == UINT64_MAX) {
+        victim_page = pick_victim(frame);
+        if (victim_page == 0) {
+            return UINT64_MAX;
+        }
+    }
+
+    swap_device.free_slot(slot);
+    frame_table_->release(frame_table_->swap_index(slot));
+    if (victim_page != 0) {
+        // The slot just freed guarantees the victim somewhere to go.
+        uint64_t victim_slot = swap_device.allocate_slot();
+        write_us = swap_device.swap_out(1);
+        frame_table_->assign(frame_table_->swap_index(victim_slot), asid_, static_cast<uint32_t>(victim_page), FRAME_SWAP);
+        set_page_entry(victim_page, victim_slot, false);
+    }
+    frame_table_->assign(frame, asid_, static_cast<uint32_t>(page_number), FRAME_DATA);
+    set_page_entry(page_number, frame, true);
+    if (resident_fifo_built_) {
+        resident_fifo_.push_back(page_number);
+    }
+    last_used_frame_ = std::max(last_used_frame_, frame);
+    return frame;
+}
+
+void PageTable::free_frames(std::vector<uint64_t>& available_frames, FrameAllocator& frame_allocator,
+                            std::vector<uint64_t>& available_table_frames) {
     std::ofstream debug("debug.txt", std::ios::app);
     debug << "Process " << process_id_ << ": Freeing frames\n";
-    for (auto it = ram_.begin(); it != ram_.end();) {
-        uint64_t frame = it->first;
-        if (it->second.first.find("table_") != std::string::npos) {
-            available_table_frames.push_back(frame);
-            debug << "Freed table frame 0x" << std::hex << frame << "\n";
-        } else {
-            available_frames.push_back(frame);
-            debug << "Freed data frame 0x" << std::hex << frame << "\n";
-        }
-        it = ram_.erase(it);
+    for (uint64_t frame : table_frames_) {
+        available_table_frames.push_back(frame);
+        frame_table_->release(frame);
+    }
+    debug << "Freed " << table_frames_.size() << " table frames\n";
+    table_frames_.clear();
+
+    uint64_t data_frames = 0;
+    for (uint64_t page = 1; page <= num_pages_; ++page) {
+        const std::pair<uint64_t, bool>* entry = leaf_entry(page);
+        if (!entry || !entry->second) continue;
+        if (allocation_type_ != "Contiguous") {
+            available_frames.push_back(entry->first);
+        } else if (entry->first < data_extent_start_ || entry->first >= data_extent_start_ + data_extent_frames_) {
+            // Taken from the allocator by a swap-in rather than part of the process's extent.
+            frame_allocator.release(entry->first, 1);
+        }
+        frame_table_->release(entry->first);
+        data_frames++;
+    }
+    if (data_extent_frames_ > 0) {
+        frame_allocator.release(data_extent_start_, data_extent_frames_);
+        debug << "Freed contiguous extent 0x" << std::hex << data_extent_start_ << std::dec
+              << " (" << data_extent_frames_ << " frames)\n";
+        data_extent_start_ = UINT64_MAX;
+        data_extent_frames_ = 0;
+    } else {
+        debug << "Freed " << data_frames << " data frames\n";
     }
     debug.close();
 }
 
-void PageTable::free_swap_frames(std::vector<uint64_t>& available_swap_frames) {
+void PageTable::free_swap_frames(SwapDevice& swap_device) {
     std::ofstream debug("debug.txt", std::ios::app);
-    debug << "Process " << process_id_ << ": Freeing swap frames\n";
-    for (auto it = swap_map_.begin(); it != swap_map_.end();) {
-        std::string key = it->first;
-        uint64_t frame = std::stoull(key.substr(2), nullptr, 16);
-        available_swap_frames.push_back(frame);
-        debug << "Freed swap frame 0x" << std::hex << frame << "\n";
-        it = swap_map_.erase(it);
+    debug << "Process " << process_id_ << ": Freeing swap slots\n";
+    uint64_t freed = 0;
+    for (uint64_t page = 1; page <= num_pages_; ++page) {
+        const std::pair<uint64_t, bool>* entry = leaf_entry(page);
+        if (!entry || entry->second || !swap_device.is_used(entry->first)) continue;
+        swap_device.free_slot(entry->first);
+        frame_table_->release(frame_table_->swap_index(entry->first));
+        freed++;
     }
+    debug << "Freed " << freed << " swap slots\n";
     debug.close();
 }
 
+void PageTable::set_contiguous_spill(bool spill) {
+    contiguous_spill_ = spill;
+}
+
 void PageTable::set_frame_availability(bool available) {
     std::ofstream debug("debug.txt", std::ios::app);
     debug << "Process " << process_id_ << ": Setting frame availability to " << (available ? "true" : "false") << "\n";
-    for (auto& entry : ram_) {
-        entry.second.second = available;
+    for (uint64_t frame : table_frames_) {
+        frame_table_->set_flag(frame, FRAME_FLAG_AVAILABLE, available);
+    }
+    for (uint64_t page = 1; page <= num_pages_; ++page) {
+        const std::pair<uint64_t, bool>* entry = leaf_entry(page);
+        if (!entry) continue;
+        uint64_t index = entry->second ? entry->first : frame_table_->swap_index(entry->first);
+        frame_table_->set_flag(index, FRAME_FLAG_AVAILABLE, available);
     }
     debug.close();
 }
 
+void PageTable::claim_table_frame(uint64_t frame, int level, uint64_t table_idx) {
+    frame_table_->assign(frame, asid_, static_cast<uint32_t>(table_idx), FrameTable::table_kind(level));
+    table_frames_.push_back(frame);
+}
+
 bool PageTable::allocate(uint64_t block_size_bytes, std::vector<uint64_t>& available_frames,
-                        std::vector<uint64_t>& available_table_frames, std::mt19937& gen,
-                        std::vector<uint64_t>& available_swap_frames) {
+                        FrameAllocator& frame_allocator, std::vector<uint64_t>& available_table_frames,
+                        std::mt19937& gen, SwapDevice& swap_device, const ProgressCallback& progress) {
     std::ofstream debug("debug.txt", std::ios::app);
     debug << "Process " << process_id_ << ": Allocating " << num_pages_ << " pages\n";
 
@@ -147,7 +273,7 @@ bool PageTable::allocate(uint64_t block_size_bytes, std::vector<uint64_t>& avail
         debug.close();
         return false;
     }
-    ram_[top_level_frame_] = {"top_level_table_" + process_id_, true};
+    claim_table_frame(top_level_frame_, 1, 0);
     if (levels_ > 1) {
         top_level_table_[0] = {top_level_frame_, true};
     }
@@ -159,192 +285,168 @@ bool PageTable::allocate(uint64_t block_size_bytes, std::vector<uint64_t>& avail
         pages_per_table[i] = pages_per_table[i - 1] * entries_per_table_;
     }
 
-    std::vector<std::vector<std::pair<uint64_t, bool>>*> current_level_tables = second_level_tables_;
     uint64_t pages_in_current_table = 0;
     uint64_t current_table_idx = 0;
-    std::vector<std::pair<uint64_t, bool>>* leaf_table = nullptr;
 
     uint64_t pages_in_swap = 0;
-    bool use_swap = !available_swap_frames.empty();
+    bool use_swap = swap_device.total_slots() > 0;
 
     if (allocation_type_ == "Contiguous") {
-        uint64_t table_frame_limit = static_cast<uint64_t>(ceil(total_frames_ * 0.01));
-        uint64_t start_frame = (last_used_frame_ == 0) ? table_frame_limit : last_used_frame_ + 1;
-        if (start_frame < table_frame_limit) {
-            start_frame = table_frame_limit;
-        }
+        // All or nothing: a failed placement counts in the allocator's failed_allocations.
+        // Only the contiguous_spill setting lets the part without a contiguous RAM block go to swap.
         uint64_t ram_pages = num_pages_;
-        bool can_allocate = true;
-
-        if (num_pages_ > available_frames.size()) {
-            ram_pages = available_frames.size();
+        if (contiguous_spill_ && frame_allocator.largest_allocatable() < num_pages_) {
+            ram_pages = frame_allocator.largest_allocatable();
             pages_in_swap = num_pages_ - ram_pages;
-            if (pages_in_swap > available_swap_frames.size()) {
-                debug << "Process " << process_id_ << ": Insufficient swap frames for "
-                      << pages_in_swap << " pages\n";
+            debug << "Process " << process_id_ << ": contiguous_spill sends " << pages_in_swap << " of "
+                  << num_pages_ << " pages to swap\n";
+            if (pages_in_swap > swap_device.free_slots()) {
+                debug << "Process " << process_id_ << ": Insufficient swap slots for " << pages_in_swap << " pages\n";
                 debug.close();
                 return false;
             }
         }
 
-        for (uint64_t i = 0; i < ram_pages; ++i) {
-            if (std::find(available_frames.begin(), available_frames.end(), start_frame + i) == available_frames.end()) {
-                debug << "Process " << process_id_ << ": Contiguous RAM block from 0x" << std::hex << start_frame
-                      << " not available\n";
-                debug.close();
-                return false;
-            }
+        uint64_t start_frame = ram_pages > 0 ? frame_allocator.allocate(ram_pages) : UINT64_MAX;
+        if (ram_pages > 0 && start_frame == UINT64_MAX) {
+            debug << "Process " << process_id_ << ": No contiguous RAM block of " << ram_pages
+                  << " frames (largest free extent " << frame_allocator.largest_free_extent() << ")\n";
+            debug.close();
+            return false;
         }
+        data_extent_start_ = start_frame;
+        data_extent_frames_ = ram_pages;
+        debug << "Process " << process_id_ << ": " << FrameAllocator::strategy_name(frame_allocator.get_strategy())
+              << " placed " << ram_pages << " frames at 0x" << std::hex << start_frame << std::dec << "\n";
 
-        for (uint64_t i = 0; i < pages_in_swap; ++i) {
-            if (std::find(available_swap_frames.begin(), available_swap_frames.end(), i) == available_swap_frames.end()) {
-                debug << "Process " << process_id_ << ": Contiguous swap block from 0x0 not available\n";
+        for (uint64_t page = 1; page <= ram_pages; ++page) {
+            if (page % PROGRESS_PAGES == 0 && progress && progress(page)) {
+                debug << "Process " << process_id_ << ": Allocation cancelled at page " << page << "\n";
                 debug.close();
                 return false;
             }
-        }
-
-        for (uint64_t page = 1; page <= ram_pages; ++page) {
             uint64_t frame = start_frame + (page - 1);
-            auto it = std::find(available_frames.begin(), available_frames.end(), frame);
-            available_frames.erase(it);
-            ram_[frame] = {"page_" + std::to_string(page) + "_" + process_id_, true};
-            entries_[page] = frame;
+            frame_table_->assign(frame, asid_, static_cast<uint32_t>(page), FRAME_DATA);
             set_page_entry(page, frame, true);
         }
 
-        for (uint64_t page = ram_pages + 1; page <= num_pages_; ++page) {
-            uint64_t frame = page - ram_pages - 1;
-            auto it = std::find(available_swap_frames.begin(), available_swap_frames.end(), frame);
-            available_swap_frames.erase(it);
-            std::stringstream ss;
-            ss << "1x" << std::hex << frame;
-            swap_map_[ss.str()] = "PID" + process_id_ + "_page" + std::to_string(page);
-            ram_[frame] = {"swap_page_" + std::to_string(page) + "_" + process_id_, true};
-            entries_[page] = frame;
-            set_page_entry(page, frame, false);
+        if (pages_in_swap > 0 && !place_in_swap(ram_pages + 1, pages_in_swap, swap_device)) {
+            debug << "Process " << process_id_ << ": Insufficient swap slots for " << pages_in_swap << " pages\n";
+            debug.close();
+            return false;
         }
 
         last_used_frame_ = (ram_pages > 0) ? (start_frame + ram_pages - 1) : last_used_frame_;
-        if (pages_in_swap > 0) {
-            last_used_frame_ = std::max(last_used_frame_, pages_in_swap - 1);
-        }
     } else {
         for (uint64_t page = 1; page <= num_pages_; ++page) {
-            uint64_t frame = 0;
-            bool in_ram = true;
-            std::stringstream ss;
-            if (use_swap && available_frames.empty()) {
-                frame = get_unique_swap_frame(available_swap_frames, gen);
-                if (frame == UINT64_MAX) {
-                    debug << "Process " << process_id_ << ": Insufficient swap frames for page " << page << "\n";
+            if (page % PROGRESS_PAGES == 0 && progress && progress(page)) {
+                debug << "Process " << process_id_ << ": Allocation cancelled at page " << page << "\n";
+                debug.close();
+                return false;
+            }
+            uint64_t frame = available_frames.empty() ? UINT64_MAX : get_unique_frame(available_frames, gen);
+            if (frame == UINT64_MAX) {
+                // RAM is exhausted: the rest of the process goes to swap in clusters.
+                uint64_t remaining = num_pages_ - page + 1;
+                if (!use_swap) {
+                    debug << "Process " << process_id_ << ": Failed to allocate data frame for page " << page << "\n";
                     debug.close();
                     return false;
                 }
-                in_ram = false;
-                ss << "1x" << std::hex << frame;
-                swap_map_[ss.str()] = "PID" + process_id_ + "_page" + std::to_string(page);
-                ram_[frame] = {"swap_page_" + std::to_string(page) + "_" + process_id_, true};
-                pages_in_swap++;
-            } else {
-                frame = get_unique_frame(available_frames, gen);
-                if (frame == UINT64_MAX) {
-                    if (use_swap) {
-                        frame = get_unique_swap_frame(available_swap_frames, gen);
-                        if (frame == UINT64_MAX) {
-                            debug << "Process " << process_id_ << ": Insufficient swap frames for page " << page << "\n";
-                            debug.close();
-                            return false;
-                        }
-                        in_ram = false;
-                        ss << "1x" << std::hex << frame;
-                        swap_map_[ss.str()] = "PID" + process_id_ + "_page" + std::to_string(page);
-                        ram_[frame] = {"swap_page_" + std::to_string(page) + "_" + process_id_, true};
-                        pages_in_swap++;
-                    } else {
-                        debug << "Process " << process_id_ << ": Failed to allocate data frame for page " << page << "\n";
-                        debug.close();
-                        return false;
-                    }
-                }
-                if (in_ram) {
-                    ram_[frame] = {"page_" + std::to_string(page) + "_" + process_id_, true};
+                if (!place_in_swap(page, remaining, swap_device)) {
+                    debug << "Process " << process_id_ << ": Insufficient swap slots for page " << page << "\n";
+                    debug.close();
+                    return false;
                 }
+                pages_in_swap = remaining;
+                break;
             }
-            entries_[page] = frame;
-            set_page_entry(page, frame, in_ram);
+            frame_table_->assign(frame, asid_, static_cast<uint32_t>(page), FRAME_DATA);
+            set_page_entry(page, frame, true);
             last_used_frame_ = std::max(last_used_frame_, frame);
         }
     }
 
     if (levels_ > 1) {
+        // Leaf tables were already filled by set_page_entry; give each table a frame.
+        std::vector<bool> level2_framed(levels_ >= 3 ? entries_per_table_ : 0, false);
+        std::vector<bool> level3_framed(levels_ == 4 ? entries_per_table_ * entries_per_table_ : 0, false);
         for (uint64_t page = 1; page <= num_pages_; ++page) {
+            if (page % PROGRESS_PAGES == 0 && progress && progress(num_pages_)) {
+                debug << "Process " << process_id_ << ": Allocation cancelled at table for page " << page << "\n";
+                debug.close();
+                return false;
+            }
             if (pages_in_current_table == 0) {
-                leaf_table = new std::vector<std::pair<uint64_t, bool>>(entries_per_table_, {0, false});
                 uint64_t table_frame = get_unique_frame(available_table_frames, gen);
                 if (table_frame == UINT64_MAX) {
                     debug << "Process " << process_id_ << ": Failed to allocate frame for leaf table "
                           << current_table_idx << "\n";
                     debug.close();
-                    delete leaf_table;
                     return false;
                 }
-                ram_[table_frame] = {"level_" + std::to_string(levels_) + "_table_" +
-                                    std::to_string(current_table_idx) + "_" + process_id_, true};
+                claim_table_frame(table_frame, levels_, current_table_idx);
                 uint64_t parent_idx = current_table_idx;
                 if (levels_ == 2) {
-                    second_level_tables_[parent_idx] = leaf_table;
+                    if (!second_level_tables_[parent_idx]) {
+                        second_level_tables_[parent_idx] = new std::vector<std::pair<uint64_t, bool>>(entries_per_table_, {0, false});
+                    }
                     top_level_table_[parent_idx] = {table_frame, true};
                 } else if (levels_ == 3) {
                     uint64_t l2_idx = parent_idx % entries_per_table_;
                     uint64_t l1_idx = parent_idx / entries_per_table_;
-                    third_level_tables_[l1_idx * entries_per_table_ + l2_idx] = leaf_table;
                     if (!second_level_tables_[l1_idx]) {
                         second_level_tables_[l1_idx] = new std::vector<std::pair<uint64_t, bool>>(entries_per_table_, {0, false});
+                    }
+                    if (!level2_framed[l1_idx]) {
                         uint64_t l2_frame = get_unique_frame(available_table_frames, gen);
                         if (l2_frame == UINT64_MAX) {
                             debug << "Process " << process_id_ << ": Failed to allocate frame for level 2 table "
                                   << l1_idx << "\n";
                             debug.close();
-                            delete leaf_table;
                             return false;
                         }
-                        ram_[l2_frame] = {"level_2_table_" + std::to_string(l1_idx) + "_" + process_id_, true};
+                        claim_table_frame(l2_frame, 2, l1_idx);
                         top_level_table_[l1_idx] = {l2_frame, true};
+                        level2_framed[l1_idx] = true;
                     }
                     second_level_tables_[l1_idx]->at(l2_idx) = {table_frame, true};
                 } else if (levels_ == 4) {
                     uint64_t l3_idx = parent_idx % entries_per_table_;
                     uint64_t l2_idx = (parent_idx / entries_per_table_) % entries_per_table_;
                     uint64_t l1_idx = parent_idx / (entries_per_table_ * entries_per_table_);
-                    fourth_level_tables_[l1_idx * entries_per_table_ * entries_per_table_ + l2_idx * entries_per_table_ + l3_idx] = leaf_table;
-                    if (!third_level_tables_[l1_idx * entries_per_table_ + l2_idx]) {
-                        third_level_tables_[l1_idx * entries_per_table_ + l2_idx] = new std::vector<std::pair<uint64_t, bool>>(entries_per_table_, {0, false});
+                    uint64_t l3_table = l1_idx * entries_per_table_ + l2_idx;
+                    if (!second_level_tables_[l1_idx]) {
+                        second_level_tables_[l1_idx] = new std::vector<std::pair<uint64_t, bool>>(entries_per_table_, {0, false});
+                    }
+                    if (!third_level_tables_[l3_table]) {
+                        third_level_tables_[l3_table] = new std::vector<std::pair<uint64_t, bool>>(entries_per_table_, {0, false});
+                    }
+                    if (!level3_framed[l3_table]) {
                         uint64_t l3_frame = get_unique_frame(available_table_frames, gen);
                         if (l3_frame == UINT64_MAX) {
                             debug << "Process " << process_id_ << ": Failed to allocate frame for level 3 table "
-                                  << (l1_idx * entries_per_table_ + l2_idx) << "\n";
+                                  << l3_table << "\n";
                             debug.close();
-                            delete leaf_table;
                             return false;
                         }
-                        ram_[l3_frame] = {"level_3_table_" + std::to_string(l1_idx * entries_per_table_ + l2_idx) + "_" + process_id_, true};
-                        if (!second_level_tables_[l1_idx]) {
-                            second_level_tables_[l1_idx] = new std::vector<std::pair<uint64_t, bool>>(entries_per_table_, {0, false});
+                        claim_table_frame(l3_frame, 3, l3_table);
+                        level3_framed[l3_table] = true;
+                        if (!level2_framed[l1_idx]) {
                             uint64_t l2_frame = get_unique_frame(available_table_frames, gen);
                             if (l2_frame == UINT64_MAX) {
                                 debug << "Process " << process_id_ << ": Failed to allocate frame for level 2 table "
                                       << l1_idx << "\n";
                                 debug.close();
-                                delete leaf_table;
                                 return false;
                             }
-                            ram_[l2_frame] = {"level_2_table_" + std::to_string(l1_idx) + "_" + process_id_, true};
+                            claim_table_frame(l2_frame, 2, l1_idx);
                             top_level_table_[l1_idx] = {l2_frame, true};
+                            level2_framed[l1_idx] = true;
                         }
                         second_level_tables_[l1_idx]->at(l2_idx) = {l3_frame, true};
                     }
-                    third_level_tables_[l1_idx * entries_per_table_ + l2_idx]->at(l3_idx) = {table_frame, true};
+                    third_level_tables_[l3_table]->at(l3_idx) = {table_frame, true};
                 }
             }
 
@@ -365,15 +467,29 @@ bool PageTable::allocate(uint64_t block_size_bytes, std::vector<uint64_t>& avail
 
 void PageTable::log_swap_map() const {
     std::ofstream debug("debug.txt", std::ios::app);
-    if (!swap_map_.empty()) {
-        debug << "Process " << process_id_ << ": Swap space map:\n";
-        for (const auto& entry : swap_map_) {
-            debug << entry.first << ": " << entry.second << "\n";
-        }
+    bool header = false;
+    for (uint64_t page = 1; page <= num_pages_; ++page) {
+        const std::pair<uint64_t, bool>* entry = leaf_entry(page);
+        if (!entry || entry->second) continue;
+        if (!header) {
+            debug << "Process " << process_id_ << ": Swap space map:\n";
+            header = true;
+        }
+        debug << "1x" << std::hex << entry->first << std::dec << ": PID" << process_id_ << "_page" << page << "\n";
     }
     debug.close();
 }
 
+bool PageTable::get_entry(uint64_t page_number, uint64_t& frame_number, bool& in_ram) const {
+    const std::pair<uint64_t, bool>* entry = leaf_entry(page_number);
+    if (!entry) {
+        return false;
+    }
+    frame_number = entry->first;
+    in_ram = entry->second;
+    return true;
+}
+
 bool PageTable::access(uint64_t virtual_address) {
     uint64_t page_number = virtual_address / page_size_bytes_ + 1;
     if (page_number < 1 || page_number > num_pages_) {
@@ -416,10 +532,12 @@ bool PageTable::access(uint64_t virtual_address) {
     }
 }
 
-json PageTable::export_json() const {
-    json pt;
+json PageTable::export_json(uint64_t first_page, uint64_t count) const {
+    // Pages [first_page, first_page + count), so callers can export a large table in slices.
+    json pt = json::array();
     int hex_digits = static_cast<int>(ceil(log2(ram_size_bytes_) / 4.0));
-    for (uint64_t i = 1; i <= num_pages_; ++i) {
+    uint64_t last_page = count > num_pages_ ? num_pages_ : std::min(num_pages_, first_page + count - 1);
+    for (uint64_t i = first_page; i <= last_page; ++i) {
         uint64_t frame_number = 0;
         bool in_ram = false;
         if (levels_ == 1) {
@@ -480,6 +598,15 @@ json PageTable::export_json() const {
     return pt;
 }
 
+void PageTable::export_packed(uint64_t* out) const {
+    // Binary form of export_json(): one word per page, frame number (or swap slot)
+    // with bit 63 set when the page is resident. Unmapped pages are 0.
+    for (uint64_t page = 1; page <= num_pages_; ++page) {
+        const std::pair<uint64_t, bool>* entry = leaf_entry(page);
+        out[page - 1] = entry ? (entry->first | (entry->second ? 1ULL << 63 : 0)) : 0;
+    }
+}
+
 uint64_t PageTable::size_bytes() const {
     uint64_t total = 0;
     if (levels_ == 1) {
@@ -509,13 +636,13 @@ uint64_t PageTable::lookup(uint64_t page_number) const {
     std::ofstream debug("debug.txt", std::ios::app);
     debug << "Process " << process_id_ << ": Looking up page " << page_number << "\n";
 
-    auto it = entries_.find(page_number);
-    if (it == entries_.end()) {
+    const std::pair<uint64_t, bool>* entry = leaf_entry(page_number);
+    if (!entry) {
         debug << "Process " << process_id_ << ": Page " << page_number << " not found in entries\n";
         debug.close();
         return UINT64_MAX;
     }
-    uint64_t frame_number = it->second;
+    uint64_t frame_number = entry->first;
 
     if (levels_ == 1) {
         debug << "Process " << process_id_ << ": Single-level table, page " << page_number
@@ -541,6 +668,35 @@ uint64_t PageTable::lookup(uint64_t page_number) const {
     return frame_number;
 }
 
+const std::pair<uint64_t, bool>* PageTable::leaf_entry(uint64_t page_number) const {
+    if (page_number < 1 || page_number > num_pages_) {
+        return nullptr;
+    }
+    uint64_t index = page_number - 1;
+    uint64_t mask = entries_per_table_ - 1;
+    const std::vector<std::pair<uint64_t, bool>>* table = nullptr;
+    if (levels_ == 1) {
+        table = &single_level_table_;
+        return &(*table)[index];
+    } else if (levels_ == 2) {
+        table = second_level_tables_[(index >> bits_per_level_) & mask];
+    } else if (levels_ == 3) {
+        uint64_t level1_idx = (index >> (2 * bits_per_level_)) & mask;
+        uint64_t level2_idx = (index >> bits_per_level_) & mask;
+        table = third_level_tables_[level1_idx * entries_per_table_ + level2_idx];
+    } else {
+        uint64_t level1_idx = (index >> (3 * bits_per_level_)) & mask;
+        uint64_t level2_idx = (index >> (2 * bits_per_level_)) & mask;
+        uint64_t level3_idx = (index >> bits_per_level_) & mask;
+        table = fourth_level_tables_[level1_idx * entries_per_table_ * entries_per_table_ +
+                                     level2_idx * entries_per_table_ + level3_idx];
+    }
+    if (!table) {
+        return nullptr;
+    }
+    return &table->at(index & mask);
+}
+
 void PageTable::set_page_entry(uint64_t page_number, uint64_t frame_number, bool in_ram) {
     if (levels_ == 1) {
         single_level_table_[page_number - 1] = {frame_number, in_ram};
@@ -627,10 +783,22 @@ const std::string& PageTable::get_process_id() const {
     return process_id_;
 }
 
+uint32_t PageTable::get_asid() const {
+    return asid_;
+}
+
 int PageTable::get_levels() const {
     return levels_;
 }
 
+uint64_t PageTable::get_num_pages() const {
+    return num_pages_;
+}
+
+int PageTable::get_bits_per_level() const {
+    return bits_per_level_;
+}
+
 uint64_t PageTable::get_top_level_frame() const {
     return top_level_frame_;
 }
\ No newline at end of file
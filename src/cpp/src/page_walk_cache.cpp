@@ -0,0 +1,133 @@
+#include "page_walk_cache.h"
+#include <algorithm>
+#include <fstream>
+
+PageWalkCache::PageWalkCache() : enabled_(false), walks_(0), levels_walked_(0), levels_skipped_(0) {}
+
+void PageWalkCache::configure(const json& settings) {
+    json config = json::object();
+    auto it = settings.find("page_walk_cache");
+    if (it != settings.end() && it->is_object()) {
+        config = *it;
+    }
+    enabled_ = config.value("enabled", true);
+    caches_.clear();
+    caches_.push_back({"PDE", 2, config.value("pde_entries", 32ULL), {}, {}, 0, 0});
+    caches_.push_back({"PDPT", 3, config.value("pdpt_entries", 4ULL), {}, {}, 0, 0});
+    caches_.push_back({"PML4", 4, config.value("pml4_entries", 2ULL), {}, {}, 0, 0});
+    walks_ = 0;
+    levels_walked_ = 0;
+    levels_skipped_ = 0;
+
+    std::ofstream debug("debug.txt", std::ios::app);
+    debug << "Page-walk caches " << (enabled_ ? "enabled" : "disabled") << ": ";
+    for (const auto& cache : caches_) {
+        debug << cache.name << "=" << cache.capacity << " ";
+    }
+    debug << "\n";
+    debug.close();
+}
+
+void PageWalkCache::clear() {
+    for (auto& cache : caches_) {
+        cache.lru.clear();
+        cache.index.clear();
+        cache.lookups = 0;
+        cache.hits = 0;
+    }
+    walks_ = 0;
+    levels_walked_ = 0;
+    levels_skipped_ = 0;
+}
+
+void PageWalkCache::flush_asid(uint32_t asid) {
+    for (auto& cache : caches_) {
+        for (auto it = cache.lru.begin(); it != cache.lru.end();) {
+            if ((*it >> 48) == asid) {
+                cache.index.erase(*it);
+                it = cache.lru.erase(it);
+            } else {
+                ++it;
+            }
+        }
+    }
+}
+
+uint64_t PageWalkCache::make_key(uint32_t asid, uint64_t prefix) {
+    // Virtual page prefixes stay well below 2^48, leaving the top bits for the ASID.
+    return (static_cast<uint64_t>(asid) << 48) ^ prefix;
+}
+
+bool PageWalkCache::probe(LevelCache& cache, uint64_t key) {
+    cache.lookups++;
+    auto it = cache.index.find(key);
+    if (it == cache.index.end()) {
+        return false;
+    }
+    cache.hits++;
+    cache.lru.splice(cache.lru.begin(), cache.lru, it->second);
+    return true;
+}
+
+void PageWalkCache::fill(LevelCache& cache, uint64_t key) {
+    if (cache.capacity == 0 || cache.index.count(key)) return;
+    if (cache.lru.size() >= cache.capacity) {
+        cache.index.erase(cache.lru.back());
+        cache.lru.pop_back();
+    }
+    cache.lru.push_front(key);
+    cache.index[key] = cache.lru.begin();
+}
+
+int PageWalkCache::walk(uint32_t asid, uint64_t virtual_page, int levels, int bits_per_level) {
+    walks_++;
+    int remaining = levels;
+    if (enabled_ && levels > 1) {
+        int top = std::min(levels, static_cast<int>(caches_.size()) + 1);
+        // Probe the deepest cache first: a PDE hit skips more of the walk than a PML4 hit.
+        int hit_level = 0;
+        for (int level = 2; level <= top; ++level) {
+            LevelCache& cache = caches_[level - 2];
+            if (cache.capacity == 0) continue;
+            if (probe(cache, make_key(asid, virtual_page >> (bits_per_level * (level - 1))))) {
+                hit_level = level;
+                break;
+            }
+        }
+        // A hit on a level-k entry leaves levels k-1 .. 1 to read; cache the non-leaf entries read.
+        remaining = hit_level > 0 ? hit_level - 1 : levels;
+        int fill_top = std::min(remaining, top);
+        for (int level = 2; level <= fill_top; ++level) {
+            fill(caches_[level - 2], make_key(asid, virtual_page >> (bits_per_level * (level - 1))));
+        }
+    }
+    levels_walked_ += remaining;
+    levels_skipped_ += levels - remaining;
+    return remaining;
+}
+
+bool PageWalkCache::is_enabled() const {
+    return enabled_;
+}
+
+json PageWalkCache::export_json() const {
+    json levels = json::array();
+    for (const auto& cache : caches_) {
+        json entry;
+        entry["name"] = cache.name;
+        entry["level"] = cache.level;
+        entry["entries"] = cache.capacity;
+        entry["lookups"] = cache.lookups;
+        entry["hits"] = cache.hits;
+        entry["hit_rate"] = cache.lookups > 0 ? static_cast<double>(cache.hits) / cache.lookups : 0.0;
+        levels.push_back(entry);
+    }
+    json result;
+    result["enabled"] = enabled_;
+    result["walks"] = walks_;
+    result["levels_walked"] = levels_walked_;
+    result["levels_skipped"] = levels_skipped_;
+    result["average_walk_levels"] = walks_ > 0 ? static_cast<double>(levels_walked_) / walks_ : 0.0;
+    result["caches"] = levels;
+    return result;
+}
@@ -0,0 +1,231 @@
+#include "scheduler.h"
+#include <algorithm>
+#include <fstream>
+
+Scheduler::Scheduler()
+    : policy_(SchedulingPolicy::RoundRobin), quantum_ticks_(100), levels_(3), boost_ticks_(2000),
+      context_switch_ns_(2000.0), burst_window_(32), yield_on_fault_(true), arrivals_(0), running_(-1),
+      last_ran_(-1), slice_left_(0), last_boost_(0), total_ticks_(0), switches_(0), fault_yields_(0), boosts_(0) {}
+
+SchedulingPolicy Scheduler::parse_policy(const std::string& name) {
+    if (name == "Priority") return SchedulingPolicy::Priority;
+    if (name == "MLFQ") return SchedulingPolicy::MultilevelFeedback;
+    return SchedulingPolicy::RoundRobin;
+}
+
+std::string Scheduler::policy_name(SchedulingPolicy policy) {
+    switch (policy) {
+        case SchedulingPolicy::Priority: return "Priority";
+        case SchedulingPolicy::MultilevelFeedback: return "MLFQ";
+        default: return "Round Robin";
+    }
+}
+
+bool Scheduler::ReadyEntry::operator>(const ReadyEntry& other) const {
+    return rank != other.rank ? rank > other.rank : arrival > other.arrival;
+}
+
+void Scheduler::configure(const json& settings) {
+    json config = json::object();
+    auto it = settings.find("scheduler");
+    if (it != settings.end() && it->is_object()) {
+        config = *it;
+    }
+    policy_ = parse_policy(config.value("policy", std::string("Round Robin")));
+    quantum_ticks_ = std::max(1, config.value("quantum_ticks", 100));
+    levels_ = std::min(16, std::max(1, config.value("mlfq_levels", 3)));
+    boost_ticks_ = std::max(0, config.value("boost_ticks", 2000));
+    context_switch_ns_ = config.value("context_switch_ns", 2000.0);
+    burst_window_ = config.value("burst_window", 32ULL);
+    yield_on_fault_ = config.value("yield_on_fault", true);
+    clear();
+
+    std::ofstream debug("debug.txt", std::ios::app);
+    debug << "Scheduler: " << policy_name(policy_) << ", quantum " << quantum_ticks_ << " ticks";
+    if (policy_ == SchedulingPolicy::MultilevelFeedback) {
+        debug << ", " << levels_ << " levels, boost every " << boost_ticks_ << " ticks";
+    }
+    debug << ", yield on fault " << yield_on_fault_ << "\n";
+    debug.close();
+}
+
+void Scheduler::clear() {
+    tasks_.clear();
+    ready_ = decltype(ready_)();
+    arrivals_ = 0;
+    running_ = -1;
+    last_ran_ = -1;
+    slice_left_ = 0;
+    last_boost_ = 0;
+    total_ticks_ = 0;
+    switches_ = 0;
+    fault_yields_ = 0;
+    boosts_ = 0;
+}
+
+void Scheduler::add_process(const std::string& pid, int priority) {
+    Task task = {pid, priority, 0, 0, 0, 0, 0, 0, 0, 0, false, 0, 0, 0};
+    tasks_.push_back(task);
+    enqueue(static_cast<int>(tasks_.size()) - 1);
+}
+
+int Scheduler::rank(const Task& task) const {
+    switch (policy_) {
+        case SchedulingPolicy::Priority: return -task.priority;
+        case SchedulingPolicy::MultilevelFeedback: return task.level;
+        default: return 0;
+    }
+}
+
+int Scheduler::quantum(const Task& task) const {
+    // MLFQ gives lower queues longer slices so CPU-bound work switches less often.
+    return policy_ == SchedulingPolicy::MultilevelFeedback ? quantum_ticks_ << task.level : quantum_ticks_;
+}
+
+void Scheduler::enqueue(int task) {
+    ready_.push({rank(tasks_[task]), arrivals_++, task});
+}
+
+int Scheduler::next(int tick, int& switched_from) {
+    switched_from = -1;
+    if (tasks_.empty()) return -1;
+    if (policy_ == SchedulingPolicy::MultilevelFeedback && boost_ticks_ > 0 && tick - last_boost_ >= boost_ticks_) {
+        boost();
+        last_boost_ = tick;
+    }
+    if (running_ < 0 || slice_left_ <= 0) {
+        dispatch(switched_from);
+    }
+    tasks_[running_].ticks++;
+    total_ticks_++;
+    slice_left_--;
+    return running_;
+}
+
+void Scheduler::dispatch(int& switched_from) {
+    if (running_ >= 0) {
+        // The quantum ran out: MLFQ demotes work that uses its whole slice.
+        Task& expired = tasks_[running_];
+        if (policy_ == SchedulingPolicy::MultilevelFeedback && expired.level + 1 < levels_) {
+            expired.level++;
+        }
+        enqueue(running_);
+    }
+    running_ = ready_.top().task;
+    ready_.pop();
+    slice_left_ = quantum(tasks_[running_]);
+    if (last_ran_ >= 0 && last_ran_ != running_) {
+        switched_from = last_ran_;
+        switches_++;
+        end_burst(tasks_[last_ran_]);
+        Task& task = tasks_[running_];
+        task.switch_ins++;
+        task.window_left = burst_window_;
+        task.in_burst = true;
+        task.current_burst = 0;
+    }
+    last_ran_ = running_;
+}
+
+void Scheduler::boost() {
+    // Move everything back to the top queue so demoted processes cannot starve.
+    std::vector<int> waiting;
+    while (!ready_.empty()) {
+        waiting.push_back(ready_.top().task);
+        ready_.pop();
+    }
+    for (auto& task : tasks_) {
+        task.level = 0;
+    }
+    for (int task : waiting) {
+        enqueue(task);
+    }
+    boosts_++;
+}
+
+void Scheduler::record_access(bool tlb_miss, bool blocked) {
+    if (running_ < 0) return;
+    Task& task = tasks_[running_];
+    task.accesses++;
+    if (tlb_miss) task.misses++;
+    if (task.window_left > 0) {
+        task.window_left--;
+        task.window_accesses++;
+        if (tlb_miss) task.window_misses++;
+    }
+    if (task.in_burst) {
+        if (tlb_miss) {
+            task.current_burst++;
+        } else {
+            end_burst(task);
+        }
+    }
+    if (blocked && yield_on_fault_) {
+        // Waiting on swap I/O gives up the rest of the slice without an MLFQ demotion.
+        fault_yields_++;
+        enqueue(running_);
+        running_ = -1;
+    }
+}
+
+void Scheduler::end_burst(Task& task) {
+    if (!task.in_burst) return;
+    task.burst_misses += task.current_burst;
+    task.longest_burst = std::max(task.longest_burst, task.current_burst);
+    task.in_burst = false;
+    task.current_burst = 0;
+}
+
+const std::string& Scheduler::process_id(int task) const {
+    return tasks_[task].pid;
+}
+
+uint64_t Scheduler::context_switches() const {
+    return switches_;
+}
+
+double Scheduler::context_switch_ns() const {
+    return context_switch_ns_;
+}
+
+json Scheduler::export_json() const {
+    json per_process = json::array();
+    for (const auto& task : tasks_) {
+        // A burst still open at the end of the run counts as it stands.
+        uint64_t burst_misses = task.burst_misses + (task.in_burst ? task.current_burst : 0);
+        uint64_t longest_burst = std::max(task.longest_burst, task.in_burst ? task.current_burst : 0);
+        uint64_t steady_accesses = task.accesses - task.window_accesses;
+        json entry;
+        entry["process_id"] = task.pid;
+        entry["priority"] = task.priority;
+        entry["level"] = task.level;
+        entry["cpu_ticks"] = task.ticks;
+        entry["cpu_share"] = total_ticks_ > 0 ? static_cast<double>(task.ticks) / total_ticks_ : 0.0;
+        entry["switch_ins"] = task.switch_ins;
+        entry["accesses"] = task.accesses;
+        entry["tlb_misses"] = task.misses;
+        entry["post_switch_accesses"] = task.window_accesses;
+        entry["post_switch_misses"] = task.window_misses;
+        entry["post_switch_miss_rate"] = task.window_accesses > 0 ? static_cast<double>(task.window_misses) / task.window_accesses : 0.0;
+        entry["steady_miss_rate"] = steady_accesses > 0 ? static_cast<double>(task.misses - task.window_misses) / steady_accesses : 0.0;
+        entry["average_miss_burst"] = task.switch_ins > 0 ? static_cast<double>(burst_misses) / task.switch_ins : 0.0;
+        entry["longest_miss_burst"] = longest_burst;
+        per_process.push_back(entry);
+    }
+    json result;
+    result["policy"] = policy_name(policy_);
+    result["quantum_ticks"] = quantum_ticks_;
+    if (policy_ == SchedulingPolicy::MultilevelFeedback) {
+        result["mlfq_levels"] = levels_;
+        result["boost_ticks"] = boost_ticks_;
+        result["boosts"] = boosts_;
+    }
+    result["ticks"] = total_ticks_;
+    result["context_switches"] = switches_;
+    result["context_switch_ns"] = context_switch_ns_;
+    result["switch_time_ns"] = switches_ * context_switch_ns_;
+    result["fault_yields"] = fault_yields_;
+    result["burst_window"] = burst_window_;
+    result["per_process"] = per_process;
+    return result;
+}
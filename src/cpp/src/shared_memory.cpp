@@ -0,0 +1,201 @@
+#include "shared_memory.h"
+#include <algorithm>
+#include <cerrno>
+#include <cstring>
+#include <fstream>
+
+#ifndef _WIN32
+#include <csignal>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+static const uint64_t min_capacity = 1ULL << 20;
+
+SharedMemoryRegion::SharedMemoryRegion(const std::string& base_name)
+    : base_name_(base_name), name_(base_name), generation_(0), data_(nullptr), capacity_(0), used_(0),
+#ifdef _WIN32
+      mapping_(NULL) {
+#else
+      fd_(-1) {
+#endif
+}
+
+SharedMemoryRegion::~SharedMemoryRegion() {
+    unmap();
+}
+
+void SharedMemoryRegion::clear() {
+    // Each export gets a fresh region: the client's arrays may still view the
+    // previous one, which lives on after unlinking until the client unmaps it.
+    unmap();
+    used_ = 0;
+}
+
+bool SharedMemoryRegion::is_open() const {
+    return data_ != nullptr;
+}
+
+json SharedMemoryRegion::describe() const {
+    json region;
+    region["name"] = name_;
+    region["size"] = capacity_;
+    return region;
+}
+
+uint8_t* SharedMemoryRegion::allocate(uint64_t bytes, const json& dtype, uint64_t count, json& block) {
+    uint64_t offset = (used_ + 7) & ~7ULL;
+    if (!ensure_capacity(offset + bytes)) {
+        return nullptr;
+    }
+    used_ = offset + bytes;
+    block["shm"] = {{"offset", offset}, {"length", bytes}, {"dtype", dtype}, {"count", count}};
+    return data_ + offset;
+}
+
+bool SharedMemoryRegion::ensure_capacity(uint64_t bytes) {
+    if (data_ && bytes <= capacity_) {
+        return true;
+    }
+    uint64_t capacity = std::max(min_capacity, capacity_ * 2);
+    while (capacity < bytes) {
+        capacity *= 2;
+    }
+    return map(capacity);
+}
+
+#ifdef _WIN32
+
+bool SharedMemoryRegion::map(uint64_t capacity) {
+    // File mappings cannot grow, so a larger region is a new mapping under a new name.
+    std::string name = base_name_ + "-" + std::to_string(generation_++);
+    HANDLE mapping = CreateFileMappingA(INVALID_HANDLE_VALUE, NULL, PAGE_READWRITE,
+                                        static_cast<DWORD>(capacity >> 32), static_cast<DWORD>(capacity & 0xFFFFFFFF),
+                                        name.c_str());
+    if (mapping == NULL) {
+        std::ofstream debug("debug.txt", std::ios::app);
+        debug << "CreateFileMapping failed for " << name << ": " << GetLastError() << "\n";
+        debug.close();
+        return false;
+    }
+    uint8_t* data = static_cast<uint8_t*>(MapViewOfFile(mapping, FILE_MAP_ALL_ACCESS, 0, 0, capacity));
+    if (data == nullptr) {
+        std::ofstream debug("debug.txt", std::ios::app);
+        debug << "MapViewOfFile failed for " << name << ": " << GetLastError() << "\n";
+        debug.close();
+        CloseHandle(mapping);
+        return false;
+    }
+    if (data_) {
+        std::memcpy(data, data_, used_);
+    }
+    unmap();
+    mapping_ = mapping;
+    data_ = data;
+    name_ = name;
+    capacity_ = capacity;
+
+    std::ofstream debug("debug.txt", std::ios::app);
+    debug << "Shared memory " << name_ << " mapped, " << capacity_ / 1024 << " KB\n";
+    debug.close();
+    return true;
+}
+
+void SharedMemoryRegion::unmap() {
+    if (data_) {
+        UnmapViewOfFile(data_);
+        data_ = nullptr;
+    }
+    if (mapping_ != NULL) {
+        CloseHandle(mapping_);
+        mapping_ = NULL;
+    }
+    capacity_ = 0;
+}
+
+#else
+
+// The UI stops the simulator with SIGTERM, which skips destructors and would leave
+// the segment in /dev/shm. Only the newest generation is still linked, so one path suffices.
+static char unlink_path[256];
+static bool unlink_handler_installed = false;
+
+static void unlink_and_reraise(int signal_number) {
+    shm_unlink(unlink_path);
+    std::signal(signal_number, SIG_DFL);
+    std::raise(signal_number);
+}
+
+static void install_unlink_handler(int signal_number) {
+    // Keep any handler the host already installed, e.g. Python's KeyboardInterrupt in the extension.
+    void (*previous)(int) = std::signal(signal_number, unlink_and_reraise);
+    if (previous != SIG_DFL) {
+        std::signal(signal_number, previous);
+    }
+}
+
+bool SharedMemoryRegion::map(uint64_t capacity) {
+    // The shm object keeps its contents, so growing is ftruncate plus a fresh mapping.
+    if (fd_ < 0) {
+        name_ = base_name_ + "-" + std::to_string(generation_++);
+    }
+    std::string path = "/" + name_;
+    if (fd_ < 0) {
+        fd_ = shm_open(path.c_str(), O_CREAT | O_RDWR, 0600);
+        if (fd_ < 0) {
+            std::ofstream debug("debug.txt", std::ios::app);
+            debug << "shm_open failed for " << path << ": " << std::strerror(errno) << "\n";
+            debug.close();
+            return false;
+        }
+        if (path.size() < sizeof(unlink_path)) {
+            std::strncpy(unlink_path, path.c_str(), sizeof(unlink_path) - 1);
+        }
+        if (!unlink_handler_installed) {
+            unlink_handler_installed = true;
+            install_unlink_handler(SIGTERM);
+            install_unlink_handler(SIGINT);
+            install_unlink_handler(SIGHUP);
+        }
+    }
+    if (ftruncate(fd_, static_cast<off_t>(capacity)) != 0) {
+        std::ofstream debug("debug.txt", std::ios::app);
+        debug << "ftruncate failed for " << path << ": " << std::strerror(errno) << "\n";
+        debug.close();
+        return false;
+    }
+    void* data = mmap(nullptr, capacity, PROT_READ | PROT_WRITE, MAP_SHARED, fd_, 0);
+    if (data == MAP_FAILED) {
+        std::ofstream debug("debug.txt", std::ios::app);
+        debug << "mmap failed for " << path << ": " << std::strerror(errno) << "\n";
+        debug.close();
+        return false;
+    }
+    if (data_) {
+        munmap(data_, capacity_);
+    }
+    data_ = static_cast<uint8_t*>(data);
+    capacity_ = capacity;
+
+    std::ofstream debug("debug.txt", std::ios::app);
+    debug << "Shared memory " << path << " mapped, " << capacity_ / 1024 << " KB\n";
+    debug.close();
+    return true;
+}
+
+void SharedMemoryRegion::unmap() {
+    if (data_) {
+        munmap(data_, capacity_);
+        data_ = nullptr;
+    }
+    if (fd_ >= 0) {
+        close(fd_);
+        shm_unlink(("/" + name_).c_str());
+        fd_ = -1;
+    }
+    capacity_ = 0;
+}
+
+#endif
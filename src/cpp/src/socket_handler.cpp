@@ -1,10 +1,51 @@
 #include "socket_handler.h"
+#include <cerrno>
+#include <chrono>
+#include <cstdlib>
+#include <cstring>
 #include <iostream>
 #include <fstream>
+#include <stdexcept>
 
+#ifdef _WIN32
 #pragma comment(lib, "Ws2_32.lib")
 
-SocketHandler::SocketHandler() : server_socket(INVALID_SOCKET), client_socket(INVALID_SOCKET) {
+static int last_socket_error() {
+    return WSAGetLastError();
+}
+
+static bool is_disconnect(int error) {
+    return error == WSAECONNRESET || error == WSAECONNABORTED;
+}
+
+static void close_socket(SOCKET s) {
+    closesocket(s);
+}
+
+static const int send_flags = 0;
+#else
+static int last_socket_error() {
+    return errno;
+}
+
+static bool is_disconnect(int error) {
+    return error == ECONNRESET || error == ECONNABORTED || error == EPIPE;
+}
+
+static void close_socket(SOCKET s) {
+    close(s);
+}
+
+// A client that disappears mid-write must surface as EPIPE, not kill the process.
+#ifdef MSG_NOSIGNAL
+static const int send_flags = MSG_NOSIGNAL;
+#else
+static const int send_flags = 0;
+#endif
+#endif
+
+SocketHandler::SocketHandler() : server_socket(INVALID_SOCKET), client_socket(INVALID_SOCKET), stats{0, 0, 0, 0.0} {
+#ifdef _WIN32
     WSADATA wsaData;
     if (WSAStartup(MAKEWORD(2, 2), &wsaData) != 0) {
         throw std::runtime_error("WSAStartup failed: " + std::to_string(WSAGetLastError()));
@@ -27,47 +68,92 @@ SocketHandler::SocketHandler() : server_socket(INVALID_SOCKET), client_socket(IN
     server_addr.sin_family = AF_INET;
     server_addr.sin_addr.s_addr = inet_addr("127.0.0.1");
     server_addr.sin_port = htons(12345);
+    endpoint = "127.0.0.1:12345";
 
     if (bind(server_socket, (sockaddr*)&server_addr, sizeof(server_addr)) == SOCKET_ERROR) {
         closesocket(server_socket);
         WSACleanup();
         throw std::runtime_error("Bind failed: " + std::to_string(WSAGetLastError()));
     }
+#else
+    const char* path = std::getenv("VMSIM_SOCKET");
+    endpoint = path && *path ? path : "/tmp/virtual_memory_simulator.sock";
+
+    sockaddr_un server_addr;
+    std::memset(&server_addr, 0, sizeof(server_addr));
+    server_addr.sun_family = AF_UNIX;
+    if (endpoint.size() >= sizeof(server_addr.sun_path)) {
+        throw std::runtime_error("Socket path too long: " + endpoint);
+    }
+    std::strncpy(server_addr.sun_path, endpoint.c_str(), sizeof(server_addr.sun_path) - 1);
+
+    server_socket = socket(AF_UNIX, SOCK_STREAM, 0);
+    if (server_socket == INVALID_SOCKET) {
+        throw std::runtime_error("Failed to create socket: " + std::string(std::strerror(errno)));
+    }
+
+    // A previous run that was killed leaves its socket file behind.
+    unlink(endpoint.c_str());
+    if (bind(server_socket, (sockaddr*)&server_addr, sizeof(server_addr)) == SOCKET_ERROR) {
+        int error = errno;
+        close(server_socket);
+        throw std::runtime_error("Bind failed: " + std::string(std::strerror(error)));
+    }
+#endif
 
     if (listen(server_socket, 1) == SOCKET_ERROR) {
-        closesocket(server_socket);
+        int error = last_socket_error();
+        close_socket(server_socket);
+#ifdef _WIN32
         WSACleanup();
-        throw std::runtime_error("Listen failed: " + std::to_string(WSAGetLastError()));
+#endif
+        throw std::runtime_error("Listen failed: " + std::to_string(error));
     }
 
     std::ofstream debug("debug.txt", std::ios::app);
-    debug << "TCP server initialized on 127.0.0.1:12345\n";
+    debug << "Server initialized on " << endpoint << "\n";
     debug.close();
 
-    std::cout << "TCP server listening on 127.0.0.1:12345" << std::endl;
+    std::cout << "Server listening on " << endpoint << std::endl;
 }
 
 SocketHandler::~SocketHandler() {
     if (client_socket != INVALID_SOCKET) {
-        closesocket(client_socket);
+        close_socket(client_socket);
     }
     if (server_socket != INVALID_SOCKET) {
-        closesocket(server_socket);
+        close_socket(server_socket);
     }
+#ifdef _WIN32
     WSACleanup();
+#else
+    unlink(endpoint.c_str());
+#endif
     std::ofstream debug("debug.txt", std::ios::app);
-    debug << "Closed TCP sockets\n";
+    debug << "Closed sockets\n";
     debug.close();
-    std::cout << "Closed TCP sockets" << std::endl;
+    std::cout << "Closed sockets" << std::endl;
+}
+
+void SocketHandler::close_client() {
+    // Partial input from this client must not prefix the next one's messages.
+    pending.clear();
+    if (client_socket != INVALID_SOCKET) {
+        close_socket(client_socket);
+        client_socket = INVALID_SOCKET;
+    }
 }
 
 bool SocketHandler::accept_connection() {
+    // The loop re-accepts after any read or write failure, so never leak the previous client.
+    close_client();
     std::cout << "Waiting for client connection..." << std::endl;
     client_socket = accept(server_socket, NULL, NULL);
     if (client_socket == INVALID_SOCKET) {
-        std::cerr << "Accept failed: " << WSAGetLastError() << std::endl;
+        int error = last_socket_error();
+        std::cerr << "Accept failed: " << error << std::endl;
         std::ofstream debug("debug.txt", std::ios::app);
-        debug << "Accept failed: " << WSAGetLastError() << "\n";
+        debug << "Accept failed: " << error << "\n";
         debug.close();
         return false;
     }
@@ -79,58 +165,112 @@ bool SocketHandler::accept_connection() {
 }
 
 std::string SocketHandler::read() {
-    char buffer[1024 * 1024];
-    int bytes_received = recv(client_socket, buffer, sizeof(buffer) - 1, 0);
-    if (bytes_received == SOCKET_ERROR) {
-        int error = WSAGetLastError();
-        std::ofstream debug("debug.txt", std::ios::app);
-        debug << "Read failed: " << error << "\n";
-        debug.close();
-        if (error == WSAECONNRESET || error == WSAECONNABORTED) {
-            std::cout << "Client disconnected, error: " << error << ". Waiting for new connection..." << std::endl;
-            closesocket(client_socket);
-            client_socket = INVALID_SOCKET;
+    // Messages are newline-delimited; bytes past the newline stay in pending for the next read.
+    char buffer[64 * 1024];
+    size_t newline;
+    while ((newline = pending.find('\n')) == std::string::npos || newline == 0) {
+        if (newline == 0) {
+            pending.erase(0, 1);
+            continue;
+        }
+        int bytes_received = recv(client_socket, buffer, sizeof(buffer), 0);
+        if (bytes_received == SOCKET_ERROR) {
+            int error = last_socket_error();
+            std::ofstream debug("debug.txt", std::ios::app);
+            debug << "Read failed: " << error << "\n";
+            debug.close();
+            if (is_disconnect(error)) {
+                std::cout << "Client disconnected, error: " << error << ". Waiting for new connection..." << std::endl;
+            } else {
+                std::cerr << "Read failed: " << error << std::endl;
+            }
+            close_client();
+            return "";
+        }
+        if (bytes_received == 0) {
+            std::ofstream debug("debug.txt", std::ios::app);
+            debug << "Client closed connection\n";
+            debug.close();
+            std::cout << "Client closed connection. Waiting for new connection..." << std::endl;
+            close_client();
             return "";
         }
-        std::cerr << "Read failed: " << error << std::endl;
-        return "";
+        pending.append(buffer, bytes_received);
+        stats.bytes_received += bytes_received;
     }
-    if (bytes_received == 0) {
-        std::ofstream debug("debug.txt", std::ios::app);
-        debug << "Client closed connection\n";
-        debug.close();
-        std::cout << "Client closed connection. Waiting for new connection..." << std::endl;
-        closesocket(client_socket);
-        client_socket = INVALID_SOCKET;
-        return "";
+    std::string message = pending.substr(0, newline);
+    pending.erase(0, newline + 1);
+    std::ofstream debug("debug.txt", std::ios::app);
+    debug << "Received: " << message.substr(0, 50) << "...\n";
+    debug.close();
+    std::cout << "Received: " << message.substr(0, 50) << "..." << std::endl;
+    return message;
+}
+
+bool SocketHandler::poll_message(std::string& message) {
+    // Non-blocking variant of read(): drains whatever is already on the socket
+    // and returns a message only if a complete line is available.
+    while (!pending.empty() && pending[0] == '\n') {
+        pending.erase(0, 1);
+    }
+    if (pending.find('\n') == std::string::npos && client_socket != INVALID_SOCKET) {
+        fd_set readable;
+        FD_ZERO(&readable);
+        FD_SET(client_socket, &readable);
+        timeval timeout = {0, 0};
+        if (select(static_cast<int>(client_socket) + 1, &readable, NULL, NULL, &timeout) > 0) {
+            char buffer[4096];
+            int bytes_received = recv(client_socket, buffer, sizeof(buffer), 0);
+            if (bytes_received > 0) {
+                pending.append(buffer, bytes_received);
+                stats.bytes_received += bytes_received;
+            }
+        }
     }
-    buffer[bytes_received] = '\0';
+    size_t newline = pending.find('\n');
+    if (newline == std::string::npos) {
+        return false;
+    }
+    message = pending.substr(0, newline);
+    pending.erase(0, newline + 1);
     std::ofstream debug("debug.txt", std::ios::app);
-    debug << "Received: " << std::string(buffer).substr(0, 50) << "...\n";
+    debug << "Received mid-run: " << message.substr(0, 50) << "...\n";
     debug.close();
-    std::cout << "Received: " << std::string(buffer).substr(0, 50) << "..." << std::endl;
-    return std::string(buffer);
+    return true;
+}
+
+const SocketStats& SocketHandler::get_stats() const {
+    return stats;
 }
 
 bool SocketHandler::write(const std::string& data) {
-    int bytes_sent = send(client_socket, data.c_str(), data.size(), 0);
-    if (bytes_sent == SOCKET_ERROR) {
-        int error = WSAGetLastError();
-        std::ofstream debug("debug.txt", std::ios::app);
-        debug << "Write failed: " << error << "\n";
-        debug.close();
-        if (error == WSAECONNRESET || error == WSAECONNABORTED) {
-            std::cout << "Client disconnected during write, error: " << error << ". Waiting for new connection..." << std::endl;
-            closesocket(client_socket);
-            client_socket = INVALID_SOCKET;
+    std::string message = data + "\n";
+    auto start = std::chrono::steady_clock::now();
+    size_t sent = 0;
+    while (sent < message.size()) {
+        int bytes_sent = send(client_socket, message.c_str() + sent, static_cast<int>(message.size() - sent), send_flags);
+        if (bytes_sent == SOCKET_ERROR) {
+            int error = last_socket_error();
+            std::ofstream debug("debug.txt", std::ios::app);
+            debug << "Write failed: " << error << "\n";
+            debug.close();
+            if (is_disconnect(error)) {
+                std::cout << "Client disconnected during write, error: " << error << ". Waiting for new connection..." << std::endl;
+            } else {
+                std::cerr << "Write failed: " << error << std::endl;
+            }
+            // A partly sent line cannot be resynchronised, so drop the client either way.
+            close_client();
             return false;
         }
-        std::cerr << "Write failed: " << error << std::endl;
-        return false;
+        sent += bytes_sent;
+        stats.bytes_sent += bytes_sent;
     }
+    stats.messages_sent++;
+    stats.send_seconds += std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
     std::ofstream debug("debug.txt", std::ios::app);
     debug << "Sent: " << data.substr(0, 50) << "...\n";
     debug.close();
     std::cout << "Sent: " << data.substr(0, 50) << "..." << std::endl;
     return true;
-}
\ No newline at end of file
+}
@@ -0,0 +1,187 @@
+#include "swap_device.h"
+#include <algorithm>
+#include <fstream>
+
+SwapDeviceModel SwapDeviceModel::preset(const std::string& name) {
+    if (name == "HDD") {
+        return {"HDD", 8000.0, 120.0};
+    }
+    return {"SSD", 100.0, 500.0};
+}
+
+SwapDevice::SwapDevice()
+    : slot_count_(0), used_slots_(0), search_hint_(0), page_size_bytes_(0), cluster_pages_(1),
+      readahead_pages_(1), model_(SwapDeviceModel::preset("SSD")), read_ops_(0), write_ops_(0),
+      pages_read_(0), pages_written_(0), readahead_hits_(0), read_time_us_(0.0), write_time_us_(0.0) {}
+
+void SwapDevice::init(uint64_t slot_count, uint64_t page_size_bytes, const SwapDeviceModel& model,
+                      uint64_t cluster_pages, uint64_t readahead_pages) {
+    clear();
+    slot_count_ = slot_count;
+    page_size_bytes_ = page_size_bytes;
+    model_ = model;
+    cluster_pages_ = std::max<uint64_t>(cluster_pages, 1);
+    readahead_pages_ = std::max<uint64_t>(readahead_pages, 1);
+    bitmap_.assign((slot_count + 63) / 64, 0);
+
+    std::ofstream debug("debug.txt", std::ios::app);
+    debug << "Swap device initialized: " << model_.name << ", " << slot_count << " slots, latency "
+          << model_.latency_us << " us, bandwidth " << model_.bandwidth_mb_s << " MB/s, cluster "
+          << cluster_pages_ << " pages, read-ahead " << readahead_pages_ << " pages\n";
+    debug.close();
+}
+
+void SwapDevice::clear() {
+    std::vector<uint64_t>().swap(bitmap_);
+    slot_count_ = 0;
+    used_slots_ = 0;
+    search_hint_ = 0;
+    read_ops_ = 0;
+    write_ops_ = 0;
+    pages_read_ = 0;
+    pages_written_ = 0;
+    readahead_hits_ = 0;
+    read_time_us_ = 0.0;
+    write_time_us_ = 0.0;
+    readahead_fifo_.clear();
+    readahead_cache_.clear();
+}
+
+void SwapDevice::set_used(uint64_t slot, bool used) {
+    uint64_t mask = 1ULL << (slot % 64);
+    if (used) {
+        bitmap_[slot / 64] |= mask;
+    } else {
+        bitmap_[slot / 64] &= ~mask;
+    }
+}
+
+bool SwapDevice::is_used(uint64_t slot) const {
+    if (slot >= slot_count_) return false;
+    return (bitmap_[slot / 64] >> (slot % 64)) & 1ULL;
+}
+
+uint64_t SwapDevice::allocate_slot() {
+    return allocate_cluster(1);
+}
+
+uint64_t SwapDevice::allocate_cluster(uint64_t count) {
+    if (count == 0 || count > slot_count_ - used_slots_) {
+        return UINT64_MAX;
+    }
+    // Next-fit scan for a run of free slots, skipping fully used bitmap words.
+    for (int pass = 0; pass < 2; ++pass) {
+        uint64_t slot = pass == 0 ? search_hint_ : 0;
+        uint64_t limit = pass == 0 ? slot_count_ : std::min(slot_count_, search_hint_ + count);
+        uint64_t run_start = slot;
+        uint64_t run_length = 0;
+        while (slot < limit) {
+            if (slot % 64 == 0 && run_length == 0 && bitmap_[slot / 64] == ~0ULL) {
+                slot += 64;
+                run_start = slot;
+                continue;
+            }
+            if (is_used(slot)) {
+                run_length = 0;
+                run_start = slot + 1;
+            } else if (++run_length == count) {
+                for (uint64_t s = run_start; s < run_start + count; ++s) {
+                    set_used(s, true);
+                }
+                used_slots_ += count;
+                search_hint_ = run_start + count < slot_count_ ? run_start + count : 0;
+                return run_start;
+            }
+            slot++;
+        }
+    }
+    return UINT64_MAX;
+}
+
+void SwapDevice::free_slot(uint64_t slot) {
+    if (!is_used(slot)) return;
+    set_used(slot, false);
+    used_slots_--;
+    if (readahead_cache_.erase(slot) > 0) {
+        readahead_fifo_.erase(std::find(readahead_fifo_.begin(), readahead_fifo_.end(), slot));
+    }
+}
+
+uint64_t SwapDevice::total_slots() const {
+    return slot_count_;
+}
+
+uint64_t SwapDevice::free_slots() const {
+    return slot_count_ - used_slots_;
+}
+
+uint64_t SwapDevice::get_cluster_pages() const {
+    return cluster_pages_;
+}
+
+double SwapDevice::io_cost_us(uint64_t pages) const {
+    double bytes = static_cast<double>(pages) * page_size_bytes_;
+    return model_.latency_us + bytes / (model_.bandwidth_mb_s * 1024.0 * 1024.0) * 1e6;
+}
+
+double SwapDevice::swap_out(uint64_t count) {
+    double total = 0.0;
+    for (uint64_t done = 0; done < count; done += cluster_pages_) {
+        uint64_t batch = std::min(cluster_pages_, count - done);
+        double cost = io_cost_us(batch);
+        write_ops_++;
+        pages_written_ += batch;
+        write_time_us_ += cost;
+        total += cost;
+    }
+    return total;
+}
+
+double SwapDevice::swap_in(uint64_t slot) {
+    auto cached = readahead_cache_.find(slot);
+    if (cached != readahead_cache_.end()) {
+        readahead_hits_++;
+        return 0.0;
+    }
+
+    uint64_t window = 1;
+    while (window < readahead_pages_ && is_used(slot + window)) {
+        window++;
+    }
+    double cost = io_cost_us(window);
+    read_ops_++;
+    pages_read_ += window;
+    read_time_us_ += cost;
+
+    size_t capacity = static_cast<size_t>(readahead_pages_ * 8);
+    for (uint64_t s = slot + 1; s < slot + window; ++s) {
+        if (readahead_cache_.insert(s).second) {
+            readahead_fifo_.push_back(s);
+        }
+    }
+    while (readahead_fifo_.size() > capacity) {
+        readahead_cache_.erase(readahead_fifo_.front());
+        readahead_fifo_.pop_front();
+    }
+    return cost;
+}
+
+json SwapDevice::export_json() const {
+    json result;
+    result["device"] = model_.name;
+    result["latency_us"] = model_.latency_us;
+    result["bandwidth_mb_s"] = model_.bandwidth_mb_s;
+    result["cluster_pages"] = cluster_pages_;
+    result["readahead_pages"] = readahead_pages_;
+    result["total_slots"] = slot_count_;
+    result["used_slots"] = used_slots_;
+    result["read_ops"] = read_ops_;
+    result["write_ops"] = write_ops_;
+    result["bytes_read"] = pages_read_ * page_size_bytes_;
+    result["bytes_written"] = pages_written_ * page_size_bytes_;
+    result["readahead_hits"] = readahead_hits_;
+    result["read_time_ms"] = read_time_us_ / 1000.0;
+    result["write_time_ms"] = write_time_us_ / 1000.0;
+    result["io_time_ms"] = (read_time_us_ + write_time_us_) / 1000.0;
+    return result;
+}
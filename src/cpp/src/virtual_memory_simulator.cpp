@@ -1,5 +1,3 @@
-#include <winsock2.h>
-#include <ws2tcpip.h>
 #include <iostream>
 #include <vector>
 #include <set>
@@ -9,11 +7,53 @@
 #include <sstream>
 #include <unordered_map>
 #include <iomanip>
+#include <chrono>
+#include <cstring>
+#include <atomic>
 #include "../include/virtual_memory_simulator.h"
+#include "../include/encoding.h"
 
-#pragma comment(lib, "Ws2_32.lib")
+static const std::chrono::milliseconds progress_interval(250);
 
-VirtualMemorySimulator::VirtualMemorySimulator(SocketHandler* handler) : socket_handler(handler), total_hits(0), total_misses(0), total_faults(0), tlb_capacity(0) {
+static std::string shared_memory_name() {
+    // Several simulators can share a process when loaded as the Python extension.
+    static std::atomic<int> instances(0);
+    int instance = instances++;
+#ifdef _WIN32
+    std::string name = "vmsim-" + std::to_string(GetCurrentProcessId());
+#else
+    std::string name = "vmsim-" + std::to_string(getpid());
+#endif
+    return instance ? name + "-" + std::to_string(instance) : name;
+}
+
+// Writes a (tick, value) series into the shared-memory region as packed records,
+// falling back to the JSON array when there is no region or it cannot grow.
+template <typename T>
+static json series_json(SharedMemoryRegion* region, const std::vector<std::pair<int, T>>& series, const char* value_dtype) {
+    if (region) {
+        const uint64_t record = sizeof(int32_t) + sizeof(T);
+        json dtype = json::array({json::array({"tick", "=i4"}), json::array({"value", value_dtype})});
+        json block;
+        uint8_t* out = region->allocate(series.size() * record, dtype, series.size(), block);
+        if (out) {
+            for (const auto& point : series) {
+                int32_t tick = point.first;
+                T value = point.second;
+                std::memcpy(out, &tick, sizeof(tick));
+                std::memcpy(out + sizeof(tick), &value, sizeof(value));
+                out += record;
+            }
+            return block;
+        }
+    }
+    return json(series);
+}
+
+VirtualMemorySimulator::VirtualMemorySimulator(SocketHandler* handler) : socket_handler(handler), tlb_capacity(0), tlb_asids(true),
+      contiguous_spill(false), trace_driven(false), summary_only(false), use_shared_memory(false), shared_memory(shared_memory_name()), trace_ticks(0),
+      cancelled(false), progress_done(0), progress_total(0), accesses_done(0), frames_baseline(0), socket_baseline{0, 0, 0, 0.0},
+      next_tick(0), va_max(0), total_hits(0), total_misses(0), total_faults(0), trace_dropped(0), tlb_flushes(0), pending_switch_ns(0.0) {
     std::ofstream debug("debug.txt", std::ios::out);
     debug << "Virtual Memory Simulator initialized\n";
     debug.close();
@@ -26,28 +66,46 @@ VirtualMemorySimulator::~VirtualMemorySimulator() {
 }
 
 void VirtualMemorySimulator::load_settings(const json& settings) {
+    ScopedTimer timer(metrics, "load_settings");
     try {
-        ram_size_bytes = settings["ram_size_gb"].get<uint64_t>() * 1024ULL * 1024 * 1024;
-        page_size_bytes = settings["page_size_kb"].get<uint64_t>() * 1024;
-        tlb_size = settings["tlb_size"].get<int>();
-        tlb_enabled = settings["tlb_enabled"].get<bool>();
-        virtual_address_size = settings["virtual_address_size"].get<std::string>();
-        rom_size = settings["rom_size"].get<std::string>();
-        swap_percent = settings["swap_percent"].get<int>();
-        allocation_type = settings["allocation_type"].get<std::string>();
+        ram_size_bytes = settings.at("ram_size_gb").get<uint64_t>() * 1024ULL * 1024 * 1024;
+        page_size_bytes = settings.at("page_size_kb").get<uint64_t>() * 1024;
+        tlb_size = settings.at("tlb_size").get<int>();
+        tlb_enabled = settings.at("tlb_enabled").get<bool>();
+        tlb_asids = settings.value("tlb_asids", true);
+        virtual_address_size = settings.at("virtual_address_size").get<std::string>();
+        rom_size = settings.at("rom_size").get<std::string>();
+        swap_percent = settings.at("swap_percent").get<int>();
+        swap_model = SwapDeviceModel::preset(settings.value("swap_device", std::string("SSD")));
+        swap_model.latency_us = settings.value("swap_latency_us", swap_model.latency_us);
+        swap_model.bandwidth_mb_s = settings.value("swap_bandwidth_mb_s", swap_model.bandwidth_mb_s);
+        swap_cluster_pages = settings.value("swap_cluster_pages", 8ULL);
+        swap_readahead_pages = settings.value("swap_readahead_pages", 8ULL);
+        allocation_type = settings.at("allocation_type").get<std::string>();
+        cost_model = CostModel::from_json(settings);
+        page_walk_cache.configure(settings);
+        scheduler.configure(settings);
+        allocation_strategy = FrameAllocator::parse_strategy(settings.value("allocation_strategy", std::string("First Fit")));
+        contiguous_spill = settings.value("contiguous_spill", false);
+        trace_driven = settings.value("trace_driven", false);
+        summary_only = settings.value("summary_only", false);
+        trace_ticks = settings.value("trace_ticks", 0);
+        use_shared_memory = settings.value("shared_memory", false);
+        begin_run();
 
         int entry_size = (virtual_address_size == "16-bit") ? 2 : (virtual_address_size == "32-bit") ? 4 : 8;
         tlb_capacity = (tlb_size * 1024) / entry_size;
 
         processes.clear();
-        for (const auto& proc_json : settings["processes"]) {
+        for (const auto& proc_json : settings.at("processes")) {
             Process p;
-            p.id = proc_json["id"].get<std::string>();
-            p.name = proc_json["name"].get<std::string>();
-            p.size_bytes = proc_json["size_gb"].get<int>() * 1024ULL * 1024 * 1024;
-            p.type = proc_json["type"].get<std::string>();
-            p.has_priority = proc_json["has_priority"].get<bool>();
-            p.is_process_stop = proc_json["is_process_stop"].get<bool>();
+            p.id = proc_json.at("id").get<std::string>();
+            p.name = proc_json.at("name").get<std::string>();
+            p.size_bytes = proc_json.at("size_gb").get<int>() * 1024ULL * 1024 * 1024;
+            p.type = proc_json.at("type").get<std::string>();
+            p.has_priority = proc_json.at("has_priority").get<bool>();
+            p.priority = proc_json.value("priority", p.has_priority ? 1 : 0);
+            p.is_process_stop = proc_json.at("is_process_stop").get<bool>();
             processes.push_back(p);
         }
 
@@ -58,8 +116,12 @@ void VirtualMemorySimulator::load_settings(const json& settings) {
               << "TLBEnabled=" << tlb_enabled << ", "
               << "VASize=" << virtual_address_size << ", "
               << "ROM=" << rom_size << ", "
-              << "Swap=" << swap_percent << "%, "
-              << "Allocation=" << allocation_type << "\n";
+              << "Swap=" << swap_percent << "% (" << swap_model.name << "), "
+              << "Allocation=" << allocation_type << ", "
+              << "Strategy=" << FrameAllocator::strategy_name(allocation_strategy) << ", "
+              << "ContiguousSpill=" << contiguous_spill << ", "
+              << "TraceDriven=" << trace_driven << ", "
+              << "SummaryOnly=" << summary_only << "\n";
         for (const auto& p : processes) {
             debug << "Process: ID=" << p.id << ", Name=" << p.name << ", Size="
                   << p.size_bytes / (1024ULL * 1024 * 1024) << "GB, "
@@ -130,7 +192,26 @@ void VirtualMemorySimulator::tlb_remove_process(const std::string& pid) {
     }
 }
 
+void VirtualMemorySimulator::tlb_invalidate(const std::string& pid, uint64_t page_no) {
+    std::string key = pid + "_" + std::to_string(page_no);
+    if (tlb.erase(key) == 0) return;
+    std::queue<std::string> temp;
+    while (!tlb_fifo.empty()) {
+        if (tlb_fifo.front() != key) {
+            temp.push(tlb_fifo.front());
+        }
+        tlb_fifo.pop();
+    }
+    tlb_fifo = temp;
+}
+
+void VirtualMemorySimulator::tlb_flush() {
+    tlb.clear();
+    while (!tlb_fifo.empty()) tlb_fifo.pop();
+}
+
 uint64_t VirtualMemorySimulator::tlb_get_frame(const std::string& pid, uint64_t page_no) {
+    metrics.count(METRIC_TLB_PROBES);
     std::string key = pid + "_" + std::to_string(page_no);
     auto it = tlb.find(key);
     if (it != tlb.end() && it->second.process_status == 1) {
@@ -155,8 +236,17 @@ void VirtualMemorySimulator::simulate() {
     total_hits = 0;
     total_misses = 0;
     total_faults = 0;
+    access_cost_total = AccessCost();
+    access_latency.clear();
+    page_walk_cache.clear();
     tlb.clear();
     while (!tlb_fifo.empty()) tlb_fifo.pop();
+    scheduler.clear();
+    scheduled.clear();
+    trace_queues.clear();
+    trace_dropped = 0;
+    tlb_flushes = 0;
+    pending_switch_ns = 0.0;
 
     debug << "Starting simulation\n";
 
@@ -171,9 +261,10 @@ void VirtualMemorySimulator::simulate() {
             it->second.flag = -1;
             deleted_pids.push_back(it->first);
             debug << "Process " << it->first << ": Marked as deleted (not in JSON)\n";
-            it->second.page_table.free_frames(available_frames, available_table_frames);
-            it->second.page_table.free_swap_frames(available_swap_frames);
+            it->second.page_table.free_frames(available_frames, frame_allocator, available_table_frames);
+            it->second.page_table.free_swap_frames(swap_device);
             tlb_remove_process(it->first);
+            page_walk_cache.flush_asid(get_asid(it->first));
             it = page_tables.erase(it);
             debug << "Process " << deleted_pids.back() << ": Freed resources and removed from page_tables\n";
         } else {
@@ -182,7 +273,6 @@ void VirtualMemorySimulator::simulate() {
     }
 
     int entry_size;
-    uint64_t va_max;
     if (virtual_address_size == "16-bit") {
         entry_size = 2;
         va_max = 0xFFFF;
@@ -230,37 +320,39 @@ void VirtualMemorySimulator::simulate() {
     debug << "Effective RAM: " << effective_ram / (1024.0 * 1024 * 1024) << " GB, "
           << "Effective frames: " << effective_frames << "\n";
 
-    if (available_frames.empty()) {
+    {
+        ScopedTimer timer(metrics, "frame_setup");
         if (allocation_type == "Contiguous") {
-            uint64_t start_frame = table_frame_limit;
-            for (uint64_t i = start_frame; i < total_frames; ++i) {
-                available_frames.push_back(i);
+            if (frame_allocator.total_frames() == 0) {
+                frame_allocator.init(table_frame_limit, total_frames - table_frame_limit, allocation_strategy);
             }
-        } else {
+        } else if (available_frames.empty()) {
             for (uint64_t i = table_frame_limit; i < total_frames; ++i) {
                 available_frames.push_back(i);
             }
         }
-    }
-    if (available_table_frames.empty()) {
-        available_table_frames.resize(table_frame_limit);
-        for (uint64_t i = 0; i < table_frame_limit; ++i) {
-            available_table_frames[i] = i;
+        if (available_table_frames.empty()) {
+            available_table_frames.resize(table_frame_limit);
+            for (uint64_t i = 0; i < table_frame_limit; ++i) {
+                available_table_frames[i] = i;
+            }
         }
-    }
-    if (available_swap_frames.empty() && swap_percent > 0) {
-        available_swap_frames.resize(total_swap_frames);
-        for (uint64_t i = 0; i < total_swap_frames; ++i) {
-            available_swap_frames[i] = i;
+        if (frame_table.size() == 0) {
+            frame_table.reset(total_frames, total_swap_frames);
+        }
+        if (swap_device.total_slots() == 0 && total_swap_frames > 0) {
+            swap_device.init(total_swap_frames, page_size_bytes, swap_model, swap_cluster_pages, swap_readahead_pages);
         }
     }
     debug << "Total RAM frames: " << total_frames << ", Effective frames: " << effective_frames
           << ", Table frames: " << table_frame_limit << ", Swap frames: " << total_swap_frames << "\n";
 
     uint64_t total_table_size = 0;
+    uint64_t total_pages = 0;
     for (const auto& p : processes) {
         if (p.is_process_stop) continue;
         uint64_t num_pages = (p.size_bytes + page_size_bytes - 1) / page_size_bytes;
+        total_pages += num_pages;
         int levels = std::max(1, static_cast<int>(ceil(log2(num_pages) / log2(page_size_bytes / entry_size))));
         uint64_t table_size = num_pages * entry_size;
         if (levels > 1) {
@@ -293,10 +385,18 @@ void VirtualMemorySimulator::simulate() {
 
     std::random_device rd;
     std::mt19937 gen(rd());
+    rng.seed(rd());
+    next_tick = 0;
+    // Progress counts pages placed across all processes; the page table reports in
+    // from inside its allocation loops so one large process cannot stall the client.
+    uint64_t pages_placed = 0;
     for (const auto& p : processes) {
         if (p.is_process_stop) continue;
+        if (checkpoint("allocate", pages_placed, total_pages, pages_placed == 0)) break;
         int flag = 1;
         uint64_t num_pages = (p.size_bytes + page_size_bytes - 1) / page_size_bytes;
+        uint64_t pages_before = pages_placed;
+        pages_placed += num_pages;
         uint64_t last_page_va = (num_pages - 1) * page_size_bytes;
         if (last_page_va > va_max) {
             debug << "Process " << p.id << ": Cannot run in " << virtual_address_size
@@ -310,8 +410,18 @@ void VirtualMemorySimulator::simulate() {
             continue;
         }
         debug << "Process " << p.id << ": Creating page table for " << num_pages << " pages, Flag=" << flag << "\n";
-        PageTable pt(num_pages, page_size_bytes, entry_size, allocation_type, total_frames, total_frames, ram_size_bytes, frame_percent, p.id, virtual_address_size);
-        if (!pt.allocate(block_size_bytes, available_frames, available_table_frames, gen, available_swap_frames)) {
+        PageTable pt(num_pages, page_size_bytes, entry_size, allocation_type, total_frames, total_frames, ram_size_bytes, frame_percent, p.id, virtual_address_size, get_asid(p.id), frame_table);
+        pt.set_contiguous_spill(contiguous_spill);
+        bool allocated_ok;
+        {
+            ScopedTimer timer(metrics, "page_table_allocate");
+            allocated_ok = pt.allocate(block_size_bytes, available_frames, frame_allocator, available_table_frames, gen, swap_device,
+                                       [&](uint64_t placed) { return checkpoint("allocate", pages_before + placed, total_pages); });
+        }
+        if (!allocated_ok && cancelled) {
+            break;
+        }
+        if (!allocated_ok) {
             debug << "Process " << p.id << ": Allocation failed, Name=" << p.name << "\n";
             std::cout << "Process " << p.id << ": Allocation failed, Name=" << p.name << "\n";
             continue;
@@ -330,98 +440,455 @@ void VirtualMemorySimulator::simulate() {
         }
     }
 
-    debug << "Page tables for all active processes:\n";
-    debug << "| " << std::left << std::setw(12) << "Process ID"
-          << " | " << std::setw(12) << "Page Number"
-          << " | " << std::setw(18) << "Virtual Address"
-          << " | " << std::setw(18) << "Physical Frame"
-          << " | " << std::setw(8) << "In RAM" << " |\n";
-    debug << "| " << std::string(12, '-') << " | " << std::string(12, '-')
-          << " | " << std::string(18, '-') << " | " << std::string(18, '-')
-          << " | " << std::string(8, '-') << " |\n";
-    for (const auto& p : processes) {
-        if (p.is_process_stop) continue;
-        auto it = page_tables.find(p.id);
+    if (cancelled) {
+        debug << "Run cancelled during allocation\n";
+        debug.close();
+        return;
+    }
+
+    // Every process that got a page table competes for the CPU.
+    for (size_t i = 0; i < processes.size(); ++i) {
+        if (processes[i].is_process_stop) continue;
+        auto it = page_tables.find(processes[i].id);
         if (it != page_tables.end() && it->second.flag == 1) {
-            json pt_json = it->second.page_table.export_json();
-            for (const auto& entry : pt_json) {
-                debug << "| " << std::left << std::setw(12) << entry["process_id"].get<std::string>()
-                      << " | " << std::right << std::setw(12) << entry["page_number"].get<uint64_t>()
-                      << " | " << std::left << std::setw(18) << entry["virtual_address"].get<std::string>()
-                      << " | " << std::setw(18) << entry["physical_frame"].get<std::string>()
-                      << " | " << std::setw(8) << (entry["in_ram"].get<bool>() ? "1" : "0") << " |\n";
+            scheduler.add_process(processes[i].id, processes[i].priority);
+            scheduled.push_back(i);
+        }
+    }
+
+    if (summary_only) {
+        debug << "Summary-only run: skipping the page table dump\n";
+    } else {
+        ScopedTimer timer(metrics, "debug_dump");
+        debug << "Page tables for all active processes:\n";
+        debug << "| " << std::left << std::setw(12) << "Process ID"
+              << " | " << std::setw(12) << "Page Number"
+              << " | " << std::setw(18) << "Virtual Address"
+              << " | " << std::setw(18) << "Physical Frame"
+              << " | " << std::setw(8) << "In RAM" << " |\n";
+        debug << "| " << std::string(12, '-') << " | " << std::string(12, '-')
+              << " | " << std::string(18, '-') << " | " << std::string(18, '-')
+              << " | " << std::string(8, '-') << " |\n";
+        uint64_t dumped = 0;
+        for (const auto& p : processes) {
+            if (p.is_process_stop || cancelled) continue;
+            auto it = page_tables.find(p.id);
+            if (it != page_tables.end() && it->second.flag == 1) {
+                // Export in PROGRESS_PAGES slices so a cancel is seen without building the whole table first.
+                const PageTable& table = it->second.page_table;
+                for (uint64_t first = 1; first <= table.get_num_pages(); first += PageTable::PROGRESS_PAGES) {
+                    if (checkpoint("dump", dumped, total_pages)) break;
+                    json pt_json = table.export_json(first, PageTable::PROGRESS_PAGES);
+                    for (const auto& entry : pt_json) {
+                        debug << "| " << std::left << std::setw(12) << entry["process_id"].get<std::string>()
+                              << " | " << std::right << std::setw(12) << entry["page_number"].get<uint64_t>()
+                              << " | " << std::left << std::setw(18) << entry["virtual_address"].get<std::string>()
+                              << " | " << std::setw(18) << entry["physical_frame"].get<std::string>()
+                              << " | " << std::setw(8) << (entry["in_ram"].get<bool>() ? "1" : "0") << " |\n";
+                    }
+                    dumped += pt_json.size();
+                }
+            } else {
+                debug << "Process ID=" << p.id << ", Name=" << p.name << ": No active page table\n";
             }
-        } else {
-            debug << "Process ID=" << p.id << ", Name=" << p.name << ": No active page table\n";
         }
     }
 
+    if (cancelled) {
+        debug << "Run cancelled during the page table dump\n";
+        debug.close();
+        return;
+    }
+
+    if (trace_driven) {
+        debug << "Trace-driven run: waiting for trace chunks\n";
+        debug.close();
+        return;
+    }
+
     int simulation_duration = 100;
-    std::uniform_int_distribution<> access_dist(0, 1);
-    std::uniform_int_distribution<uint64_t> va_dist(0, va_max);
+    step(simulation_duration);
+    if (cancelled) {
+        debug << "Run cancelled at tick " << next_tick << "\n";
+        debug.close();
+        return;
+    }
 
-    for (int t = 0; t < simulation_duration; t++) {
-        for (const auto& p : processes) {
-            if (p.is_process_stop) continue;
-            if (access_dist(gen) == 0) continue;
+    debug << "Simulation completed: Total TLB Hits=" << total_hits << ", Total TLB Misses=" << total_misses
+          << ", Total Page Faults=" << total_faults << "\n";
+    if (allocation_type == "Contiguous") {
+        debug << "Frame allocator: " << frame_allocator.free_frames() << " free frames, largest extent "
+              << frame_allocator.largest_free_extent() << ", external fragmentation "
+              << frame_allocator.external_fragmentation() << "\n";
+    }
+    debug.close();
+}
 
-            uint64_t virtual_address = va_dist(gen) % p.size_bytes;
-            uint64_t page_no = virtual_address / page_size_bytes + 1;
-            auto it = page_tables.find(p.id);
-            if (it == page_tables.end() || it->second.flag != 1) continue;
+void VirtualMemorySimulator::simulate_access(const std::string& pid, uint64_t virtual_address, int t) {
+    uint64_t page_no = virtual_address / page_size_bytes + 1;
+    auto it = page_tables.find(pid);
+    if (it == page_tables.end() || it->second.flag != 1) return;
 
-            it->second.last_executed_page = static_cast<int64_t>(page_no);
+    it->second.last_executed_page = static_cast<int64_t>(page_no);
+    int walk_levels = it->second.page_table.get_levels();
+    AccessCost cost;
+    cost.switch_ns = pending_switch_ns;
+    pending_switch_ns = 0.0;
 
-            if (tlb_enabled) {
-                uint64_t frame = tlb_get_frame(p.id, page_no);
-                bool hit = (frame != UINT64_MAX);
-                if (hit) {
-                    total_hits++;
-                } else {
-                    total_misses++;
-                    frame = it->second.page_table.lookup(page_no);
-                    bool in_ram = it->second.page_table.access(virtual_address);
-                    if (in_ram) {
-                        tlb_insert(p.id, page_no, virtual_address, frame, it->second.flag);
-                    }
+    bool walked = true;
+    if (tlb_enabled) {
+        cost.tlb_ns = cost_model.tlb_hit_ns;
+        uint64_t frame = tlb_get_frame(pid, page_no);
+        if (frame != UINT64_MAX) {
+            total_hits++;
+            walked = false;
+        } else {
+            total_misses++;
+        }
+    }
+
+    bool fault = it->second.page_table.access(virtual_address);
+    bool resident = !fault;
+    if (walked) {
+        int table_reads = page_walk_cache.walk(it->second.page_table.get_asid(), virtual_address / page_size_bytes,
+                                               walk_levels, it->second.page_table.get_bits_per_level());
+        metrics.count(METRIC_PAGE_WALKS);
+        metrics.count(METRIC_TABLE_READS, table_reads);
+        cost.walk_ns = table_reads * cost_model.memory_ref_ns;
+    }
+    if (fault) {
+        total_faults++;
+        cost.fault_ns = cost_model.page_fault_ns;
+        uint64_t slot;
+        bool in_ram;
+        if (it->second.page_table.get_entry(page_no, slot, in_ram) && !in_ram) {
+            cost.swap_ns = swap_device.swap_in(slot) * 1000.0;
+            // Bring the page in, evicting one of the process's own pages when RAM is full.
+            uint64_t victim_page = 0;
+            double write_us = 0.0;
+            if (it->second.page_table.swap_in(page_no, available_frames, frame_allocator, swap_device,
+                                              victim_page, write_us) != UINT64_MAX) {
+                resident = true;
+                cost.swap_ns += write_us * 1000.0;
+                if (victim_page != 0) {
+                    tlb_invalidate(pid, victim_page);
                 }
             }
+        }
+    }
+    if (walked && tlb_enabled && resident) {
+        tlb_insert(pid, page_no, virtual_address, it->second.page_table.lookup(page_no), it->second.flag);
+    }
+    cost.memory_ns = cost_model.memory_ref_ns;
+
+    // Waiting on a swap-in blocks the process, so the scheduler may switch away.
+    scheduler.record_access(tlb_enabled && walked, cost.swap_ns > 0);
+
+    accesses_done++;
+    metrics.count(METRIC_ACCESSES);
+    access_cost_total.add(cost);
+    access_latency[pid].add(cost.total());
+
+    tlb_hits.push_back({t, total_hits});
+    tlb_misses.push_back({t, total_misses});
+    double hit_rate = (total_hits + total_misses) > 0 ? (double)total_hits / (total_hits + total_misses) : 0.0;
+    tlb_hit_rate.push_back({t, hit_rate});
+    page_faults.push_back({t, total_faults});
+}
+
+int VirtualMemorySimulator::schedule(int tick) {
+    int switched_from = -1;
+    int task = scheduler.next(tick, switched_from);
+    if (switched_from >= 0) {
+        context_switch(scheduler.process_id(switched_from));
+    }
+    return task;
+}
+
+void VirtualMemorySimulator::context_switch(const std::string& from) {
+    // The incoming process pays for the switch on its first access.
+    pending_switch_ns += scheduler.context_switch_ns();
+    if (tlb_asids) return;
+    // Untagged entries cannot tell address spaces apart, so loading the next
+    // page-table root drops the outgoing process's translations.
+    if (tlb_enabled) {
+        tlb_flush();
+    }
+    page_walk_cache.flush_asid(get_asid(from));
+    tlb_flushes++;
+}
+
+uint64_t VirtualMemorySimulator::step(int ticks) {
+    ScopedTimer timer(metrics, "simulate");
+    // Built-in workload: the scheduled process accesses a random address each tick.
+    std::uniform_int_distribution<uint64_t> va_dist(0, va_max);
+    uint64_t before = accesses_done;
+    int first_tick = next_tick;
+    int end = next_tick + ticks;
+    for (; next_tick < end; next_tick++) {
+        if (checkpoint("simulate", next_tick, end, next_tick == first_tick)) {
+            break;
+        }
+        int task = schedule(next_tick);
+        if (task < 0) continue;
+        const Process& p = processes[scheduled[task]];
+        simulate_access(p.id, va_dist(rng) % p.size_bytes, next_tick);
+    }
+    return accesses_done - before;
+}
+
+uint64_t VirtualMemorySimulator::apply_trace_chunk(const json& chunk) {
+    // addresses is a base64 little-endian uint64 matrix: one row per tick, one column per process.
+    std::vector<std::string> process_ids;
+    for (const auto& pid : chunk.at("processes")) {
+        process_ids.push_back(pid.get<std::string>());
+    }
+    std::vector<uint64_t> addresses;
+    {
+        ScopedTimer timer(metrics, "decode");
+        std::string raw = base64_decode(chunk.at("addresses").get<std::string>());
+        if (process_ids.empty() || raw.size() % (process_ids.size() * sizeof(uint64_t)) != 0) {
+            throw std::runtime_error("Trace chunk size does not match its process list");
+        }
+
+        addresses.resize(raw.size() / sizeof(uint64_t));
+        const unsigned char* bytes = reinterpret_cast<const unsigned char*>(raw.data());
+        for (size_t i = 0; i < addresses.size(); ++i) {
+            const unsigned char* cell = bytes + i * sizeof(uint64_t);
+            uint64_t virtual_address = 0;
+            for (int b = 7; b >= 0; --b) {
+                virtual_address = (virtual_address << 8) | cell[b];
+            }
+            addresses[i] = virtual_address;
+        }
+    }
+    metrics.count(METRIC_TRACE_CHUNKS);
+    return apply_trace(process_ids, addresses.data(), addresses.size() / process_ids.size(), chunk.value("tick", 0));
+}
+
+uint64_t VirtualMemorySimulator::apply_trace(const std::vector<std::string>& process_ids, const uint64_t* addresses,
+                                             size_t rows, int first_tick) {
+    ScopedTimer timer(metrics, "simulate");
+    // addresses is row-major: one row per tick, one column per entry of process_ids.
+    // Each column is that process's access stream in program order. The rows are
+    // queued per process and a process draws its next address only on a tick it
+    // is scheduled, so its stream is never skipped while other processes run.
+    // A process that gets fewer ticks than the chunk has rows falls behind its
+    // stream, so each queue holds at most one chunk: the rest of the column is
+    // dropped and reported as trace_unconsumed instead of piling up.
+    trace_queues.resize(scheduled.size());
+    for (size_t task = 0; task < scheduled.size(); ++task) {
+        for (size_t col = 0; col < process_ids.size(); ++col) {
+            if (process_ids[col] != processes[scheduled[task]].id) continue;
+            std::deque<uint64_t>& queue = trace_queues[task];
+            size_t taken = queue.size() < rows ? rows - queue.size() : 0;
+            for (size_t row = 0; row < taken; ++row) {
+                queue.push_back(addresses[row * process_ids.size() + col]);
+            }
+            trace_dropped += rows - taken;
+            break;
+        }
+    }
+
+    uint64_t applied = 0;
+    for (size_t row = 0; row < rows; ++row) {
+        if (row % 256 == 0 && checkpoint("simulate", first_tick + row, trace_ticks, row == 0 && first_tick == 0)) {
+            break;
+        }
+        int tick = first_tick + static_cast<int>(row);
+        int task = schedule(tick);
+        if (task < 0 || trace_queues[task].empty()) continue;
+        const Process& p = processes[scheduled[task]];
+        uint64_t virtual_address = trace_queues[task].front();
+        trace_queues[task].pop_front();
+        simulate_access(p.id, virtual_address % p.size_bytes, tick);
+        applied++;
+    }
+    next_tick = std::max(next_tick, first_tick + static_cast<int>(rows));
+
+    std::ofstream debug("debug.txt", std::ios::app);
+    debug << "Trace chunk at tick " << first_tick << ": " << rows << " ticks, " << applied << " accesses\n";
+    debug.close();
+    return applied;
+}
+
+bool VirtualMemorySimulator::translate(const std::string& pid, uint64_t virtual_address, uint64_t& physical_address) const {
+    // Page-table lookup only: no TLB, fault or cost accounting.
+    auto it = page_tables.find(pid);
+    if (it == page_tables.end() || it->second.flag != 1) return false;
+    uint64_t frame_number = 0;
+    bool in_ram = false;
+    if (!it->second.page_table.get_entry(virtual_address / page_size_bytes + 1, frame_number, in_ram) || !in_ram) {
+        return false;
+    }
+    physical_address = frame_number * page_size_bytes + virtual_address % page_size_bytes;
+    return true;
+}
+
+json VirtualMemorySimulator::counters() const {
+    json counters;
+    counters["tick"] = next_tick;
+    counters["accesses"] = accesses_done;
+    counters["total_hits"] = total_hits;
+    counters["total_misses"] = total_misses;
+    counters["total_faults"] = total_faults;
+    counters["context_switches"] = scheduler.context_switches();
+    counters["average_access_ns"] = accesses_done > 0 ? access_cost_total.total() / accesses_done : 0.0;
+    return counters;
+}
+
+const PageTable* VirtualMemorySimulator::get_page_table(const std::string& pid) const {
+    auto it = page_tables.find(pid);
+    if (it == page_tables.end() || it->second.flag != 1) return nullptr;
+    return &it->second.page_table;
+}
+
+uint64_t VirtualMemorySimulator::get_page_size_bytes() const {
+    return page_size_bytes;
+}
 
-            bool fault = it->second.page_table.access(virtual_address);
-            if (fault) total_faults++;
+bool VirtualMemorySimulator::is_trace_driven() const {
+    return trace_driven;
+}
+
+void VirtualMemorySimulator::begin_run() {
+    cancelled = false;
+    accesses_done = 0;
+    progress_done = 0;
+    progress_total = 0;
+    progress_phase = "allocate";
+    run_start = std::chrono::steady_clock::now();
+    last_progress = run_start;
+    {
+        std::lock_guard<std::mutex> lock(progress_mutex);
+        last_published = progress_snapshot();
+    }
+    metrics.clear();
+    frames_baseline = frame_table.assignments();
+    if (socket_handler) {
+        socket_baseline = socket_handler->get_stats();
+    }
+}
+
+json VirtualMemorySimulator::progress_snapshot() const {
+    double elapsed = std::chrono::duration<double>(std::chrono::steady_clock::now() - run_start).count();
+    json progress;
+    progress["phase"] = progress_phase;
+    progress["done"] = progress_done;
+    progress["total"] = progress_total;
+    progress["accesses"] = accesses_done;
+    progress["accesses_per_second"] = elapsed > 0 ? accesses_done / elapsed : 0.0;
+    progress["elapsed_s"] = elapsed;
+    progress["total_hits"] = total_hits;
+    progress["total_misses"] = total_misses;
+    progress["total_faults"] = total_faults;
+    return progress;
+}
+
+bool VirtualMemorySimulator::checkpoint(const std::string& phase, uint64_t done, uint64_t total, bool force) {
+    progress_phase = phase;
+    progress_done = done;
+    progress_total = total;
+    if (cancelled) return true;
+
+    auto now = std::chrono::steady_clock::now();
+    if (!force && now - last_progress < progress_interval) return false;
+    last_progress = now;
+
+    json event = progress_snapshot();
+    {
+        std::lock_guard<std::mutex> lock(progress_mutex);
+        last_published = event;
+    }
+    // In-process callers have no socket; they poll published_progress() from another thread.
+    if (!socket_handler) return false;
+
+    event["event"] = "progress";
+    if (!socket_handler->write(event.dump())) {
+        // The client has gone (or gave up and reconnected), so nobody will read this run.
+        cancelled = true;
+        std::ofstream debug("debug.txt", std::ios::app);
+        debug << "Client gone during " << phase << "; abandoning the run\n";
+        debug.close();
+        return true;
+    }
 
-            tlb_hits.push_back({t, total_hits});
-            tlb_misses.push_back({t, total_misses});
-            double hit_rate = (total_hits + total_misses) > 0 ? (double)total_hits / (total_hits + total_misses) : 0.0;
-            tlb_hit_rate.push_back({t, hit_rate});
-            page_faults.push_back({t, total_faults});
+    // Clients wait for a reply before sending the next request, so the only
+    // message that can arrive mid-run is a cancel.
+    std::string message;
+    while (socket_handler->poll_message(message)) {
+        try {
+            if (json::parse(message).value("command", std::string()) == "cancel") {
+                cancelled = true;
+            }
+        } catch (const json::parse_error&) {
+        }
+        if (!cancelled) {
+            std::ofstream debug("debug.txt", std::ios::app);
+            debug << "Ignoring message received mid-run: " << message.substr(0, 50) << "...\n";
+            debug.close();
         }
     }
+    if (cancelled) {
+        std::ofstream debug("debug.txt", std::ios::app);
+        debug << "Cancel requested during " << phase << " (" << done << "/" << total << ")\n";
+        debug.close();
+    }
+    return cancelled;
+}
+
+bool VirtualMemorySimulator::is_cancelled() const {
+    return cancelled;
+}
+
+void VirtualMemorySimulator::request_cancel() {
+    // Safe from any thread: the running call stops at its next checkpoint.
+    cancelled = true;
+}
+
+json VirtualMemorySimulator::published_progress() const {
+    // The last progress checkpoint, readable while another thread runs the simulation.
+    std::lock_guard<std::mutex> lock(progress_mutex);
+    return last_published;
+}
+
+std::vector<std::string> VirtualMemorySimulator::scheduled_ids() const {
+    std::vector<std::string> ids;
+    for (size_t index : scheduled) {
+        ids.push_back(processes[index].id);
+    }
+    return ids;
+}
 
+json VirtualMemorySimulator::export_results() {
+    ScopedTimer timer(metrics, "export");
+    // Summary-only runs drop the per-access series, per-page tables and the frame map.
+    // Otherwise, with shared memory enabled, those bulk arrays go to the region and
+    // the JSON carries only their block descriptors.
+    SharedMemoryRegion* bulk = use_shared_memory && !summary_only ? &shared_memory : nullptr;
+    if (bulk) {
+        bulk->clear();
+    }
     if (!tlb_enabled) {
+        // Without a TLB every simulated tick reports zero hits and misses, in both
+        // the built-in and the trace-driven mode.
         tlb_hits.clear();
         tlb_misses.clear();
         tlb_hit_rate.clear();
-        for (int t = 0; t < simulation_duration; t++) {
+        for (int t = 0; t < next_tick; t++) {
             tlb_hits.push_back({t, 0});
             tlb_misses.push_back({t, 0});
             tlb_hit_rate.push_back({t, 0.0});
         }
     }
-
-    debug << "Simulation completed: Total TLB Hits=" << total_hits << ", Total TLB Misses=" << total_misses
-          << ", Total Page Faults=" << total_faults << "\n";
-    debug.close();
-}
-
-json VirtualMemorySimulator::export_results() {
     json result;
-    result["tlb_stats"]["hits"] = tlb_hits;
-    result["tlb_stats"]["misses"] = tlb_misses;
-    result["tlb_stats"]["hit_rate"] = tlb_hit_rate;
+    result["summary_only"] = summary_only;
+    result["tlb_stats"]["hits"] = summary_only ? json::array() : series_json(bulk, tlb_hits, "=i4");
+    result["tlb_stats"]["misses"] = summary_only ? json::array() : series_json(bulk, tlb_misses, "=i4");
+    result["tlb_stats"]["hit_rate"] = summary_only ? json::array() : series_json(bulk, tlb_hit_rate, "=f8");
     result["tlb_stats"]["total_hits"] = total_hits;
     result["tlb_stats"]["total_misses"] = total_misses;
-    result["page_faults"] = page_faults;
+    result["page_faults"] = summary_only ? json::array() : series_json(bulk, page_faults, "=i4");
     result["total_faults"] = total_faults;
 
     if (ram_size_bytes == 0) {
@@ -433,12 +900,81 @@ json VirtualMemorySimulator::export_results() {
             json pt_entry;
             pt_entry["process_id"] = pt.first;
             pt_entry["base_address"] = pt.second.top_level_frame;
-            pt_entry["table"] = pt.second.page_table.export_json();
+            if (!summary_only) {
+                const PageTable& table = pt.second.page_table;
+                json block;
+                uint8_t* out = bulk ? bulk->allocate(table.get_num_pages() * sizeof(uint64_t), "=u8", table.get_num_pages(), block) : nullptr;
+                if (out) {
+                    table.export_packed(reinterpret_cast<uint64_t*>(out));
+                    pt_entry["entries"] = block;
+                } else {
+                    pt_entry["table"] = table.export_json();
+                }
+            }
             pt_entry["flag"] = pt.second.flag;
             pt_entry["last_executed_page"] = pt.second.last_executed_page;
             pts.push_back(pt_entry);
         }
         result["page_tables"] = pts;
+        if (allocation_type == "Contiguous") {
+            result["allocator"] = frame_allocator.export_json();
+        }
+        result["frame_table"] = frame_table.export_json(asid_names);
+        if (!summary_only) {
+            json block;
+            uint8_t* out = bulk ? bulk->allocate(frame_table.size() * sizeof(uint16_t), "=u2", frame_table.size(), block) : nullptr;
+            if (out) {
+                frame_table.pack_map(reinterpret_cast<uint16_t*>(out));
+                json frame_map;
+                frame_map["encoding"] = "shm";
+                frame_map["frames"] = frame_table.size();
+                frame_map["ram_frames"] = frame_table.ram_frames();
+                frame_map["swap_slots"] = frame_table.swap_slots();
+                frame_map["data"] = block;
+                result["frame_map"] = frame_map;
+            } else {
+                result["frame_map"] = frame_table.export_map();
+            }
+        }
+        if (swap_device.total_slots() > 0) {
+            result["swap_stats"] = swap_device.export_json();
+        }
+
+        uint64_t accesses = 0;
+        json per_process = json::array();
+        for (const auto& entry : access_latency) {
+            json stats = entry.second.export_json();
+            stats["process_id"] = entry.first;
+            per_process.push_back(stats);
+            accesses += entry.second.count();
+        }
+        json access_time;
+        access_time["cost_model"] = cost_model.to_json();
+        access_time["accesses"] = accesses;
+        access_time["average_ns"] = accesses > 0 ? access_cost_total.total() / accesses : 0.0;
+        access_time["breakdown_ns"] = access_cost_total.to_json();
+        access_time["per_process"] = per_process;
+        result["access_time"] = access_time;
+        result["page_walk_cache"] = page_walk_cache.export_json();
+        json scheduling = scheduler.export_json();
+        scheduling["tlb_asids"] = tlb_asids;
+        scheduling["tlb_flushes"] = tlb_flushes;
+        result["scheduler"] = scheduling;
+    }
+    if (trace_driven) {
+        // Streamed addresses that no scheduled tick issued: dropped from full queues or left queued at the end.
+        uint64_t unconsumed = trace_dropped;
+        for (const auto& queue : trace_queues) {
+            unconsumed += queue.size();
+        }
+        result["trace_unconsumed"] = unconsumed;
+        std::ofstream debug("debug.txt", std::ios::app);
+        debug << "Trace ended with " << unconsumed << " unconsumed addresses\n";
+        debug.close();
+    }
+
+    if (bulk && bulk->is_open()) {
+        result["shared_memory"] = bulk->describe();
     }
 
     std::ofstream debug("debug.txt", std::ios::app);
@@ -448,6 +984,42 @@ json VirtualMemorySimulator::export_results() {
     return result;
 }
 
+std::string VirtualMemorySimulator::serialize_results(const json& result) {
+    // "metrics" is appended after dumping the rest so it can include the dump itself.
+    std::string text;
+    {
+        ScopedTimer timer(metrics, "serialize");
+        text = result.dump();
+    }
+    if (text.size() < 2 || text.back() != '}') {
+        return text;
+    }
+    text.pop_back();
+    text += (text.size() > 1 ? ",\"metrics\":" : "\"metrics\":") + metrics_snapshot().dump() + "}";
+    return text;
+}
+
+json VirtualMemorySimulator::metrics_snapshot() const {
+    json snapshot = metrics.export_json();
+    snapshot["counters"]["frames_allocated"] = frame_table.assignments() - frames_baseline;
+    snapshot["counters"]["context_switches"] = scheduler.context_switches();
+    if (socket_handler) {
+        // The results message is written after this snapshot, so it is not included here;
+        // the client sees that transfer as its receive time.
+        const SocketStats& stats = socket_handler->get_stats();
+        snapshot["counters"]["bytes_sent"] = stats.bytes_sent - socket_baseline.bytes_sent;
+        snapshot["counters"]["bytes_received"] = stats.bytes_received - socket_baseline.bytes_received;
+        snapshot["counters"]["messages_sent"] = stats.messages_sent - socket_baseline.messages_sent;
+        snapshot["phases"]["send"] = {{"seconds", stats.send_seconds - socket_baseline.send_seconds},
+                                      {"calls", stats.messages_sent - socket_baseline.messages_sent}};
+    }
+    return snapshot;
+}
+
+Metrics& VirtualMemorySimulator::get_metrics() {
+    return metrics;
+}
+
 void VirtualMemorySimulator::reset() {
     processes.clear();
     tlb_hits.clear();
@@ -460,15 +1032,46 @@ void VirtualMemorySimulator::reset() {
     total_hits = 0;
     total_misses = 0;
     total_faults = 0;
+    accesses_done = 0;
+    next_tick = 0;
+    access_cost_total = AccessCost();
+    access_latency.clear();
+    page_walk_cache.clear();
+    scheduler.clear();
+    scheduled.clear();
+    trace_queues.clear();
+    trace_dropped = 0;
+    tlb_flushes = 0;
+    pending_switch_ns = 0.0;
     available_frames.clear();
+    frame_allocator.clear();
+    frame_table.clear();
+    asids.clear();
+    asid_names.clear();
     available_table_frames.clear();
-    available_swap_frames.clear();
+    swap_device.clear();
+    cancelled = false;
 
     std::ofstream debug("debug.txt", std::ios::app);
     debug << "Simulator reset\n";
     debug.close();
 }
 
+uint32_t VirtualMemorySimulator::get_asid(const std::string& pid) {
+    auto it = asids.find(pid);
+    if (it != asids.end()) {
+        return it->second;
+    }
+    uint32_t asid = static_cast<uint32_t>(asids.size()) + 1;
+    asids[pid] = asid;
+    asid_names[asid] = pid;
+    return asid;
+}
+
+const FrameTable& VirtualMemorySimulator::get_frame_table() const {
+    return frame_table;
+}
+
 std::string VirtualMemorySimulator::read_socket() {
     return socket_handler->read();
 }
@@ -504,81 +1107,3 @@ uint64_t VirtualMemorySimulator::get_frame_number(const std::string& pid, uint64
     }
     return it->second.page_table.lookup(page_number);
 }
-
-int main() {
-    std::ofstream debug("debug.txt", std::ios::out);
-    debug << "Starting Virtual Memory Simulator\n";
-    debug.close();
-
-    SocketHandler* socket_handler = nullptr;
-    try {
-        socket_handler = new SocketHandler();
-        VirtualMemorySimulator sim(socket_handler);
-
-        while (true) {
-            if (!sim.accept_connection()) {
-                std::cerr << "Connection failed, retrying..." << std::endl;
-                Sleep(1000);
-                continue;
-            }
-
-            while (true) {
-                std::string config_str = sim.read_socket();
-                if (config_str.empty()) {
-                    break;
-                }
-
-                json settings;
-                try {
-                    settings = json::parse(config_str);
-                    std::ofstream debug("debug.txt", std::ios::app);
-                    debug << "Parsed JSON settings: " << settings.dump().substr(0, 50) << "...\n";
-                    debug.close();
-                    std::cout << "Parsed JSON settings: " << settings.dump().substr(0, 50) << "..." << std::endl;
-                } catch (const json::parse_error& e) {
-                    std::ofstream debug("debug.txt", std::ios::app);
-                    debug << "JSON parse error: " << e.what() << "\n";
-                    debug.close();
-                    std::cerr << "JSON parse error: " << e.what() << "\n";
-                    continue;
-                }
-
-                try {
-                    sim.load_settings(settings);
-                    sim.simulate();
-                    json result = sim.export_results();
-                    std::string result_str = result.dump();
-                    if (!sim.write_socket(result_str)) {
-                        std::ofstream debug("debug.txt", std::ios::app);
-                        debug << "Failed to send results, client may have disconnected\n";
-                        debug.close();
-                        std::cerr << "Failed to send results, client may have disconnected..." << std::endl;
-                        break;
-                    } else {
-                        std::ofstream debug("debug.txt", std::ios::app);
-                        debug << "Simulation completed and results sent\n";
-                        debug.close();
-                        std::cout << "Simulation completed and results sent" << std::endl;
-                    }
-                } catch (const std::exception& e) {
-                    std::ofstream debug("debug.txt", std::ios::app);
-                    debug << "Simulation error: " << e.what() << "\n";
-                    debug.close();
-                    std::cerr << "Simulation error: " << e.what() << "\n";
-                }
-
-                sim.reset();
-            }
-        }
-    } catch (const std::exception& e) {
-        std::ofstream debug("debug.txt", std::ios::app);
-        debug << "Fatal error: " << e.what() << "\n";
-        debug.close();
-        std::cerr << "Fatal error: " << e.what() << "\n";
-        if (socket_handler) {
-            delete socket_handler;
-        }
-        return 1;
-    }
-    return 0;
-}
\ No newline at end of file
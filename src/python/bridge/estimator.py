@@ -0,0 +1,215 @@
+"""Pre-flight estimates of what a configuration will cost the simulator.
+
+The sizing rules mirror the engine: page-table sizes, the 1%-of-RAM check,
+the RAM + swap capacity check and the virtual-address check from
+``VirtualMemorySimulator::simulate()``, plus the host-side structures the
+engine keeps (frame table, free-frame list, page-table vectors, per-access
+time series).
+With ``shared_memory`` set, the bulk arrays are counted as region bytes
+rather than socket payload.
+The per-page and per-access timings are rough constants measured on a release
+build; they are meant to flag runs that will take minutes, not to predict seconds.
+"""
+
+import json
+import math
+import os
+
+from workload.trace import BYTES_PER_GB, DEFAULT_TICKS
+
+ENTRY_SIZES = {"16-bit": 2, "32-bit": 4, "64-bit": 8}
+VA_BITS = {"16-bit": 16, "32-bit": 32, "64-bit": 64}
+
+DEFAULT_LIMITS = {
+    "max_simulator_rss_mb": 2048,
+    "max_runtime_s": 120,
+    "summary_only_payload_mb": 32,  # Full results above this are downgraded to summary-only
+}
+
+BASE_RSS_BYTES = 8 * 1048576
+FRAME_TABLE_BYTES_PER_FRAME = 10
+PAGE_ENTRY_BYTES = 16             # std::pair<uint64_t, bool> per page-table entry
+RESULT_TREE_BYTES_PER_PAGE = 480  # nlohmann::json object built for each exported page
+SERIES_BYTES_PER_ACCESS = 40      # four (tick, value) series entries per access
+PAYLOAD_BYTES_PER_ACCESS = 60
+PAYLOAD_BYTES_PER_PAGE = 110      # exported page entry without the hex digits
+SUMMARY_PAYLOAD_BYTES = 8192
+SUMMARY_PAYLOAD_BYTES_PER_PROCESS = 1024
+SHARED_BYTES_PER_PAGE = 8         # packed page-table word
+SHARED_BYTES_PER_ACCESS = 44      # four (int32 tick, value) series records
+SHARED_BYTES_PER_FRAME = 2        # packed frame-map entry
+
+FRAME_SETUP_SECONDS = 0.07e-6     # free-frame list entry per RAM frame
+PAGE_ALLOCATE_SECONDS = 0.5e-6    # frame draw, frame-table and page-table update
+PAGE_DUMP_SECONDS = 10.5e-6       # debug.txt page table dump, skipped for summary-only runs
+PAGE_EXPORT_SECONDS = 16e-6       # JSON page entry export and dump, when not in shared memory
+ACCESS_SECONDS = 40e-6            # each access appends TLB and fault lines to debug.txt
+PAYLOAD_SECONDS_PER_MB = 0.05
+
+
+def load_limits(env_file_path):
+    """Default limits overridden by the ``limits`` object in the environment file."""
+    limits = dict(DEFAULT_LIMITS)
+    if env_file_path and os.path.exists(env_file_path):
+        try:
+            with open(env_file_path, "r") as f:
+                limits.update(json.load(f).get("limits", {}))
+        except (OSError, ValueError) as e:
+            print(f"Could not read limits from {env_file_path}: {e}")
+    return limits
+
+
+def rom_size_bytes(rom_size):
+    # The engine reads the leading number of "32 GB" / "1 TB" as gigabytes.
+    try:
+        return int(float(rom_size.split()[0]) * BYTES_PER_GB)
+    except (ValueError, IndexError):
+        return 0
+
+
+def page_table_levels(num_pages, page_size_bytes, entry_size):
+    # Same rounding as the table-size check in simulate().
+    return max(1, math.ceil(math.log2(num_pages) / math.log2(page_size_bytes // entry_size)))
+
+
+def estimate(settings, processes, ticks=DEFAULT_TICKS):
+    """Predict memory, payload and runtime for one run of ``settings`` with ``processes``."""
+    ram_bytes = settings["ram_size_gb"] * BYTES_PER_GB
+    page_size_bytes = settings["page_size_kb"] * 1024
+    entry_size = ENTRY_SIZES.get(settings["virtual_address_size"], 8)
+    va_limit = 1 << VA_BITS.get(settings["virtual_address_size"], 64)
+    swap_bytes = rom_size_bytes(settings["rom_size"]) * int(settings["swap_percent"]) // 100
+    ram_frames = ram_bytes // page_size_bytes
+    swap_slots = swap_bytes // page_size_bytes
+    entries_per_table = page_size_bytes // entry_size
+
+    active = [proc for proc in processes if not proc["is_process_stop"]]
+    process_bytes = sum(proc["size_gb"] * BYTES_PER_GB for proc in active)
+    page_table_bytes = 0
+    host_table_bytes = 0
+    pages = 0
+    oversized = []
+    for proc in active:
+        num_pages = -(-proc["size_gb"] * BYTES_PER_GB // page_size_bytes)
+        if (num_pages - 1) * page_size_bytes >= va_limit:
+            oversized.append(proc["id"])
+            continue
+        levels = page_table_levels(num_pages, page_size_bytes, entry_size)
+        table_bytes = num_pages * entry_size
+        if levels > 1:
+            table_bytes += entries_per_table * entry_size
+            if levels > 2:
+                table_bytes += entries_per_table * entries_per_table * entry_size
+        page_table_bytes += table_bytes
+        leaf_tables = -(-num_pages // entries_per_table)
+        host_table_bytes += leaf_tables * entries_per_table * PAGE_ENTRY_BYTES
+        pages += num_pages
+
+    # One CPU: the scheduler lets a single process issue the access at each tick.
+    accesses = ticks if len(active) > len(oversized) else 0
+    hex_digits = math.ceil(math.log2(ram_bytes) / 4)
+    if settings["allocation_type"] == "Contiguous":
+        frame_map_bytes = 1024 * max(1, len(active))
+        free_list_bytes = 0
+    else:
+        frame_map_bytes = (ram_frames + swap_slots) * 2 * 4 // 3
+        free_list_bytes = ram_frames * 8
+    summary_payload_bytes = SUMMARY_PAYLOAD_BYTES + SUMMARY_PAYLOAD_BYTES_PER_PROCESS * len(active)
+    if settings.get("shared_memory"):
+        # Bulk arrays go to the shared-memory region; the socket carries only the summary.
+        shared_bytes = (
+            pages * SHARED_BYTES_PER_PAGE
+            + accesses * SHARED_BYTES_PER_ACCESS
+            + (ram_frames + swap_slots) * SHARED_BYTES_PER_FRAME
+        )
+        payload_bytes = summary_payload_bytes
+        result_tree_bytes = 0
+    else:
+        shared_bytes = 0
+        payload_bytes = (
+            pages * (PAYLOAD_BYTES_PER_PAGE + hex_digits)
+            + accesses * PAYLOAD_BYTES_PER_ACCESS
+            + frame_map_bytes
+            + SUMMARY_PAYLOAD_BYTES
+        )
+        result_tree_bytes = pages * RESULT_TREE_BYTES_PER_PAGE
+
+    engine_bytes = (
+        BASE_RSS_BYTES
+        + (ram_frames + swap_slots) * FRAME_TABLE_BYTES_PER_FRAME
+        + free_list_bytes
+        + ram_frames // 100 * 8
+        + host_table_bytes
+        + accesses * SERIES_BYTES_PER_ACCESS
+    )
+    simulator_rss_bytes = engine_bytes + result_tree_bytes + payload_bytes + shared_bytes
+    summary_rss_bytes = engine_bytes + summary_payload_bytes
+
+    setup_seconds = ram_frames * FRAME_SETUP_SECONDS if settings["allocation_type"] != "Contiguous" else 0.0
+    allocate_seconds = setup_seconds + pages * PAGE_ALLOCATE_SECONDS + accesses * ACCESS_SECONDS
+    page_seconds = PAGE_DUMP_SECONDS + (0.0 if settings.get("shared_memory") else PAGE_EXPORT_SECONDS)
+    return {
+        "process_bytes": process_bytes,
+        "capacity_bytes": int(ram_bytes * 0.99) + swap_bytes,
+        "page_table_bytes": page_table_bytes,
+        "page_table_limit_bytes": ram_bytes // 100,
+        "oversized_processes": oversized,
+        "pages": pages,
+        "accesses": accesses,
+        "simulator_rss_bytes": simulator_rss_bytes,
+        "summary_rss_bytes": summary_rss_bytes,
+        "payload_bytes": payload_bytes,
+        "shared_memory_bytes": shared_bytes,
+        "summary_payload_bytes": summary_payload_bytes,
+        "runtime_seconds": allocate_seconds + pages * page_seconds + payload_bytes / 1048576 * PAYLOAD_SECONDS_PER_MB,
+        "summary_runtime_seconds": allocate_seconds,
+    }
+
+
+def admit(estimate, limits):
+    """Return ``(decision, reasons)`` where decision is "accept", "summary_only" or "reject"."""
+    reasons = []
+    if estimate["process_bytes"] > estimate["capacity_bytes"]:
+        reasons.append(
+            f"processes need {format_bytes(estimate['process_bytes'])}, "
+            f"RAM + swap holds {format_bytes(estimate['capacity_bytes'])}"
+        )
+    if estimate["page_table_bytes"] > estimate["page_table_limit_bytes"]:
+        reasons.append(
+            f"page tables need {format_bytes(estimate['page_table_bytes'])}, "
+            f"limit is 1% of RAM ({format_bytes(estimate['page_table_limit_bytes'])})"
+        )
+    if estimate["oversized_processes"]:
+        reasons.append(f"processes {', '.join(estimate['oversized_processes'])} exceed the virtual address space")
+    if reasons:
+        return "reject", reasons
+
+    max_rss = limits["max_simulator_rss_mb"] * 1048576
+    max_full_payload = limits["summary_only_payload_mb"] * 1048576
+    full_fits = (
+        estimate["simulator_rss_bytes"] <= max_rss
+        and estimate["payload_bytes"] <= max_full_payload
+        and estimate["runtime_seconds"] <= limits["max_runtime_s"]
+    )
+    if full_fits:
+        return "accept", []
+
+    # The summary payload is a few KB, so only memory and runtime can rule it out.
+    summary_fits = (
+        estimate["summary_rss_bytes"] <= max_rss
+        and estimate["summary_runtime_seconds"] <= limits["max_runtime_s"]
+    )
+    if estimate["simulator_rss_bytes"] > max_rss:
+        reasons.append(f"simulator memory ~{format_bytes(estimate['simulator_rss_bytes'])}")
+    if estimate["payload_bytes"] > max_full_payload:
+        reasons.append(f"results ~{format_bytes(estimate['payload_bytes'])}")
+    if estimate["runtime_seconds"] > limits["max_runtime_s"]:
+        reasons.append(f"runtime ~{estimate['runtime_seconds']:.0f} s")
+    return ("summary_only" if summary_fits else "reject"), reasons
+
+
+def format_bytes(value):
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
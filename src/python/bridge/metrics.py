@@ -0,0 +1,176 @@
+"""Run metrics: the engine's ``metrics`` section plus the client's own timings.
+
+Every results document carries ``metrics`` with per-phase wall time
+(``{"phases": {name: {"seconds", "calls"}}}``), event counters and the
+engine's peak RSS. ``MetricsCollector`` adds client-side phases (waiting for
+results, ``json.loads``, rendering), keeps cumulative totals plus a bounded
+per-run history, and writes them as a Prometheus text file (for the
+node_exporter textfile collector) or as CSV.
+"""
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+PROMETHEUS_PREFIX = "vmsim"
+DEFAULT_HISTORY = 1000
+DEFAULT_CONFIG = {"prometheus_file": None, "csv_file": None}
+
+
+def load_metrics_config(env_file_path):
+    """Export paths from the ``metrics`` object in the environment file, relative to that file."""
+    config = dict(DEFAULT_CONFIG)
+    if env_file_path and os.path.exists(env_file_path):
+        try:
+            with open(env_file_path, "r") as f:
+                config.update(json.load(f).get("metrics", {}))
+        except (OSError, ValueError) as e:
+            print(f"Could not read metrics settings from {env_file_path}: {e}")
+    base = os.path.dirname(os.path.abspath(env_file_path)) if env_file_path else os.getcwd()
+    for key in DEFAULT_CONFIG:
+        if config.get(key):
+            config[key] = os.path.join(base, config[key])
+    return config
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def run_labels(settings, process_count, results=None, status="ok", in_process=False):
+    """CSV labels for one run. ``results`` is None when the run produced no reply."""
+    return {
+        "status": status,
+        "ram_size_gb": settings["ram_size_gb"],
+        "page_size_kb": settings["page_size_kb"],
+        "tlb_enabled": settings["tlb_enabled"],
+        "allocation_type": settings["allocation_type"],
+        "scheduler": settings["scheduler"]["policy"],
+        "processes": process_count,
+        "summary_only": bool((results or {}).get("summary_only")),
+        "in_process": in_process,
+    }
+
+
+class MetricsCollector:
+    """Aggregates run metrics across runs.
+
+    Time client-side work with ``with collector.phase("name"):`` during a run,
+    then call ``record(results)`` once it ends; that closes the run. A cancelled
+    or failed run is recorded too, with its status reply (or None) and a
+    ``status`` label.
+    """
+
+    def __init__(self, prometheus_file=None, csv_file=None, history=DEFAULT_HISTORY):
+        self.prometheus_file = prometheus_file
+        self.csv_file = csv_file
+        self.runs = deque(maxlen=history)
+        self.run_count = 0
+        self.status_counts = {}   # run status ("ok", "cancelled", "error", ...) -> runs
+        self.phase_totals = {}    # (side, phase) -> [seconds, calls]
+        self.counter_totals = {}
+        self.peak_rss_bytes = 0
+        self.client_phases = {}
+
+    def start_run(self):
+        """Drop client timings left over from a run that was cancelled or failed."""
+        self.client_phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_client_time(name, time.perf_counter() - start)
+
+    def add_client_time(self, name, seconds):
+        entry = self.client_phases.setdefault(name, {"seconds": 0.0, "calls": 0})
+        entry["seconds"] += seconds
+        entry["calls"] += 1
+
+    def record(self, results, labels=None):
+        """Fold one run into the totals and history; returns its flat row."""
+        engine = (results or {}).get("metrics") or {}
+        row = {"timestamp": round(time.time(), 3)}
+        row.update(labels or {})
+        row["engine_wall_seconds"] = engine.get("wall_seconds", 0.0)
+        for side, phases in (("engine", engine.get("phases", {})), ("client", self.client_phases)):
+            for name, stat in phases.items():
+                row[f"{side}_{name}_seconds"] = stat["seconds"]
+                total = self.phase_totals.setdefault((side, name), [0.0, 0])
+                total[0] += stat["seconds"]
+                total[1] += stat["calls"]
+        for name, value in engine.get("counters", {}).items():
+            row[name] = value
+            self.counter_totals[name] = self.counter_totals.get(name, 0) + value
+        row["peak_rss_bytes"] = engine.get("peak_rss_bytes", 0)
+        self.peak_rss_bytes = max(self.peak_rss_bytes, row["peak_rss_bytes"])
+
+        self.runs.append(row)
+        self.run_count += 1
+        status = row.get("status", "ok")
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self.client_phases = {}
+        return row
+
+    def prometheus_text(self):
+        lines = [
+            f"# HELP {PROMETHEUS_PREFIX}_runs_total Simulation runs recorded.",
+            f"# TYPE {PROMETHEUS_PREFIX}_runs_total counter",
+            f"{PROMETHEUS_PREFIX}_runs_total {self.run_count}",
+            f"# HELP {PROMETHEUS_PREFIX}_run_outcomes_total Simulation runs recorded, by final status.",
+            f"# TYPE {PROMETHEUS_PREFIX}_run_outcomes_total counter",
+        ]
+        for status, count in sorted(self.status_counts.items()):
+            lines.append(f'{PROMETHEUS_PREFIX}_run_outcomes_total{{status="{_label_value(status)}"}} {count}')
+        lines += [
+            f"# HELP {PROMETHEUS_PREFIX}_phase_seconds Wall time per phase, engine and client side.",
+            f"# TYPE {PROMETHEUS_PREFIX}_phase_seconds summary",
+        ]
+        for (side, name), (seconds, calls) in sorted(self.phase_totals.items()):
+            labels = f'side="{_label_value(side)}",phase="{_label_value(name)}"'
+            lines.append(f"{PROMETHEUS_PREFIX}_phase_seconds_sum{{{labels}}} {seconds:.9g}")
+            lines.append(f"{PROMETHEUS_PREFIX}_phase_seconds_count{{{labels}}} {calls}")
+        for name, value in sorted(self.counter_totals.items()):
+            metric = f"{PROMETHEUS_PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        lines.extend([
+            f"# HELP {PROMETHEUS_PREFIX}_peak_rss_bytes Highest engine peak RSS seen in any run.",
+            f"# TYPE {PROMETHEUS_PREFIX}_peak_rss_bytes gauge",
+            f"{PROMETHEUS_PREFIX}_peak_rss_bytes {self.peak_rss_bytes}",
+        ])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        # Write then rename, so a scraper never reads a half-written file.
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(temp_path, path)
+
+    def write_csv(self, path):
+        """One row per run in the history; columns are the union over those runs."""
+        fieldnames = []
+        for row in self.runs:
+            fieldnames.extend(key for key in row if key not in fieldnames)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(self.runs)
+        os.replace(temp_path, path)
+
+    def export(self):
+        """Write whichever files are configured; failures are reported, not raised."""
+        for path, write in ((self.prometheus_file, self.write_prometheus), (self.csv_file, self.write_csv)):
+            if not path:
+                continue
+            try:
+                write(path)
+            except OSError as e:
+                print(f"Could not write metrics to {path}: {e}")
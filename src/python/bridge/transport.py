@@ -0,0 +1,134 @@
+"""Client side of the simulator transport.
+
+The control channel is newline-delimited JSON over loopback TCP on Windows and
+over a Unix-domain socket elsewhere. Bulk result arrays (time series, packed
+page tables, the frame map) arrive through a named shared-memory region; the
+JSON only carries ``{"shm": {"offset", "length", "dtype", "count"}}`` blocks,
+which ``SharedResults.resolve`` turns into NumPy arrays over the mapping.
+
+When the ``vmsim_core`` extension has been built (``make python-extension``)
+the simulator runs in-process instead and none of the above is needed;
+``vmsim_core`` is ``None`` otherwise.
+"""
+
+import os
+import socket
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+try:
+    from . import vmsim_core
+except ImportError:
+    vmsim_core = None
+
+TCP_ADDRESS = ("127.0.0.1", 12345)
+DEFAULT_SOCKET_PATH = "/tmp/virtual_memory_simulator.sock"
+USE_UNIX_SOCKET = os.name != "nt" and hasattr(socket, "AF_UNIX")
+
+
+def socket_path():
+    return os.environ.get("VMSIM_SOCKET") or DEFAULT_SOCKET_PATH
+
+
+def endpoint():
+    return socket_path() if USE_UNIX_SOCKET else f"{TCP_ADDRESS[0]}:{TCP_ADDRESS[1]}"
+
+
+def connect():
+    """Open the control channel to the simulator; raises ``socket.error`` if it is not listening."""
+    if USE_UNIX_SOCKET:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address = socket_path()
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        address = TCP_ADDRESS
+    try:
+        sock.connect(address)
+    except socket.error:
+        sock.close()
+        raise
+    return sock
+
+
+def block_dtype(spec):
+    # "=u2" or a list of [field, type] pairs for packed records.
+    if isinstance(spec, list):
+        return np.dtype([(name, field_type) for name, field_type in spec])
+    return np.dtype(spec)
+
+
+def is_block(value):
+    return isinstance(value, dict) and len(value) == 1 and "shm" in value
+
+
+class _Region(shared_memory.SharedMemory):
+    """A mapping that can be closed while arrays still view it.
+
+    Those arrays hold the underlying mmap, which is unmapped once the last of
+    them is released, so closing only drops the handle instead of raising
+    ``BufferError`` (also from ``__del__`` at interpreter exit).
+    """
+
+    def close(self):
+        try:
+            super().close()
+        except BufferError:
+            if os.name != "nt" and self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+
+
+class SharedResults:
+    """Keeps the simulator's results region mapped between runs.
+
+    ``resolve`` returns zero-copy views of the mapping. The engine writes every
+    export to a new generation of the region, so arrays from an earlier run
+    stay valid; the superseded mapping is released with the last of them.
+    """
+
+    def __init__(self):
+        self.region = None
+
+    def attach(self, name, size):
+        if self.region is not None and self.region.name == name and self.region.size >= size:
+            return
+        # The engine moved on to a new region; let go of the old one before mapping it.
+        self.close()
+        try:
+            self.region = _Region(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13 attaching registers the segment with the resource
+            # tracker, which would unlink the simulator's region when the UI exits.
+            self.region = _Region(name=name)
+            if os.name != "nt":
+                resource_tracker.unregister(self.region._name, "shared_memory")
+
+    def array(self, block):
+        shm = block["shm"]
+        return np.frombuffer(
+            self.region.buf, dtype=block_dtype(shm["dtype"]), count=shm["count"], offset=shm["offset"]
+        )
+
+    def resolve(self, results):
+        """Replace every shared-memory block in ``results`` with an array viewing the mapping."""
+        region = results.get("shared_memory")
+        if not region:
+            return results
+        self.attach(region["name"], region["size"])
+        return self._resolve(results)
+
+    def _resolve(self, value):
+        if is_block(value):
+            return self.array(value)
+        if isinstance(value, dict):
+            return {key: self._resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._resolve(item) for item in value]
+        return value
+
+    def close(self):
+        if self.region is None:
+            return
+        self.region.close()
+        self.region = None
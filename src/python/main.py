@@ -2,14 +2,17 @@ import customtkinter as ctk
 import subprocess
 import os
 import time
+from bridge.transport import vmsim_core
 from ui.input_ui import VirtualMemoryUI
 
 class AppManager:
     def __init__(self):
         self.root = ctk.CTk()
-        self.simulator_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "bin", "virtual_memory_simulator.exe"))
+        simulator_name = "virtual_memory_simulator.exe" if os.name == "nt" else "virtual_memory_simulator"
+        self.simulator_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "bin", simulator_name))
         self.simulator_process = None
-        self.start_simulator()
+        if vmsim_core is None:
+            self.start_simulator()
         self.ui = VirtualMemoryUI(
             self.root,
             env_file_path=os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "bin", "environment.json")),
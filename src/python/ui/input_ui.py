@@ -1,5 +1,6 @@
 import customtkinter as ctk
 from .input_ui_constraints import LogicHandler, CustomMessageBox
+from workload.generators import PATTERNS
 
 class VirtualMemoryUI:
     def __init__(self, app, env_file_path=None, proc_file_path=None, simulator_path=None, simulator_process=None):
@@ -70,6 +71,11 @@ class VirtualMemoryUI:
         self.swap_label.pack(pady=2)
         self.swap_percent_var.trace_add("write", self.update_swap_label)
 
+        ctk.CTkLabel(self.ram_frame, text="Swap Device:", font=("Arial", 12)).pack(anchor="w", padx=10, pady=2)
+        self.swap_device_var = ctk.StringVar(value="SSD")
+        self.swap_device_menu = ctk.CTkOptionMenu(self.ram_frame, values=["SSD", "HDD"], variable=self.swap_device_var)
+        self.swap_device_menu.pack(pady=5)
+
         # Memory Frame contents
         ctk.CTkLabel(self.memory_frame, text="Memory Settings", font=("Arial", 16)).pack(pady=5)
         ctk.CTkLabel(self.memory_frame, text="Page Size (KB):", font=("Arial", 12)).pack(anchor="w", padx=10, pady=2)
@@ -88,6 +94,10 @@ class VirtualMemoryUI:
         self.tlb_checkbox = ctk.CTkCheckBox(self.memory_frame, text="Enable TLB Usage", variable=self.tlb_enabled_var)
         self.tlb_checkbox.pack(pady=5)
 
+        self.tlb_asids_var = ctk.BooleanVar(value=True)
+        self.tlb_asids_checkbox = ctk.CTkCheckBox(self.memory_frame, text="Tag TLB Entries with ASIDs", variable=self.tlb_asids_var)
+        self.tlb_asids_checkbox.pack(pady=5)
+
         ctk.CTkLabel(self.memory_frame, text="Virtual Address Size:", font=("Arial", 12)).pack(anchor="w", padx=10, pady=2)
         self.va_size_var = ctk.StringVar(value="16-bit")
         self.va_size_menu = ctk.CTkOptionMenu(self.memory_frame, values=["16-bit"], variable=self.va_size_var)
@@ -98,13 +108,35 @@ class VirtualMemoryUI:
         self.memory_allocation_menu = ctk.CTkOptionMenu(
             self.memory_frame,
             values=["Contiguous", "Non-Contiguous"],
-            variable=self.memory_allocation_var
+            variable=self.memory_allocation_var,
+            command=self.logic_handler.toggle_strategy_dropdown
         )
         self.memory_allocation_menu.pack(pady=5)
 
+        ctk.CTkLabel(self.memory_frame, text="Contiguous Strategy:", font=("Arial", 12)).pack(anchor="w", padx=10, pady=2)
+        self.allocation_strategy_var = ctk.StringVar(value="First Fit")
+        self.allocation_strategy_menu = ctk.CTkOptionMenu(
+            self.memory_frame,
+            values=["First Fit", "Next Fit", "Best Fit", "Worst Fit", "Buddy"],
+            variable=self.allocation_strategy_var
+        )
+        self.allocation_strategy_menu.pack(pady=5)
+
+        ctk.CTkLabel(self.memory_frame, text="CPU Scheduler:", font=("Arial", 12)).pack(anchor="w", padx=10, pady=2)
+        self.scheduler_policy_var = ctk.StringVar(value="Round Robin")
+        self.scheduler_policy_menu = ctk.CTkOptionMenu(
+            self.memory_frame,
+            values=["Round Robin", "Priority", "MLFQ"],
+            variable=self.scheduler_policy_var
+        )
+        self.scheduler_policy_menu.pack(pady=5)
+
         self.config_button = ctk.CTkButton(self.memory_frame, text="Set Configuration", command=self.logic_handler.set_configuration)
         self.config_button.pack(pady=10)
 
+        self.estimate_label = ctk.CTkLabel(self.memory_frame, text="", font=("Arial", 11), justify="left", wraplength=320)
+        self.estimate_label.pack(pady=(0, 10), padx=10)
+
         # Process Frame contents
         ctk.CTkLabel(self.process_frame, text="Add Process", font=("Arial", 16)).pack(pady=5)
         ctk.CTkLabel(self.process_frame, text="Name:", font=("Arial", 12)).pack(anchor="w", padx=10, pady=2)
@@ -127,6 +159,11 @@ class VirtualMemoryUI:
         self.system_process_menu = ctk.CTkOptionMenu(self.system_process_frame, values=system_processes, variable=self.system_process_var)
         self.system_process_menu.pack(pady=5)
 
+        ctk.CTkLabel(self.process_frame, text="Workload:", font=("Arial", 12)).pack(anchor="w", padx=10, pady=2)
+        self.workload_var = ctk.StringVar(value="Uniform")
+        self.workload_menu = ctk.CTkOptionMenu(self.process_frame, values=list(PATTERNS), variable=self.workload_var)
+        self.workload_menu.pack(pady=5)
+
         self.set_priority_var = ctk.BooleanVar()
         self.priority_checkbutton = ctk.CTkCheckBox(self.process_frame, text="Set Priority?", variable=self.set_priority_var)
         self.priority_checkbutton.pack(pady=5)
@@ -166,6 +203,10 @@ class VirtualMemoryUI:
 
         self.logic_handler.load_processes_from_json()
         self.logic_handler.update_options(None)
+        for var in (self.ram_size_var, self.page_size_var, self.va_size_var, self.rom_size_var,
+                    self.swap_percent_var, self.memory_allocation_var):
+            var.trace_add("write", self.logic_handler.update_estimate)
+        self.logic_handler.update_estimate()
         self.app.protocol("WM_DELETE_WINDOW", self.logic_handler.on_closing)
 
     def update_swap_label(self, *args):
@@ -183,6 +224,8 @@ class VirtualMemoryUI:
         self.process_type_var.set("User")
         self.process_type_menu.configure(state="disabled")
         self.system_process_menu.configure(state="disabled")
+        self.workload_var.set("Uniform")
+        self.workload_menu.configure(state="disabled")
         self.set_priority_var.set(False)
         self.priority_checkbutton.configure(state="disabled")
         self.add_process_button.configure(state="disabled")
@@ -196,11 +239,18 @@ class VirtualMemoryUI:
             self.system_process_menu.configure(state="normal")
         else:
             self.system_process_menu.configure(state="disabled")
+        self.workload_menu.configure(state="normal")
         self.priority_checkbutton.configure(state="normal")
         self.add_process_button.configure(state="normal")
         if self.process_list:
             self.confirm_process_button.configure(state="normal")
 
+    def toggle_strategy_dropdown(self, value):
+        if self.memory_allocation_var.get() == "Contiguous":
+            self.allocation_strategy_menu.configure(state="normal")
+        else:
+            self.allocation_strategy_menu.configure(state="disabled")
+
     def toggle_system_dropdown(self, value):
         if self.process_type_var.get() == "System":
             self.system_process_frame.pack(anchor="w", pady=5)
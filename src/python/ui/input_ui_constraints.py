@@ -5,6 +5,20 @@ import time
 import subprocess
 import socket
 import random
+import threading
+import numpy as np
+from workload.trace import DEFAULT_CHUNK_TICKS, DEFAULT_TICKS, build_streams, trace_chunks
+from visualization.frame_heatmap import FrameHeatmap
+from bridge.estimator import admit, estimate, format_bytes, load_limits
+from bridge.metrics import MetricsCollector, load_metrics_config, run_labels
+from bridge.transport import SharedResults, connect, endpoint, vmsim_core
+
+# The engine sends a progress event every 250 ms while it works, so silence this long means it is stuck.
+STALL_TIMEOUT_S = 30.0
+# Status and progress lines are small; result payloads are parsed once by the caller.
+STATUS_LINE_BYTES = 4096
+# How often the Tk thread services the progress dialog while the in-process core works.
+CORE_POLL_S = 0.1
 
 class CustomMessageBox(ctk.CTkToplevel):
     def __init__(self, parent, title, message, options):
@@ -58,6 +72,59 @@ class CustomMessageBox(ctk.CTkToplevel):
         self.wait_window()
         return self.result
 
+class ProgressDialog(ctk.CTkToplevel):
+    def __init__(self, parent, title, on_cancel):
+        super().__init__(parent)
+        self.title(title)
+        self.geometry("420x180")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self.on_cancel_click)
+
+        self.on_cancel = on_cancel
+
+        self.phase_label = ctk.CTkLabel(self, text="Starting...", font=("Arial", 12))
+        self.phase_label.pack(pady=(15, 5), padx=10)
+
+        self.progress_bar = ctk.CTkProgressBar(self, width=380)
+        self.progress_bar.pack(pady=5, padx=20)
+        self.progress_bar.set(0)
+
+        self.stats_label = ctk.CTkLabel(self, text="", font=("Arial", 12))
+        self.stats_label.pack(pady=5, padx=10)
+
+        self.cancel_button = ctk.CTkButton(self, text="Cancel", command=self.on_cancel_click, width=100)
+        self.cancel_button.pack(pady=10)
+
+        self.update_idletasks()
+
+        parent_width = parent.winfo_width()
+        parent_height = parent.winfo_height()
+        parent_x = parent.winfo_rootx()
+        parent_y = parent.winfo_rooty()
+        dialog_width = self.winfo_width()
+        dialog_height = self.winfo_height()
+        x = parent_x + (parent_width - dialog_width) // 2
+        y = parent_y + (parent_height - dialog_height) // 2
+        self.geometry(f"+{x}+{y}")
+
+    def update_progress(self, event):
+        done, total = event["done"], event["total"]
+        self.phase_label.configure(text=f"{event['phase'].capitalize()}: {done} / {total}" if total else event["phase"].capitalize())
+        self.progress_bar.set(min(1.0, done / total) if total else 0)
+        self.stats_label.configure(
+            text=(
+                f"{event['accesses']:,} accesses ({event['accesses_per_second']:,.0f}/s)\n"
+                f"TLB hits {event['total_hits']:,}, misses {event['total_misses']:,}, "
+                f"faults {event['total_faults']:,}"
+            )
+        )
+
+    def on_cancel_click(self):
+        self.cancel_button.configure(state="disabled", text="Cancelling...")
+        self.on_cancel()
+
 class LogicHandler:
     def __init__(self, ui, env_file_path=None, proc_file_path=None, simulator_path=None, simulator_process=None):
         self.ui = ui
@@ -68,25 +135,35 @@ class LogicHandler:
         self.simulator_path = simulator_path
         self.simulator_process = simulator_process
         self.sock = None
-        self.setup_socket()
+        self.recv_buffer = b""
+        self.heatmap_window = None
+        self.heatmap = None
+        self.progress_dialog = None
+        self.cancel_requested = False
+        self.shared_results = SharedResults()
+        self.limits = load_limits(env_file_path)
+        self.metrics_config = load_metrics_config(env_file_path)
+        self.metrics = MetricsCollector(self.metrics_config["prometheus_file"], self.metrics_config["csv_file"])
+        # The in-process core replaces the simulator process and its socket when it is built.
+        self.core = vmsim_core.Simulator() if vmsim_core is not None else None
+        if self.core is None:
+            self.setup_socket()
 
     def setup_socket(self):
         max_attempts = 10
         time.sleep(3.0)  # Initial delay to ensure simulator is ready
         for attempt in range(max_attempts):
             try:
-                print(f"Attempt {attempt + 1}: Connecting to TCP server at 127.0.0.1:12345")
-                self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.sock.connect(("127.0.0.1", 12345))
-                print(f"Attempt {attempt + 1}: Successfully connected to TCP server")
+                print(f"Attempt {attempt + 1}: Connecting to simulator at {endpoint()}")
+                self.sock = connect()
+                print(f"Attempt {attempt + 1}: Successfully connected to simulator")
                 return
             except socket.error as e:
                 print(f"Attempt {attempt + 1}: Failed to connect, error: {e}")
-                self.sock.close()
                 self.sock = None
                 time.sleep(1.0)
                 if attempt == max_attempts - 1:
-                    raise RuntimeError(f"Failed to connect to TCP server after {max_attempts} attempts. Last error: {e}")
+                    raise RuntimeError(f"Failed to connect to simulator after {max_attempts} attempts. Last error: {e}")
 
     def reconnect_socket(self):
         if self.sock:
@@ -95,13 +172,13 @@ class LogicHandler:
             except socket.error as e:
                 print(f"Error closing socket: {e}")
             self.sock = None
+        self.recv_buffer = b""
         time.sleep(1.0)
         max_attempts = 5
         for attempt in range(max_attempts):
             try:
-                print(f"Reconnect attempt {attempt + 1}: Connecting to TCP server")
-                self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.sock.connect(("127.0.0.1", 12345))
+                print(f"Reconnect attempt {attempt + 1}: Connecting to simulator at {endpoint()}")
+                self.sock = connect()
                 print(f"Reconnect attempt {attempt + 1}: Successfully reconnected")
                 return
             except socket.error as e:
@@ -138,95 +215,382 @@ class LogicHandler:
         if self.sock:
             try:
                 self.sock.close()
-                print("Closed TCP socket on UI exit")
+                print("Closed simulator socket on UI exit")
             except socket.error as e:
                 print(f"Error closing socket: {e}")
             self.sock = None
+        self.shared_results.close()
         self.ui.app.destroy()
 
-    def send_to_cpp(self, force_new=False):
-        if not self.start_simulator(force_new):
-            return
-
-        settings = {
+    def build_settings(self):
+        return {
             "ram_size_gb": int(self.ui.ram_size_var.get()),
             "page_size_kb": int(self.ui.page_size_var.get().replace("KB", "")) if self.ui.page_size_var.get() else 0,
             "tlb_size": int(self.ui.tlb_size_var.get()) if self.ui.tlb_size_var.get() else 0,
             "tlb_enabled": self.ui.tlb_enabled_var.get(),
+            "tlb_asids": self.ui.tlb_asids_var.get(),
             "virtual_address_size": self.ui.va_size_var.get(),
             "rom_size": self.ui.rom_size_var.get(),
             "swap_percent": float(self.ui.swap_percent_var.get()),
+            "swap_device": self.ui.swap_device_var.get(),
             "allocation_type": self.ui.memory_allocation_var.get(),
+            "allocation_strategy": self.ui.allocation_strategy_var.get(),
+            "scheduler": {"policy": self.ui.scheduler_policy_var.get()},
+            "trace_driven": True,
+            "trace_ticks": DEFAULT_TICKS,
+            "shared_memory": True,
             "processes": self.process_data
         }
 
-        config_str = json.dumps(settings)
-        config_bytes = config_str.encode('utf-8')
-        config_size = len(config_bytes)
+    def check_admission(self, settings):
+        run_estimate = estimate(settings, self.process_data)
+        decision, reasons = admit(run_estimate, self.limits)
+        return decision, reasons, run_estimate
 
-        print(f"Sending configuration to C++: {config_str[:50]}...")
-        print(f"Configuration size: {config_size} bytes")
+    def update_estimate(self, *args):
+        if not hasattr(self.ui, "estimate_label"):
+            return
+        settings = self.build_settings()
+        if not settings["page_size_kb"]:
+            self.ui.estimate_label.configure(text="")
+            return
+        decision, reasons, run_estimate = self.check_admission(settings)
+        text = (
+            f"Estimate: page tables {format_bytes(run_estimate['page_table_bytes'])} "
+            f"(limit {format_bytes(run_estimate['page_table_limit_bytes'])})\n"
+            f"Simulator memory ~{format_bytes(run_estimate['simulator_rss_bytes'])}, "
+            f"results ~{format_bytes(run_estimate['payload_bytes'])}, "
+            f"~{run_estimate['runtime_seconds']:.1f} s"
+        )
+        if decision == "reject":
+            text += "\nWill be rejected: " + "; ".join(reasons)
+        elif decision == "summary_only":
+            text += "\nSummary-only results: " + "; ".join(reasons)
+        colours = {"accept": ("gray10", "gray90"), "summary_only": "#CC7A00", "reject": "#CC3333"}
+        self.ui.estimate_label.configure(text=text, text_color=colours[decision])
 
-        try:
-            self.sock.sendall(config_bytes)
-            print("Configuration sent to server")
-
-            result_str = ""
-            start_time = time.time()
-            timeout = 15.0
-            self.sock.settimeout(0.1)  # Non-blocking for polling
-            while time.time() - start_time < timeout:
-                try:
-                    data = self.sock.recv(1024 * 1024)
-                    if not data:
-                        print("Server closed connection, attempting to reconnect...")
-                        self.reconnect_socket()
-                        self.sock.sendall(config_bytes)
-                        continue
-                    result_str += data.decode('utf-8', errors='ignore')
-                    if result_str:
-                        break
-                except socket.timeout:
-                    continue
-                except socket.error as e:
-                    print(f"Receive error: {e}, attempting to reconnect...")
-                    self.reconnect_socket()
-                    self.sock.sendall(config_bytes)
-                    continue
-            self.sock.settimeout(None)  # Restore blocking mode
+    def send_to_cpp(self, force_new=False):
+        if self.core is None and not self.start_simulator(force_new):
+            return
+
+        settings = self.build_settings()
+        decision, reasons, run_estimate = self.check_admission(settings)
+        if decision == "reject":
+            dialog = CustomMessageBox(self.ui.app, "Configuration Rejected", "The simulation was not started:\n\n" + "\n".join(reasons), ["OK"])
+            dialog.get()
+            return
+        if decision == "summary_only":
+            settings["summary_only"] = True
+            print(f"Downgrading to summary-only results: {'; '.join(reasons)}")
 
-            if not result_str:
+        print(f"Sending configuration to C++: {json.dumps(settings)[:50]}...")
+
+        try:
+            self.cancel_requested = False
+            self.metrics.start_run()
+            self.progress_dialog = ProgressDialog(self.ui.app, "Simulating", self.request_cancel)
+            try:
+                if self.core is not None:
+                    with self.metrics.phase("run"):
+                        results = self.run_in_process(settings)
+                else:
+                    with self.metrics.phase("run"):
+                        try:
+                            result_str = self.run_simulation(settings)
+                        except socket.error as e:
+                            print(f"Receive error: {e}, attempting to reconnect...")
+                            self.reconnect_socket()
+                            result_str = self.run_simulation(settings)
+                    with self.metrics.phase("json_loads"):
+                        results = json.loads(result_str) if result_str else None
+            finally:
+                self.progress_dialog.destroy()
+                self.progress_dialog = None
+
+            if not results:
+                self.record_metrics(None, settings, "failed")
                 dialog = CustomMessageBox(self.ui.app, "Error", "No simulation results received.", ["OK"])
                 dialog.get()
                 return
 
             try:
-                results = json.loads(result_str)
+                with self.metrics.phase("resolve"):
+                    results = self.shared_results.resolve(results)
+                if results.get("status") == "cancelled":
+                    self.record_metrics(results, settings, "cancelled")
+                    dialog = CustomMessageBox(self.ui.app, "Cancelled", "Simulation cancelled; its frames have been released.", ["OK"])
+                    dialog.get()
+                    return
+                if results.get("status") == "error":
+                    self.record_metrics(results, settings, "error")
+                    dialog = CustomMessageBox(self.ui.app, "Error", f"Simulation failed: {results.get('error', 'unknown error')}", ["OK"])
+                    dialog.get()
+                    return
+                render_start = time.perf_counter()
+                self.show_frame_heatmap(results)
                 message = (
                     f"Simulation Results:\n"
                     f"TLB Hits: {results['tlb_stats']['total_hits']}\n"
                     f"TLB Misses: {results['tlb_stats']['total_misses']}\n"
                     f"Page Faults: {results['total_faults']}"
                 )
+                if results.get("summary_only"):
+                    message += "\n(Summary only: " + "; ".join(reasons) + ")"
+                allocator = results.get("allocator")
+                if allocator:
+                    message += (
+                        f"\n\nAllocator ({allocator['strategy']}):\n"
+                        f"Largest Free Extent: {allocator['largest_free_extent']} frames\n"
+                        f"External Fragmentation: {allocator['external_fragmentation'] * 100:.1f}%\n"
+                        f"Holes: {allocator['hole_count']}"
+                    )
+                swap_stats = results.get("swap_stats")
+                if swap_stats:
+                    message += (
+                        f"\n\nSwap ({swap_stats['device']}):\n"
+                        f"Reads: {swap_stats['read_ops']} ops, {swap_stats['bytes_read'] / 1048576:.1f} MB\n"
+                        f"Writes: {swap_stats['write_ops']} ops, {swap_stats['bytes_written'] / 1048576:.1f} MB\n"
+                        f"I/O Time: {swap_stats['io_time_ms']:.1f} ms"
+                    )
+                access_time = results.get("access_time")
+                if access_time and access_time["accesses"]:
+                    breakdown = access_time["breakdown_ns"]
+                    total_ns = sum(breakdown.values()) or 1.0
+                    message += (
+                        f"\n\nEffective Access Time: {access_time['average_ns']:.1f} ns\n"
+                        + ", ".join(
+                            f"{name[:-3].capitalize()} {value / total_ns * 100:.0f}%"
+                            for name, value in breakdown.items()
+                        )
+                    )
+                    for proc in access_time["per_process"]:
+                        message += (
+                            f"\nProcess {proc['process_id']}: p50 {proc['p50_ns']:.0f} ns, "
+                            f"p99 {proc['p99_ns']:.0f} ns"
+                        )
+                page_walk_cache = results.get("page_walk_cache")
+                if page_walk_cache and page_walk_cache["enabled"] and page_walk_cache["walks"]:
+                    message += (
+                        f"\n\nPage-Walk Caches: {page_walk_cache['average_walk_levels']:.2f} levels/walk, "
+                        f"{page_walk_cache['levels_skipped']} levels skipped\n"
+                        + ", ".join(
+                            f"{cache['name']} {cache['hit_rate'] * 100:.0f}%"
+                            for cache in page_walk_cache["caches"] if cache["lookups"]
+                        )
+                    )
+                scheduling = results.get("scheduler")
+                if scheduling and scheduling["ticks"]:
+                    message += (
+                        f"\n\nScheduler ({scheduling['policy']}): {scheduling['context_switches']} context switches"
+                        + (f", {scheduling['tlb_flushes']} TLB flushes" if not scheduling["tlb_asids"] else "")
+                        + (f", {results['trace_unconsumed']} trace addresses not issued"
+                           if results.get("trace_unconsumed") else "")
+                    )
+                    for proc in scheduling["per_process"]:
+                        message += (
+                            f"\nProcess {proc['process_id']}: CPU {proc['cpu_share'] * 100:.0f}%, "
+                            f"post-switch misses {proc['post_switch_miss_rate'] * 100:.0f}% "
+                            f"(steady {proc['steady_miss_rate'] * 100:.0f}%)"
+                        )
+                self.metrics.add_client_time("render", time.perf_counter() - render_start)
+                self.record_metrics(results, settings)
                 dialog = CustomMessageBox(self.ui.app, "Results", message, ["OK"])
                 dialog.get()
-            except json.JSONDecodeError:
+            except KeyError:
+                self.record_metrics(results, settings, "failed")
                 dialog = CustomMessageBox(self.ui.app, "Error", "Invalid simulation results.", ["OK"])
                 dialog.get()
+        except json.JSONDecodeError:
+            self.record_metrics(None, settings, "failed")
+            dialog = CustomMessageBox(self.ui.app, "Error", "Invalid simulation results.", ["OK"])
+            dialog.get()
         except socket.error as e:
+            self.record_metrics(None, settings, "failed")
             dialog = CustomMessageBox(self.ui.app, "Error", f"Failed to communicate with simulator: {str(e)}", ["OK"])
             dialog.get()
+        except (ValueError, RuntimeError) as e:
+            self.record_metrics(None, settings, "failed")
+            dialog = CustomMessageBox(self.ui.app, "Error", f"Simulation failed: {str(e)}", ["OK"])
+            dialog.get()
+
+    def record_metrics(self, results, settings, status="ok"):
+        # The labels only go to the CSV rows; Prometheus keeps unlabelled totals and a count per status.
+        self.metrics.record(results, labels=run_labels(
+            settings, len(self.process_data), results, status, in_process=self.core is not None,
+        ))
+        self.metrics.export()
+
+    def request_cancel(self):
+        self.cancel_requested = True
+
+    def send_message(self, message, timeout=STALL_TIMEOUT_S):
+        """Send one newline-delimited JSON message and return the reply line.
+
+        Progress events received while waiting go to the progress dialog and keep
+        the UI responsive. Returns "" if nothing arrives for ``timeout`` seconds,
+        after reconnecting so that a late reply cannot be read as the answer to
+        the next message. Once Cancel is pressed a cancel message follows, and the engine's
+        "cancelled" reply is returned in place of the normal one.
+        """
+        self.sock.sendall(json.dumps(message).encode('utf-8') + b"\n")
+        cancel_sent = False
+        last_line_time = time.time()
+        self.sock.settimeout(0.1)  # Non-blocking for polling
+        try:
+            while True:
+                if self.cancel_requested and not cancel_sent:
+                    self.sock.sendall(json.dumps({"command": "cancel"}).encode('utf-8') + b"\n")
+                    cancel_sent = True
+                if b"\n" not in self.recv_buffer:
+                    if time.time() - last_line_time >= timeout:
+                        print(f"No reply from simulator for {timeout:.0f} s, reconnecting")
+                        self.reconnect_socket()
+                        return ""
+                    if self.progress_dialog is not None:
+                        self.ui.app.update()
+                    try:
+                        data = self.sock.recv(1024 * 1024)
+                    except socket.timeout:
+                        continue
+                    if not data:
+                        raise ConnectionError("Server closed connection")
+                    self.recv_buffer += data
+                    continue
+
+                line, _, self.recv_buffer = self.recv_buffer.partition(b"\n")
+                last_line_time = time.time()
+                line = line.decode('utf-8', errors='ignore')
+                if len(line) > STATUS_LINE_BYTES:
+                    reply = {}
+                else:
+                    try:
+                        reply = json.loads(line)
+                    except json.JSONDecodeError:
+                        return line
+                if reply.get("event") == "progress":
+                    if self.progress_dialog is not None:
+                        self.progress_dialog.update_progress(reply)
+                    continue
+                if cancel_sent and reply.get("status") != "cancelled":
+                    # The engine finished before it saw the cancel; its reply to the cancel follows.
+                    continue
+                return line
+        finally:
+            self.sock.settimeout(None)  # Restore blocking mode
+
+    def run_simulation(self, settings):
+        reply = self.send_message(settings)
+        try:
+            ready = json.loads(reply).get("status") == "ready"
+        except json.JSONDecodeError:
+            ready = False
+        if not ready:
+            return reply
+
+        page_size_bytes = settings["page_size_kb"] * 1024
+        for chunk in trace_chunks(self.process_data, page_size_bytes):
+            ack = self.send_message(chunk)
+            if not ack:
+                return ""
+            try:
+                status = json.loads(ack).get("status")
+            except json.JSONDecodeError:
+                status = None
+            if status == "cancelled":
+                return ack
+            if status != "ok":
+                print(f"Trace chunk rejected: {ack[:200]}")
+        with self.metrics.phase("receive_results"):
+            return self.send_message({"command": "trace_end"})
+
+    def run_in_process(self, settings):
+        """Run the same trace through the in-process core; returns the results dict.
+
+        Mirrors run_simulation: allocation and each DEFAULT_CHUNK_TICKS slice of the
+        trace run on a worker thread while the progress dialog and Cancel button
+        are serviced here.
+        """
+        try:
+            self.run_core_call(self.core.load_settings, settings)
+            if self.cancel_requested:
+                return {"status": "cancelled", "metrics": self.core.metrics()}
+            process_ids, streams = build_streams(self.process_data, settings["page_size_kb"] * 1024, settings["trace_ticks"])
+            # Like the socket server, skip processes whose allocation failed.
+            scheduled = set(self.core.scheduled())
+            columns = [column for column, pid in enumerate(process_ids) if pid in scheduled]
+            process_ids, streams = [process_ids[column] for column in columns], streams[:, columns]
+            for start in range(0, len(streams) if process_ids else 0, DEFAULT_CHUNK_TICKS):
+                self.run_core_call(self.core.access, process_ids, np.ascontiguousarray(streams[start:start + DEFAULT_CHUNK_TICKS]), start)
+                if self.cancel_requested:
+                    return {"status": "cancelled", "metrics": self.core.metrics()}
+            return self.run_core_call(self.core.export_results)
+        except (ValueError, RuntimeError) as e:
+            # The socket server's error reply, so the run is reported and recorded the same way.
+            return {"status": "error", "error": str(e), "metrics": self.core.metrics()}
+        finally:
+            # Like the socket server, free the session once its results are exported.
+            self.core.reset()
+
+    def run_core_call(self, call, *args):
+        """Run one core call on a worker thread and return its result.
+
+        The core releases the GIL while it works, so the Tk thread keeps polling
+        progress() into the dialog and forwards Cancel through cancel(). Exceptions
+        raised by the call are re-raised here.
+        """
+        outcome = {}
+
+        def target():
+            try:
+                outcome["result"] = call(*args)
+            except BaseException as e:
+                outcome["error"] = e
+
+        worker = threading.Thread(target=target, name="vmsim-core", daemon=True)
+        worker.start()
+        try:
+            while worker.is_alive():
+                worker.join(CORE_POLL_S)
+                if self.cancel_requested:
+                    self.core.cancel()
+                self.progress_dialog.update_progress(self.core.progress())
+                self.ui.app.update()
+        except BaseException:
+            # The core stays busy until the worker returns, so stop it before unwinding.
+            self.core.cancel()
+            worker.join()
+            raise
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome.get("result")
+
+    def show_frame_heatmap(self, results):
+        frame_map = results.get("frame_map")
+        if not frame_map:
+            return
+        if self.heatmap_window is None or not self.heatmap_window.winfo_exists():
+            self.heatmap_window = ctk.CTkToplevel(self.ui.app)
+            self.heatmap_window.title("Physical Memory")
+            self.heatmap_window.geometry("900x600")
+            self.heatmap = FrameHeatmap(self.heatmap_window)
+        self.heatmap.update(frame_map, results["frame_table"]["owners"])
 
     def save_to_json(self):
         settings = {
             "ram_size": self.ui.ram_size_var.get(),
             "rom_size": self.ui.rom_size_var.get(),
             "swap_size": float(self.ui.swap_percent_var.get()),
+            "swap_device": self.ui.swap_device_var.get(),
             "page_size": self.ui.page_size_var.get(),
             "tlb_enabled": self.ui.tlb_enabled_var.get(),
             "tlb_size": self.ui.tlb_size_var.get(),
             "virtual_address_size": self.ui.va_size_var.get(),
             "allocation_type": self.ui.memory_allocation_var.get(),
+            "allocation_strategy": self.ui.allocation_strategy_var.get(),
+            "tlb_asids": self.ui.tlb_asids_var.get(),
+            "scheduler_policy": self.ui.scheduler_policy_var.get(),
+            "limits": self.limits,
+            "metrics": self.saved_metrics_config(),
         }
         if self.env_file_path:
             try:
@@ -244,13 +608,18 @@ class LogicHandler:
                 dialog = CustomMessageBox(self.ui.app, "Error", f"Failed to save process data: {e}", ["OK"])
                 dialog.get()
 
+    def saved_metrics_config(self):
+        # Store export paths relative to the environment file, as they were read.
+        base = os.path.dirname(os.path.abspath(self.env_file_path)) if self.env_file_path else os.getcwd()
+        return {key: os.path.relpath(path, base) if path else None for key, path in self.metrics_config.items()}
+
     def load_processes_from_json(self):
         if self.proc_file_path and isinstance(self.proc_file_path, (str, bytes, os.PathLike)) and os.path.exists(self.proc_file_path):
             try:
                 with open(self.proc_file_path, "r") as f:
                     self.process_data = json.load(f)
                 for proc in self.process_data:
-                    process_info = f"ID: {proc['id']}, Name: {proc['name']}, Size: {proc['size_gb']}GB, Type: {proc['type']}, Has Priority: {proc['has_priority']}, VA: {proc['virtual_address']}"
+                    process_info = f"ID: {proc['id']}, Name: {proc['name']}, Size: {proc['size_gb']}GB, Type: {proc['type']}, Has Priority: {proc['has_priority']}, Workload: {proc.get('workload', 'Uniform')}, VA: {proc['virtual_address']}"
                     self.ui.add_process_to_list(process_info, proc['id'], proc["is_process_stop"])
                 if self.process_data:
                     self.next_process_id = max(self.next_process_id, max(int(proc['id']) for proc in self.process_data) + 1)
@@ -274,7 +643,11 @@ class LogicHandler:
             "virtual_address_size": self.ui.va_size_var.get(),
             "rom_size": self.ui.rom_size_var.get(),
             "swap_size": float(self.ui.swap_percent_var.get()),
+            "swap_device": self.ui.swap_device_var.get(),
             "allocation_type": self.ui.memory_allocation_var.get(),
+            "allocation_strategy": self.ui.allocation_strategy_var.get(),
+            "tlb_asids": self.ui.tlb_asids_var.get(),
+            "scheduler_policy": self.ui.scheduler_policy_var.get(),
         }
 
         if self.ui.config_button.cget("text") == "Set Configuration":
@@ -283,11 +656,13 @@ class LogicHandler:
                 f"RAM Size: {settings['ram_size']} GB\n"
                 f"Page Size: {settings['page_size']}\n"
                 f"TLB Size: {settings['tlb_size']}\n"
-                f"TLB Enabled: {settings['tlb_enabled']}\n"
+                f"TLB Enabled: {settings['tlb_enabled']} (ASIDs: {settings['tlb_asids']})\n"
                 f"Virtual Address Size: {settings['virtual_address_size']}\n"
                 f"ROM Size: {settings['rom_size']}\n"
-                f"Swap Size: {settings['swap_size']:.0f}%\n"
-                f"Allocation Type: {settings['allocation_type']}\n\n"
+                f"Swap Size: {settings['swap_size']:.0f}% ({settings['swap_device']})\n"
+                f"Allocation Type: {settings['allocation_type']}\n"
+                f"Contiguous Strategy: {settings['allocation_strategy']}\n"
+                f"CPU Scheduler: {settings['scheduler_policy']}\n\n"
                 f"Click OK to confirm."
             )
             dialog = CustomMessageBox(self.ui.app, "Confirm Environment Settings", message, ["OK", "Cancel"])
@@ -303,11 +678,13 @@ class LogicHandler:
                 f"RAM Size: {settings['ram_size']} GB\n"
                 f"Page Size: {settings['page_size']}\n"
                 f"TLB Size: {settings['tlb_size']}\n"
-                f"TLB Enabled: {settings['tlb_enabled']}\n"
+                f"TLB Enabled: {settings['tlb_enabled']} (ASIDs: {settings['tlb_asids']})\n"
                 f"Virtual Address Size: {settings['virtual_address_size']}\n"
                 f"ROM Size: {settings['rom_size']}\n"
-                f"Swap Size: {settings['swap_size']:.0f}%\n"
-                f"Allocation Type: {settings['allocation_type']}\n\n"
+                f"Swap Size: {settings['swap_size']:.0f}% ({settings['swap_device']})\n"
+                f"Allocation Type: {settings['allocation_type']}\n"
+                f"Contiguous Strategy: {settings['allocation_strategy']}\n"
+                f"CPU Scheduler: {settings['scheduler_policy']}\n\n"
                 f"Click OK to update."
             )
             dialog = CustomMessageBox(self.ui.app, "Update Environment Settings", message, ["OK", "Cancel"])
@@ -320,6 +697,9 @@ class LogicHandler:
     def toggle_system_dropdown(self, value):
         self.ui.toggle_system_dropdown(value)
 
+    def toggle_strategy_dropdown(self, value):
+        self.ui.toggle_strategy_dropdown(value)
+
     def update_options(self, event):
         ram_size_gb = int(self.ui.ram_size_var.get())
         ram_bytes = ram_size_gb * 1024 * 1048576
@@ -369,6 +749,7 @@ class LogicHandler:
         process_type = self.ui.process_type_var.get()
         system_process = self.ui.system_process_var.get() if process_type == "System" else None
         has_priority = self.ui.set_priority_var.get()
+        workload = self.ui.workload_var.get()
 
         if process_name in ["", "e.g., Process1"] or process_size in ["", "e.g., 1"]:
             CustomMessageBox(self.ui.app, "Error", "All required fields must be filled!", ["OK"])
@@ -379,7 +760,7 @@ class LogicHandler:
         virtual_address = self.generate_virtual_address()
 
         display_name = system_process if process_type == "System" else process_name
-        process_info = f"ID: {process_id}, Name: {display_name}, Size: {process_size}GB, Type: {process_type}, Has Priority: {has_priority}, VA: {virtual_address}"
+        process_info = f"ID: {process_id}, Name: {display_name}, Size: {process_size}GB, Type: {process_type}, Has Priority: {has_priority}, Workload: {workload}, VA: {virtual_address}"
 
         process_entry = {
             "id": process_id,
@@ -387,6 +768,7 @@ class LogicHandler:
             "size_gb": int(process_size),
             "type": process_type,
             "has_priority": has_priority,
+            "workload": workload,
             "is_process_stop": False,
             "virtual_address": virtual_address
         }
@@ -394,6 +776,7 @@ class LogicHandler:
         self.process_data.append(process_entry)
         self.ui.add_process_to_list(process_info, process_id, False)
         self.save_to_json()
+        self.update_estimate()
 
         self.ui.process_name_entry.delete(0, "end")
         self.ui.process_name_entry.insert(0, "e.g., Process1")
@@ -457,10 +840,11 @@ class LogicHandler:
             return
 
         for proc in self.process_data:
-            process_info = f"ID: {proc['id']}, Name: {proc['name']}, Size: {proc['size_gb']}GB, Type: {proc['type']}, Has Priority: {proc['has_priority']}, VA: {proc['virtual_address']}"
+            process_info = f"ID: {proc['id']}, Name: {proc['name']}, Size: {proc['size_gb']}GB, Type: {proc['type']}, Has Priority: {proc['has_priority']}, Workload: {proc.get('workload', 'Uniform')}, VA: {proc['virtual_address']}"
             self.ui.add_process_to_list(process_info, proc['id'], proc["is_process_stop"])
 
         self.save_to_json()
+        self.update_estimate()
 
     def remove_process(self, process_frame, process_id):
         idx = self.find_process_index(process_id)
@@ -0,0 +1,217 @@
+"""Physical memory occupancy heatmap.
+
+The engine exports every RAM frame and swap slot as a packed uint16
+``(asid << 3) | kind`` (``frame_map`` in the results, inline or as a
+shared-memory block). Frames are mapped to colour codes, reduced to at most
+``IMAGE_COLUMNS x MAX_IMAGE_ROWS`` cells by a per-cell mode and drawn as one
+``imshow`` image. RAM starts at the top-left; swap slots start on their own
+row below it.
+"""
+
+import base64
+
+import customtkinter as ctk
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from matplotlib.colors import ListedColormap
+from matplotlib.figure import Figure
+from matplotlib import colormaps
+
+# Frame kinds, mirroring FrameKind in frame_table.h
+KIND_FREE = 0
+KIND_DATA = 1
+KIND_SWAP = 6
+
+# Colour codes drawn in the image
+CODE_PAD = 0
+CODE_FREE = 1
+CODE_TABLE = 2
+FIRST_OWNER_CODE = 3
+OWNER_COLOURS = 20
+CODE_COUNT = FIRST_OWNER_CODE + OWNER_COLOURS
+
+IMAGE_COLUMNS = 1024
+MAX_IMAGE_ROWS = 512
+# Above this share of changed frames a full recompute is cheaper than patching cells.
+INCREMENTAL_LIMIT = 0.05
+
+
+def decode_frame_map(frame_map):
+    """Return the packed ``(asid << 3) | kind`` uint16 array from a ``frame_map`` export."""
+    if frame_map["encoding"] == "shm":
+        # Already resolved to an array over the shared-memory region.
+        return frame_map["data"]
+    raw = base64.b64decode(frame_map["data"])
+    if frame_map["encoding"] == "rle":
+        runs = np.frombuffer(raw, dtype=[("value", "<u2"), ("length", "<u4")])
+        return np.repeat(runs["value"], runs["length"])
+    return np.frombuffer(raw, dtype="<u2")
+
+
+def code_table(owner_slots):
+    """Lookup table from every packed frame value to its colour code."""
+    values = np.arange(1 << 16, dtype=np.uint32)
+    asids, kinds = values >> 3, values & 7
+    table = np.full(values.size, CODE_TABLE, dtype=np.uint8)
+    table[kinds == KIND_FREE] = CODE_FREE
+    owned = (kinds == KIND_DATA) | (kinds == KIND_SWAP)
+    table[owned] = FIRST_OWNER_CODE + owner_slots[asids[owned]]
+    return table
+
+
+def reduce_cells(codes, bin_size, present_codes):
+    """Colour and used-frame share for each run of ``bin_size`` frames.
+
+    A cell that is at least half used takes the colour of its most common
+    occupant; otherwise it shows as free, so scattered placement stays visible
+    as a mottled image instead of collapsing to the majority colour. Only the
+    codes in ``present_codes`` are counted, one vectorized pass each.
+    """
+    cells = -(-codes.size // bin_size)
+    padded = np.full(cells * bin_size, CODE_PAD, dtype=np.uint8)
+    padded[:codes.size] = codes
+    grid = padded.reshape(cells, bin_size)
+    counts = np.zeros((cells, CODE_COUNT), dtype=np.uint32)
+    for code in present_codes:
+        if code != CODE_PAD:
+            counts[:, code] = (grid == code).sum(axis=1, dtype=np.uint32)
+    occupied = counts[:, CODE_TABLE:]
+    used = occupied.sum(axis=1) / bin_size
+    empty = np.where(counts[:, CODE_FREE] > 0, CODE_FREE, CODE_PAD)
+    colours = np.where(used >= 0.5, occupied.argmax(axis=1) + CODE_TABLE, empty)
+    return colours.astype(np.uint8), used
+
+
+class FrameHeatmap:
+    def __init__(self, parent):
+        self.figure = Figure(figsize=(8, 5))
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+        self.canvas = FigureCanvasTkAgg(self.figure, master=parent)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, parent, pack_toolbar=False)
+        self.toolbar.update()
+        self.toolbar.pack(side="bottom", fill="x")
+        self.hover_label = ctk.CTkLabel(parent, text="", font=("Arial", 12))
+        self.hover_label.pack(side="bottom", fill="x")
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.canvas.mpl_connect("motion_notify_event", self.on_hover)
+
+        palette = ["#ffffff", "#e6e6e6", "#404040"] + [colormaps["tab20"](i) for i in range(OWNER_COLOURS)]
+        self.colormap = ListedColormap(palette)
+        self.image = None
+        self.process_slots = {}
+        self.present_codes = set()
+        self.codes = None
+        self.bin_size = 1
+        self.ram_frames = 0
+        self.swap_start = 0
+        self.cell_codes = None
+        self.cell_used = None
+
+    def slot_for(self, process_id):
+        # Colours follow process IDs, so a process keeps its colour across runs.
+        if process_id not in self.process_slots:
+            self.process_slots[process_id] = len(self.process_slots) % OWNER_COLOURS
+        return self.process_slots[process_id]
+
+    def layout(self, frame_map, owners):
+        """Colour codes in image order: RAM, padding to a row boundary, then swap."""
+        owner_slots = np.zeros(1 << 13, dtype=np.uint8)
+        for entry in owners:
+            owner_slots[entry["asid"]] = self.slot_for(entry["process_id"])
+        codes = code_table(owner_slots)[decode_frame_map(frame_map)]
+        self.present_codes = {CODE_FREE, CODE_TABLE} | {FIRST_OWNER_CODE + owner_slots[entry["asid"]] for entry in owners}
+
+        ram_frames = frame_map["ram_frames"]
+        bin_size = max(1, -(-codes.size // (IMAGE_COLUMNS * MAX_IMAGE_ROWS)))
+        row_frames = IMAGE_COLUMNS * bin_size
+        swap_start = -(-ram_frames // row_frames) * row_frames
+        if codes.size > ram_frames:
+            padding = np.full(swap_start - ram_frames, CODE_PAD, dtype=np.uint8)
+            codes = np.concatenate([codes[:ram_frames], padding, codes[ram_frames:]])
+        return codes, bin_size, ram_frames, swap_start
+
+    def update(self, frame_map, owners):
+        codes, bin_size, ram_frames, swap_start = self.layout(frame_map, owners)
+        incremental = (
+            self.codes is not None
+            and self.codes.size == codes.size
+            and self.bin_size == bin_size
+        )
+        if incremental:
+            changed = np.flatnonzero(self.codes != codes)
+            incremental = changed.size <= codes.size * INCREMENTAL_LIMIT
+        if incremental:
+            if changed.size == 0:
+                return
+            # Recompute only the cells that contain a changed frame.
+            cells = np.unique(changed // bin_size)
+            frame_index = (cells[:, None] * bin_size + np.arange(bin_size)).ravel()
+            in_range = frame_index < codes.size
+            patch = np.full(frame_index.size, CODE_PAD, dtype=np.uint8)
+            patch[in_range] = codes[frame_index[in_range]]
+            patch_codes, patch_used = reduce_cells(patch, bin_size, self.present_codes)
+            self.cell_codes[cells] = patch_codes
+            self.cell_used[cells] = patch_used
+        else:
+            self.cell_codes, self.cell_used = reduce_cells(codes, bin_size, self.present_codes)
+        self.codes = codes
+        self.bin_size = bin_size
+        self.ram_frames = ram_frames
+        self.swap_start = swap_start
+        self.draw()
+
+    def image_data(self):
+        rows = -(-self.cell_codes.size // IMAGE_COLUMNS)
+        data = np.full(rows * IMAGE_COLUMNS, CODE_PAD, dtype=np.uint8)
+        data[:self.cell_codes.size] = self.cell_codes
+        return data.reshape(rows, IMAGE_COLUMNS)
+
+    def draw(self):
+        data = self.image_data()
+        if self.image is None or self.image.get_array().shape != data.shape:
+            self.ax.clear()
+            self.ax.set_xticks([])
+            self.ax.set_yticks([])
+            self.image = self.ax.imshow(
+                data, cmap=self.colormap, vmin=0, vmax=CODE_COUNT - 1,
+                interpolation="nearest", aspect="auto"
+            )
+            if self.codes.size > self.ram_frames:
+                self.ax.axhline(self.swap_start / (self.bin_size * IMAGE_COLUMNS) - 0.5, color="black", linewidth=1)
+            self.ax.set_title(f"Physical memory ({self.bin_size} frame(s) per cell, swap below the line)", fontsize=9)
+        else:
+            self.image.set_data(data)
+        self.canvas.draw_idle()
+
+    def on_hover(self, event):
+        if event.inaxes is not self.ax or self.cell_codes is None or event.xdata is None:
+            return
+        cell = int(event.ydata + 0.5) * IMAGE_COLUMNS + int(event.xdata + 0.5)
+        if cell < 0 or cell >= self.cell_codes.size:
+            return
+        code = self.cell_codes[cell]
+        if code == CODE_PAD and not self.cell_used[cell]:
+            # Entirely past the end of RAM or swap: nothing to describe.
+            self.hover_label.configure(text="")
+            return
+        start = cell * self.bin_size
+        end = start + self.bin_size - 1
+        if start >= self.swap_start:
+            region = f"Swap slots {start - self.swap_start}-{end - self.swap_start}"
+        elif start >= self.ram_frames:
+            self.hover_label.configure(text="")
+            return
+        else:
+            region = f"Frames {start}-{min(end, self.ram_frames - 1)}"
+        if code == CODE_PAD:
+            owner = "padding"
+        elif code == CODE_FREE:
+            owner = "free"
+        elif code == CODE_TABLE:
+            owner = "page tables"
+        else:
+            slot = code - FIRST_OWNER_CODE
+            owner = "process " + ", ".join(pid for pid, s in self.process_slots.items() if s == slot)
+        self.hover_label.configure(text=f"{region}: {owner} ({self.cell_used[cell] * 100:.0f}% used)")
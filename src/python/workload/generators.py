@@ -0,0 +1,102 @@
+"""Vectorized synthetic access-stream generators.
+
+Every generator returns a ``numpy.uint64`` array of ``count`` virtual addresses
+in ``[0, size_bytes)`` and draws all randomness from the ``numpy.random.Generator``
+it is given, so a seeded generator reproduces the same stream.
+"""
+
+import numpy as np
+
+ACCESS_BYTES = 64
+
+
+def uniform(size_bytes, count, rng, page_size_bytes):
+    return rng.integers(0, size_bytes, count, dtype=np.uint64)
+
+
+def sequential(size_bytes, count, rng, page_size_bytes, step_bytes=ACCESS_BYTES):
+    start = int(rng.integers(0, size_bytes))
+    offsets = np.arange(count, dtype=np.uint64) * np.uint64(step_bytes)
+    return (offsets + np.uint64(start)) % np.uint64(size_bytes)
+
+
+def strided(size_bytes, count, rng, page_size_bytes, stride_bytes=None):
+    # Default stride is one page, so every access touches a new page.
+    stride = stride_bytes or page_size_bytes
+    return sequential(size_bytes, count, rng, page_size_bytes, step_bytes=stride)
+
+
+def zipf(size_bytes, count, rng, page_size_bytes, exponent=1.1, max_pages=1 << 20):
+    num_pages = max(1, size_bytes // page_size_bytes)
+    universe = min(num_pages, max_pages)
+    weights = np.arange(1, universe + 1, dtype=np.float64) ** -exponent
+    cdf = np.cumsum(weights)
+    ranks = np.searchsorted(cdf, rng.random(count) * cdf[-1]).astype(np.uint64)
+    # Scatter the hot ranks across the address space instead of packing them at page 0.
+    multiplier = 0x9E3779B97F4A7C15 % num_pages | 1
+    if np.gcd(multiplier, num_pages) != 1:
+        multiplier = 1
+    pages = (ranks * np.uint64(multiplier)) % np.uint64(num_pages)
+    offsets = rng.integers(0, page_size_bytes, count, dtype=np.uint64)
+    return pages * np.uint64(page_size_bytes) + offsets
+
+
+def loop(size_bytes, count, rng, page_size_bytes, loop_bytes=None, step_bytes=ACCESS_BYTES):
+    # Repeatedly scans a region of loop_bytes (default 64 pages).
+    region = min(size_bytes, loop_bytes or 64 * page_size_bytes)
+    base = int(rng.integers(0, size_bytes - region + 1))
+    offsets = (np.arange(count, dtype=np.uint64) * np.uint64(step_bytes)) % np.uint64(region)
+    return offsets + np.uint64(base)
+
+
+def phased(size_bytes, count, rng, page_size_bytes, working_set_bytes=None, phase_length=2000):
+    # Uniform accesses inside a working set that jumps to a new base every phase.
+    working_set = min(size_bytes, working_set_bytes or 256 * page_size_bytes)
+    phases = (count + phase_length - 1) // phase_length
+    bases = rng.integers(0, size_bytes - working_set + 1, phases, dtype=np.uint64)
+    phase_index = np.arange(count) // phase_length
+    return bases[phase_index] + rng.integers(0, working_set, count, dtype=np.uint64)
+
+
+def mix(size_bytes, count, rng, page_size_bytes, components):
+    """Interleave several patterns. ``components`` is a list of
+    ``(pattern_name, weight, params)`` tuples; each component keeps its own
+    continuous stream, so a sequential component still scans sequentially."""
+    weights = np.array([weight for _, weight, _ in components], dtype=np.float64)
+    choice = rng.choice(len(components), size=count, p=weights / weights.sum())
+    addresses = np.empty(count, dtype=np.uint64)
+    for index, (name, _, params) in enumerate(components):
+        mask = choice == index
+        picked = int(mask.sum())
+        if picked:
+            addresses[mask] = PATTERNS[name](size_bytes, picked, rng, page_size_bytes, **params)
+    return addresses
+
+
+def mixed(size_bytes, count, rng, page_size_bytes):
+    return mix(size_bytes, count, rng, page_size_bytes, DEFAULT_MIX)
+
+
+PATTERNS = {
+    "Uniform": uniform,
+    "Sequential": sequential,
+    "Strided": strided,
+    "Zipf": zipf,
+    "Loop": loop,
+    "Phased": phased,
+    "Mixed": mixed,
+}
+
+DEFAULT_MIX = [
+    ("Sequential", 0.5, {}),
+    ("Zipf", 0.3, {}),
+    ("Uniform", 0.2, {}),
+]
+
+
+def generate(pattern, size_bytes, count, rng, page_size_bytes, **params):
+    try:
+        generator = PATTERNS[pattern]
+    except KeyError:
+        raise ValueError(f"Unknown workload pattern: {pattern}")
+    return generator(size_bytes, count, rng, page_size_bytes, **params)
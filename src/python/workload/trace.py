@@ -0,0 +1,46 @@
+import base64
+
+import numpy as np
+
+from .generators import generate
+
+DEFAULT_TICKS = 10000
+DEFAULT_CHUNK_TICKS = 2048
+BYTES_PER_GB = 1024 * 1048576
+
+
+def build_streams(processes, page_size_bytes, ticks=DEFAULT_TICKS, seed=None):
+    """Generate one access stream per running process.
+
+    Returns ``(process_ids, streams)`` where ``streams`` is a ``(ticks, len(process_ids))``
+    little-endian uint64 matrix. Column ``j`` is process ``j``'s access stream in
+    program order; the simulator issues a process's next address only on the ticks
+    the scheduler runs it.
+    """
+    rng = np.random.default_rng(seed)
+    active = [proc for proc in processes if not proc["is_process_stop"]]
+    streams = np.empty((ticks, len(active)), dtype="<u8")
+    for column, proc in enumerate(active):
+        streams[:, column] = generate(
+            proc.get("workload", "Uniform"),
+            proc["size_gb"] * BYTES_PER_GB,
+            ticks,
+            rng,
+            page_size_bytes,
+        )
+    return [proc["id"] for proc in active], streams
+
+
+def trace_chunks(processes, page_size_bytes, ticks=DEFAULT_TICKS, chunk_ticks=DEFAULT_CHUNK_TICKS, seed=None):
+    """Yield ``trace_chunk`` messages for the simulator, ``chunk_ticks`` rows at a time."""
+    process_ids, streams = build_streams(processes, page_size_bytes, ticks, seed)
+    if not process_ids:
+        return
+    for start in range(0, ticks, chunk_ticks):
+        block = np.ascontiguousarray(streams[start:start + chunk_ticks])
+        yield {
+            "command": "trace_chunk",
+            "tick": start,
+            "processes": process_ids,
+            "addresses": base64.b64encode(block.tobytes()).decode("ascii"),
+        }
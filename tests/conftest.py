@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The Python sources are namespace packages under src/python (``bridge``, ``workload``, ...).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "python"))
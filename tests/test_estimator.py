@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from bridge.estimator import DEFAULT_LIMITS, admit, estimate, format_bytes, load_limits
+
+GB = 1024 ** 3
+
+
+def process(pid, size_gb=1, stopped=False):
+    return {"id": pid, "size_gb": size_gb, "is_process_stop": stopped}
+
+
+def settings(**overrides):
+    config = {
+        "ram_size_gb": 4, "page_size_kb": 4, "virtual_address_size": "32-bit", "rom_size": "32 GB",
+        "swap_percent": 10, "allocation_type": "Contiguous",
+    }
+    config.update(overrides)
+    return config
+
+
+def test_estimate_counts_pages_and_accesses():
+    result = estimate(settings(), [process("P1"), process("P2", size_gb=2), process("P3", stopped=True)], ticks=500)
+    assert result["process_bytes"] == 3 * GB
+    assert result["pages"] == 3 * GB // 4096
+    assert result["accesses"] == 500
+    assert result["capacity_bytes"] == int(4 * GB * 0.99) + 32 * GB // 10
+    assert result["oversized_processes"] == []
+    assert 0 < result["summary_runtime_seconds"] <= result["runtime_seconds"]
+    assert result["summary_rss_bytes"] <= result["simulator_rss_bytes"]
+
+
+def test_estimate_moves_bulk_arrays_to_shared_memory():
+    processes = [process("P1")]
+    socket_only = estimate(settings(), processes)
+    shared = estimate(settings(shared_memory=True), processes)
+    assert socket_only["shared_memory_bytes"] == 0
+    assert shared["shared_memory_bytes"] > 0
+    assert shared["payload_bytes"] == shared["summary_payload_bytes"]
+    assert shared["runtime_seconds"] < socket_only["runtime_seconds"]
+
+
+def test_estimate_flags_processes_beyond_the_address_space():
+    result = estimate(settings(virtual_address_size="16-bit"), [process("P1")])
+    assert result["oversized_processes"] == ["P1"]
+    assert result["accesses"] == 0
+
+
+def test_admit_accepts_small_runs():
+    assert admit(estimate(settings(shared_memory=True), [process("P1")]), DEFAULT_LIMITS) == ("accept", [])
+
+
+def test_admit_rejects_runs_that_do_not_fit():
+    decision, reasons = admit(estimate(settings(ram_size_gb=1, swap_percent=0), [process("P1", size_gb=2)]), DEFAULT_LIMITS)
+    assert decision == "reject"
+    assert any("RAM + swap" in reason for reason in reasons)
+
+
+def test_admit_downgrades_large_payloads_to_summary_only():
+    limits = dict(DEFAULT_LIMITS, summary_only_payload_mb=1)
+    decision, reasons = admit(estimate(settings(), [process("P1")]), limits)
+    assert decision == "summary_only"
+    assert any(reason.startswith("results") for reason in reasons)
+
+
+def test_admit_rejects_when_even_the_summary_is_too_slow():
+    limits = dict(DEFAULT_LIMITS, max_runtime_s=0)
+    decision, reasons = admit(estimate(settings(), [process("P1")]), limits)
+    assert decision == "reject"
+    assert any(reason.startswith("runtime") for reason in reasons)
+
+
+def test_load_limits_overrides_defaults(tmp_path):
+    env_file = tmp_path / "env.json"
+    env_file.write_text(json.dumps({"limits": {"max_runtime_s": 5}}))
+    limits = load_limits(str(env_file))
+    assert limits["max_runtime_s"] == 5
+    assert limits["max_simulator_rss_mb"] == DEFAULT_LIMITS["max_simulator_rss_mb"]
+    assert load_limits(str(tmp_path / "missing.json")) == DEFAULT_LIMITS
+
+
+@pytest.mark.parametrize("value, text", [(512, "512 B"), (1536, "1.5 KB"), (3 * 1048576, "3.0 MB"), (5 * GB, "5.0 GB")])
+def test_format_bytes(value, text):
+    assert format_bytes(value) == text
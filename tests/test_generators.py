@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from workload.generators import PATTERNS, generate
+from workload.trace import BYTES_PER_GB, build_streams, trace_chunks
+
+PAGE_SIZE = 4096
+SIZE = 64 * 1048576
+
+
+@pytest.mark.parametrize("pattern", sorted(PATTERNS))
+def test_generators_stay_in_bounds(pattern):
+    addresses = generate(pattern, SIZE, 5000, np.random.default_rng(1), PAGE_SIZE)
+    assert addresses.dtype == np.uint64
+    assert addresses.shape == (5000,)
+    assert addresses.max() < SIZE
+
+
+@pytest.mark.parametrize("pattern", sorted(PATTERNS))
+def test_generators_are_reproducible(pattern):
+    first = generate(pattern, SIZE, 1000, np.random.default_rng(7), PAGE_SIZE)
+    second = generate(pattern, SIZE, 1000, np.random.default_rng(7), PAGE_SIZE)
+    assert np.array_equal(first, second)
+
+
+def test_sequential_and_strided_steps():
+    sequential = generate("Sequential", SIZE, 100, np.random.default_rng(2), PAGE_SIZE)
+    assert (np.diff(sequential.astype(np.int64)) % SIZE == 64).all()
+    strided = generate("Strided", SIZE, 100, np.random.default_rng(2), PAGE_SIZE)
+    assert (np.diff(strided.astype(np.int64)) % SIZE == PAGE_SIZE).all()
+
+
+def test_loop_stays_in_its_region():
+    # The default region is 64 pages long from an arbitrary (unaligned) base.
+    addresses = generate("Loop", SIZE, 10000, np.random.default_rng(3), PAGE_SIZE)
+    assert addresses.max() - addresses.min() < 64 * PAGE_SIZE
+
+
+def test_zipf_concentrates_on_hot_pages():
+    pages = generate("Zipf", SIZE, 20000, np.random.default_rng(4), PAGE_SIZE) // PAGE_SIZE
+    counts = np.sort(np.bincount(pages.astype(np.int64)))[::-1]
+    assert counts[:10].sum() > 0.2 * len(pages)
+
+
+def test_unknown_pattern():
+    with pytest.raises(ValueError):
+        generate("Random", SIZE, 10, np.random.default_rng(), PAGE_SIZE)
+
+
+def test_build_streams_shape_and_bounds():
+    processes = [
+        {"id": "P1", "size_gb": 1, "is_process_stop": False, "workload": "Zipf"},
+        {"id": "P2", "size_gb": 2, "is_process_stop": True},
+        {"id": "P3", "size_gb": 2, "is_process_stop": False},
+    ]
+    process_ids, streams = build_streams(processes, PAGE_SIZE, ticks=300, seed=5)
+    assert process_ids == ["P1", "P3"]
+    assert streams.shape == (300, 2)
+    assert streams.dtype == np.dtype("<u8")
+    assert streams[:, 0].max() < BYTES_PER_GB
+    assert streams[:, 1].max() < 2 * BYTES_PER_GB
+
+
+def test_trace_chunks_cover_every_tick():
+    processes = [{"id": "P1", "size_gb": 1, "is_process_stop": False}]
+    chunks = list(trace_chunks(processes, PAGE_SIZE, ticks=5000, chunk_ticks=2048, seed=6))
+    assert [chunk["tick"] for chunk in chunks] == [0, 2048, 4096]
+    assert all(chunk["command"] == "trace_chunk" and chunk["processes"] == ["P1"] for chunk in chunks)
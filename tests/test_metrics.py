@@ -0,0 +1,83 @@
+import csv
+
+from bridge.metrics import MetricsCollector, load_metrics_config, run_labels
+
+
+def engine_metrics(seconds=1.5, accesses=10, peak_rss=1000):
+    return {
+        "wall_seconds": seconds,
+        "phases": {"simulate": {"seconds": seconds, "calls": 2}},
+        "counters": {"accesses": accesses},
+        "peak_rss_bytes": peak_rss,
+    }
+
+
+def test_record_merges_engine_and_client_phases():
+    collector = MetricsCollector()
+    with collector.phase("render"):
+        pass
+    row = collector.record({"metrics": engine_metrics()}, labels={"status": "ok", "processes": 2})
+    assert row["status"] == "ok"
+    assert row["processes"] == 2
+    assert row["engine_simulate_seconds"] == 1.5
+    assert "client_render_seconds" in row
+    assert row["accesses"] == 10
+    # Client timings belong to the run that was just recorded.
+    assert collector.client_phases == {}
+
+
+def test_prometheus_totals_and_outcomes():
+    collector = MetricsCollector()
+    collector.record({"metrics": engine_metrics(accesses=10, peak_rss=1000)}, labels={"status": "ok"})
+    collector.record({"status": "cancelled", "metrics": engine_metrics(accesses=5, peak_rss=3000)},
+                     labels={"status": "cancelled"})
+    collector.record(None, labels={"status": "failed"})
+    lines = collector.prometheus_text().splitlines()
+    assert "vmsim_runs_total 3" in lines
+    assert 'vmsim_run_outcomes_total{status="cancelled"} 1' in lines
+    assert 'vmsim_run_outcomes_total{status="failed"} 1' in lines
+    assert 'vmsim_phase_seconds_sum{side="engine",phase="simulate"} 3' in lines
+    assert 'vmsim_phase_seconds_count{side="engine",phase="simulate"} 4' in lines
+    assert "vmsim_accesses_total 15" in lines
+    assert "vmsim_peak_rss_bytes 3000" in lines
+
+
+def test_export_writes_prometheus_and_csv(tmp_path):
+    collector = MetricsCollector(str(tmp_path / "vmsim.prom"), str(tmp_path / "runs.csv"))
+    collector.record({"metrics": engine_metrics()}, labels={"status": "ok"})
+    collector.record(None, labels={"status": "error"})
+    collector.export()
+    assert (tmp_path / "vmsim.prom").read_text().startswith("# HELP vmsim_runs_total")
+    with open(tmp_path / "runs.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["status"] for row in rows] == ["ok", "error"]
+    assert rows[0]["accesses"] == "10"
+    assert rows[1]["accesses"] == ""
+
+
+def test_history_is_bounded():
+    collector = MetricsCollector(history=2)
+    for _ in range(3):
+        collector.record({"metrics": engine_metrics()})
+    assert len(collector.runs) == 2
+    assert collector.run_count == 3
+
+
+def test_load_metrics_config_resolves_paths(tmp_path):
+    env_file = tmp_path / "env.json"
+    env_file.write_text('{"metrics": {"csv_file": "out/runs.csv"}}')
+    config = load_metrics_config(str(env_file))
+    assert config["csv_file"] == str(tmp_path / "out" / "runs.csv")
+    assert config["prometheus_file"] is None
+
+
+def test_failed_run_without_results_is_recorded():
+    settings = {"ram_size_gb": 4, "page_size_kb": 4, "tlb_enabled": True, "allocation_type": "Contiguous",
+                "scheduler": {"policy": "Round Robin"}}
+    collector = MetricsCollector()
+    row = collector.record(None, labels=run_labels(settings, 2, None, "failed"))
+    assert row["status"] == "failed"
+    assert row["summary_only"] is False
+    assert row["engine_wall_seconds"] == 0.0
+    assert collector.status_counts == {"failed": 1}
+    assert run_labels(settings, 2, {"summary_only": True})["summary_only"] is True
@@ -0,0 +1,47 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from bridge.transport import SharedResults
+
+
+@pytest.fixture
+def export():
+    """Stand in for the engine: one region per export, unlinked when superseded."""
+    regions = []
+
+    def write(values):
+        data = np.asarray(values, dtype=np.uint32)
+        region = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+        region.buf[: data.nbytes] = data.tobytes()
+        regions.append(region)
+        return {
+            "shared_memory": {"name": region.name, "size": region.size},
+            "series": {"shm": {"offset": 0, "length": data.nbytes, "dtype": "=u4", "count": len(data)}},
+        }
+
+    yield write
+    for region in regions:
+        region.close()
+        region.unlink()
+
+
+def test_resolve_returns_views_that_outlive_the_mapping(export):
+    shared = SharedResults()
+    first = shared.resolve(export([1, 2, 3]))["series"]
+    assert not first.flags.owndata
+
+    second = shared.resolve(export([4, 5]))["series"]
+    # Attaching the next export closes the first mapping while ``first`` still views it.
+    assert first.tolist() == [1, 2, 3]
+    assert second.tolist() == [4, 5]
+
+    shared.close()
+    assert shared.region is None
+    assert second.tolist() == [4, 5]
+
+
+def test_resolve_without_shared_memory_is_unchanged():
+    results = {"summary_only": True, "total_hits": 3}
+    assert SharedResults().resolve(results) is results
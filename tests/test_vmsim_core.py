@@ -0,0 +1,170 @@
+import numpy as np
+import pytest
+
+from bridge.transport import vmsim_core
+
+pytestmark = pytest.mark.skipif(vmsim_core is None, reason="vmsim_core extension not built (make python-extension)")
+
+GB = 1024 ** 3
+PAGE_SIZE = 4096
+NOT_RESIDENT = 2 ** 64 - 1
+FRAME_DATA = 1
+
+
+def process(pid, size_gb=1, stopped=False):
+    return {"id": pid, "name": pid.lower(), "size_gb": size_gb, "type": "User",
+            "has_priority": False, "is_process_stop": stopped}
+
+
+def settings(processes, **overrides):
+    config = {
+        "ram_size_gb": 4, "page_size_kb": PAGE_SIZE // 1024, "tlb_size": 4, "tlb_enabled": True,
+        "virtual_address_size": "32-bit", "rom_size": "32 GB", "swap_percent": 10,
+        "allocation_type": "Contiguous", "processes": processes, "trace_ticks": 1000,
+        "summary_only": True,
+    }
+    config.update(overrides)
+    return config
+
+
+@pytest.fixture(autouse=True)
+def engine_cwd(tmp_path, monkeypatch):
+    # The engine writes debug.txt to the working directory, from its destructor too,
+    # so tests build simulators as locals that are gone before the directory is restored.
+    monkeypatch.chdir(tmp_path)
+
+
+def loaded_core():
+    core = vmsim_core.Simulator()
+    core.load_settings(settings([process("P1"), process("P2"), process("P3", stopped=True)]))
+    return core
+
+
+def test_load_settings_schedules_running_processes():
+    core = loaded_core()
+    assert core.scheduled() == ["P1", "P2"]
+    assert core.counters()["tick"] == 0
+    assert core.counters()["accesses"] == 0
+
+
+def test_load_settings_can_be_repeated():
+    # Each load replaces the previous session instead of leaking its frames.
+    core = vmsim_core.Simulator()
+    for _ in range(6):
+        core.load_settings(settings([process("P1"), process("P2")]))
+        assert core.scheduled() == ["P1", "P2"]
+        kinds = np.asarray(core.frame_map()) & np.uint16(7)
+        assert (kinds == FRAME_DATA).sum() == 2 * GB // PAGE_SIZE
+
+
+def test_contiguous_placement_is_all_or_nothing():
+    core = vmsim_core.Simulator()
+    core.load_settings(settings([process("P1", size_gb=3)], ram_size_gb=2))
+    results = core.export_results()
+    assert not results["page_tables"]
+    assert results["allocator"]["failed_allocations"] == 1
+
+    core.load_settings(settings([process("P1", size_gb=3)], ram_size_gb=2, contiguous_spill=True))
+    results = core.export_results()
+    assert [table["process_id"] for table in results["page_tables"]] == ["P1"]
+    assert results["allocator"]["failed_allocations"] == 0
+
+
+def test_load_settings_rejects_incomplete_settings():
+    core = vmsim_core.Simulator()
+    with pytest.raises(ValueError):
+        core.load_settings({"ram_size_gb": 1})
+
+
+def test_access_applies_one_access_per_tick():
+    core = loaded_core()
+    addresses = np.zeros((200, 2), dtype=np.uint64)
+    assert core.access(["P1", "P2"], addresses) == 200
+    counters = core.counters()
+    assert counters["tick"] == 200
+    assert counters["accesses"] == 200
+    assert counters["total_hits"] + counters["total_misses"] == 200
+    assert counters["average_access_ns"] > 0
+
+
+def test_access_consumes_each_stream_only_while_scheduled():
+    core = loaded_core()
+    # Page 0 for the first half of every column, page 1 after it. Two processes
+    # share the CPU, so each gets through only the first half: one miss apiece.
+    addresses = np.zeros((2000, 2), dtype=np.uint64)
+    addresses[1000:] = PAGE_SIZE
+    core.access(["P1", "P2"], addresses[:700])
+    core.access(["P1", "P2"], addresses[700:])
+    assert core.counters()["total_misses"] == 2
+
+
+def test_access_reports_unconsumed_trace():
+    core = loaded_core()
+    # Each process runs about half the ticks, so it cannot keep up with its column.
+    for _ in range(5):
+        core.access(["P1", "P2"], np.zeros((400, 2), dtype=np.uint64))
+    results = core.export_results()
+    accesses = results["access_time"]["accesses"]
+    assert 0 < accesses <= 2000
+    assert results["trace_unconsumed"] == 2 * 2000 - accesses
+
+
+def test_access_rejects_unscheduled_process():
+    core = loaded_core()
+    with pytest.raises(KeyError):
+        core.access(["P1", "P3"], np.zeros((4, 2), dtype=np.uint64))
+
+
+def test_access_rejects_bad_buffers():
+    core = loaded_core()
+    with pytest.raises(TypeError):
+        core.access(["P1"], np.zeros(3, dtype=np.float64))
+    with pytest.raises(ValueError):
+        core.access(["P1", "P2"], np.zeros(3, dtype=np.uint64))
+
+
+def test_translate_maps_resident_pages():
+    core = loaded_core()
+    virtual = np.arange(0, GB, PAGE_SIZE, dtype=np.uint64) + np.uint64(123)
+    physical = np.frombuffer(core.translate("P1", virtual), dtype=np.uint64)
+    assert physical.shape == virtual.shape
+    assert (physical != NOT_RESIDENT).all()
+    assert (physical % PAGE_SIZE == 123).all()
+    # Contiguous placement: consecutive pages land in consecutive frames.
+    assert (np.diff(physical // PAGE_SIZE) == 1).all()
+
+
+def test_translate_unknown_process_is_not_resident():
+    core = loaded_core()
+    physical = np.frombuffer(core.translate("P9", np.zeros(2, dtype=np.uint64)), dtype=np.uint64)
+    assert (physical == NOT_RESIDENT).all()
+
+
+def test_page_table_and_frame_map():
+    core = loaded_core()
+    table = np.asarray(core.page_table("P1"))
+    assert table.shape == (GB // PAGE_SIZE,)
+    assert (table >> np.uint64(63)).all()
+    assert np.asarray(core.frame_map()).size > 0
+    with pytest.raises(KeyError):
+        core.page_table("P9")
+
+
+def test_export_results_and_reset():
+    core = loaded_core()
+    core.access(["P1", "P2"], np.zeros((100, 2), dtype=np.uint64))
+    results = core.export_results()
+    assert results["summary_only"]
+    assert "metrics" in results
+    assert results["access_time"]["breakdown_ns"]["switch_ns"] >= 0
+    core.reset()
+    assert core.counters()["accesses"] == 0
+    assert core.scheduled() == []
+
+
+def test_progress_reports_phase():
+    core = loaded_core()
+    core.access(["P1", "P2"], np.zeros((10, 2), dtype=np.uint64))
+    progress = core.progress()
+    assert progress["phase"] == "simulate"
+    assert progress["total"] == 1000